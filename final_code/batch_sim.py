@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""Lockstep batched engine for many small FCFS and Round Robin workloads.
+
+Workloads are packed as lanes of NumPy arrays (one row per workload, one
+column per process) and all lanes are advanced one tick at a time with
+masked array operations, so the Python cost is paid per tick of the
+longest workload instead of per tick of every workload. Each lane keeps
+its own ready queue as a ring buffer of process columns, its running
+process and its quantum counter; FCFS lanes are Round Robin lanes whose
+quantum never runs out.
+
+Events are recorded as numbers while the lanes run and turned into .out
+lines at the end, giving results identical to scheduler_gpt.simulate().
+Building those lines and Process objects costs about as much as in the
+scalar engine, so callers that only need the averages should use
+batch_statistics(), which skips them. SJF workloads, and every workload
+when NumPy is not installed, are run by the scalar engine instead.
+
+    from batch_sim import batch_statistics, simulate_batch
+    results = simulate_batch([(processes, 'rr', 20, 2), (processes, 'fcfs', 20, None)])
+    averages = batch_statistics([(processes, 'rr', 20, q) for q in range(1, 10)])
+
+Usage:
+    batch_sim.py <input .in>... [--batch-size N] [--check]
+
+The .out files are written to the current directory.
+"""
+import argparse
+import os
+import sys
+import time
+
+try:
+    import numpy
+except ImportError:  # Optional; without it every workload runs on the scalar engine
+    numpy = None
+
+import scheduler_gpt
+from scheduler_gpt import Process
+
+BATCH_SIZE = 4096
+ARRIVAL, FINISH, SELECT, IDLE = range(4)  # Order of the events within a tick
+
+def simulate_batch(workloads, batch_size=BATCH_SIZE):
+    """Run (processes, policy, run_for, quantum) workloads; return a SimulationResult per workload.
+
+    Workloads of similar length are batched together, at most batch_size
+    at a time. Raises ValueError like simulate() for a Round Robin
+    workload without a quantum or an unknown policy.
+    """
+    results = [None] * len(workloads)
+    lanes = []
+    for i, (processes, policy, run_for, quantum) in enumerate(workloads):
+        processes = [scheduler_gpt.as_process(p) for p in processes]
+        if policy == 'rr' and quantum is None:
+            raise ValueError("Missing quantum parameter when use is 'rr'")
+        if numpy is None or policy not in ('fcfs', 'rr'):
+            results[i] = scheduler_gpt.simulate(processes, policy, run_for, quantum)
+        else:
+            # The result keeps the Process objects until the batch is done
+            results[i] = processes
+            lanes.append((i, [(p.name, p.arrival, p.burst) for p in processes], policy, run_for, quantum))
+
+    for batch in batches(lanes, batch_size):
+        for (i, _, policy, run_for, quantum), (output, finished) in zip(batch, render(*run_lanes(batch))):
+            results[i] = scheduler_gpt.SimulationResult(results[i], run_for, policy, quantum, output, finished)
+    return results
+
+def batch_statistics(workloads, batch_size=BATCH_SIZE):
+    """Return calculate_statistics() of every (processes, policy, run_for, quantum) workload.
+
+    Much cheaper than simulate_batch() when only the averages are needed
+    (e.g. for parameter searches): no events are recorded and no lines or
+    Process objects are built.
+    """
+    results = [None] * len(workloads)
+    lanes = []
+    for i, (processes, policy, run_for, quantum) in enumerate(workloads):
+        if policy == 'rr' and quantum is None:
+            raise ValueError("Missing quantum parameter when use is 'rr'")
+        if numpy is None or policy not in ('fcfs', 'rr'):
+            result = scheduler_gpt.simulate(processes, policy, run_for, quantum)
+            results[i] = scheduler_gpt.calculate_statistics(result.output, result.finished, run_for,
+                                                            result.processes)
+        else:
+            lanes.append((i, [process_fields(p) for p in processes], policy, run_for, quantum))
+
+    for batch in batches(lanes, batch_size):
+        for (i, _, _, _, _), stats in zip(batch, lane_statistics(*run_lanes(batch, record_events=False))):
+            results[i] = stats
+    return results
+
+def process_fields(p):
+    """Return (name, arrival, burst) of a Process, a tuple or a dict, like as_process() accepts."""
+    if isinstance(p, Process):
+        return (p.name, p.arrival, p.burst)
+    if isinstance(p, dict):
+        return (p['name'], p['arrival'], p['burst'])
+    return tuple(p)[:3]
+
+def batches(lanes, batch_size):
+    """Yield lists of at most batch_size lanes, sorted by run_for.
+
+    Lanes that stop early drop out of the batch, so similar lengths go together.
+    """
+    lanes.sort(key=lambda lane: lane[3])
+    for start in range(0, len(lanes), batch_size):
+        yield lanes[start:start + batch_size]
+
+def run_lanes(batch, record_events=True):
+    """Simulate a batch of (index, [(name, arrival, burst)], policy, run_for, quantum) lanes sorted by run_for.
+
+    Returns (batch, columns, events, width, never, state) for render() and
+    lane_statistics(). state holds (lanes, columns) arrays of the arrival,
+    burst, start time, finish time and the time the finish was reported
+    (-1 if it was not).
+    """
+    n = len(batch)
+    width = max(1, max(len(lane[1]) for lane in batch))
+    run_for = numpy.array([lane[3] for lane in batch], dtype=numpy.int64)
+    never = int(run_for[-1])  # Arrival time for padding and processes that never arrive
+
+    # Columns are in enqueue order: by arrival, then by name for FCFS or input order for RR
+    columns = []
+    arrivals = []
+    bursts = []
+    quantum = []
+    for _, processes, policy, lane_run_for, lane_quantum in batch:
+        if policy == 'fcfs':
+            order = sorted(processes, key=lambda p: (p[1], p[0]))
+            quantum.append(lane_run_for + 1)
+        else:
+            order = sorted(processes, key=lambda p: p[1])
+            quantum.append(lane_quantum)
+        # Processes arriving before time 0 never arrive, like in the scalar engine
+        if order and order[0][1] < 0:
+            order = [p for p in order if p[1] >= 0] + [p for p in order if p[1] < 0]
+        columns.append(order)
+        padding = width - len(order)
+        arrivals.append([a if 0 <= a < lane_run_for else never for _, a, _ in order] + [never] * (padding + 1))
+        bursts.append([b for _, _, b in order] + [0] * padding)
+    arrival = numpy.array(arrivals, dtype=numpy.int64)
+    burst = numpy.array(bursts, dtype=numpy.int64)
+    quantum = numpy.array(quantum, dtype=numpy.int64)
+
+    remaining = burst.copy()
+    start_time = numpy.full((n, width), -1, dtype=numpy.int64)
+    finish_time = numpy.full((n, width), -1, dtype=numpy.int64)
+    finished_at = numpy.full((n, width), -1, dtype=numpy.int64)
+    queue = numpy.zeros((n, width), dtype=numpy.int64)
+    head = numpy.zeros(n, dtype=numpy.int64)
+    size = numpy.zeros(n, dtype=numpy.int64)
+    arrived = numpy.zeros(n, dtype=numpy.int64)
+    current = numpy.full(n, -1, dtype=numpy.int64)
+    quantum_remaining = numpy.zeros(n, dtype=numpy.int64)
+    # Events as (lane, time, kind, column, burst) columns, one array per tick and kind
+    events = [[], [], [], [], []]
+
+    def record(lanes, t, kind, cols, values):
+        if not record_events:
+            return
+        events[0].append(lanes)
+        events[1].append(numpy.full(len(lanes), t, dtype=numpy.int64))
+        events[2].append(numpy.full(len(lanes), kind, dtype=numpy.int64))
+        events[3].append(cols)
+        events[4].append(values)
+
+    def push(lanes, cols):
+        queue[lanes, (head[lanes] + size[lanes]) % width] = cols
+        size[lanes] += 1
+
+    first = 0
+    for t in range(never):
+        # Lanes are sorted by run_for, so the finished ones are a prefix
+        while run_for[first] <= t:
+            first += 1
+        active = numpy.arange(first, n)
+
+        # Arrivals, in column order
+        lanes = active
+        while len(lanes):
+            lanes = lanes[arrival[lanes, arrived[lanes]] == t]
+            if len(lanes):
+                cols = arrived[lanes]
+                record(lanes, t, ARRIVAL, cols, cols)
+                push(lanes, cols)
+                arrived[lanes] += 1
+
+        # The running process finishes once its last tick has run
+        lanes = active[current[active] >= 0]
+        lanes = lanes[remaining[lanes, current[lanes]] == 0]
+        if len(lanes):
+            record(lanes, t, FINISH, current[lanes], current[lanes])
+            finished_at[lanes, current[lanes]] = t
+            current[lanes] = -1
+            quantum_remaining[lanes] = 0
+
+        # Round Robin requeues the running process when its quantum expires
+        lanes = active[current[active] >= 0]
+        lanes = lanes[(quantum_remaining[lanes] == 0) & (remaining[lanes, current[lanes]] > 0)]
+        if len(lanes):
+            push(lanes, current[lanes])
+            current[lanes] = -1
+
+        # Select the next process
+        lanes = active[(current[active] < 0) & (size[active] > 0)]
+        if len(lanes):
+            cols = queue[lanes, head[lanes]]
+            head[lanes] = (head[lanes] + 1) % width
+            size[lanes] -= 1
+            current[lanes] = cols
+            quantum_remaining[lanes] = quantum[lanes]
+            new = start_time[lanes, cols] == -1
+            start_time[lanes[new], cols[new]] = t
+            record(lanes, t, SELECT, cols, remaining[lanes, cols])
+
+        # Run the current process for one tick, or idle
+        running = current[active] >= 0
+        lanes = active[running]
+        cols = current[lanes]
+        busy = remaining[lanes, cols] > 0
+        lanes, cols = lanes[busy], cols[busy]
+        remaining[lanes, cols] -= 1
+        quantum_remaining[lanes] -= 1
+        done = remaining[lanes, cols] == 0
+        finish_time[lanes[done], cols[done]] = t + 1
+        lanes = active[~running]
+        if len(lanes):
+            zeros = numpy.zeros(len(lanes), dtype=numpy.int64)
+            record(lanes, t, IDLE, zeros, zeros)
+
+    return batch, columns, events, width, never, (arrival[:, :width], burst, start_time, finish_time, finished_at)
+
+def render(batch, columns, events, width, never, state):
+    """Turn the recorded event columns into .out lines and finished Processes per lane.
+
+    Every line is put together from table strings picked with index arrays:
+    the 'Time N : ' prefix, the event text for the process column (or
+    'Idle') and, for selections, the ' selected (burst N)' suffix.
+    """
+    if not events[0]:
+        return [([], []) for _ in batch]
+    n = len(batch)
+    _, _, start_time, finish_time, _ = state
+    lanes, times, kinds, cols, values = (numpy.concatenate(column) for column in events)
+    key = ((lanes * (never + 1) + times) * 4 + kinds) * (width + 1) + cols
+    order = numpy.argsort(key, kind='stable')
+    lanes, times, kinds, cols, values = (column[order] for column in (lanes, times, kinds, cols, values))
+
+    # Text table: 'Idle', then per (lane, column) the name, 'name arrived' and 'name finished'
+    names = [''] * (n * width)
+    for lane, processes in enumerate(columns):
+        names[lane * width:lane * width + len(processes)] = [p[0] for p in processes]
+    texts = ['Idle'] + names + [name + ' arrived' for name in names] + [name + ' finished' for name in names]
+    slot = lanes * width + cols
+    text = numpy.select([kinds == SELECT, kinds == ARRIVAL, kinds == FINISH],
+                        [1 + slot, 1 + n * width + slot, 1 + 2 * n * width + slot], 0)
+    selected = kinds == SELECT
+    low = int(values[selected].min()) if selected.any() else 0
+    high = int(values[selected].max()) if selected.any() else 0
+    suffixes = [''] + [f" selected (burst{value:4})" for value in range(low, high + 1)]
+    suffix = numpy.where(selected, values - low + 1, 0)
+
+    prefixes = [f"Time{t:4} : " for t in range(never)]
+    lines = [prefixes[t] + texts[i] + suffixes[j]
+             for t, i, j in zip(times.tolist(), text.tolist(), suffix.tolist())]
+    bounds = numpy.searchsorted(lanes, numpy.arange(n + 1)).tolist()
+
+    # Finished processes in completion order
+    done = kinds == FINISH
+    done_lanes = lanes[done].tolist()
+    done_cols = cols[done].tolist()
+    start_time = start_time.tolist()
+    finish_time = finish_time.tolist()
+    finished = [[] for _ in range(n)]
+    for lane, column in zip(done_lanes, done_cols):
+        finished[lane].append(finished_process(columns[lane][column], start_time[lane][column],
+                                               finish_time[lane][column]))
+    return [(lines[bounds[lane]:bounds[lane + 1]], finished[lane]) for lane in range(n)]
+
+def lane_statistics(batch, columns, events, width, never, state):
+    """Return the calculate_statistics() averages of every lane from the final lane state."""
+    arrival, burst, start_time, finish_time, finished_at = state
+    finished = finished_at >= 0
+    # A zero burst never runs, so its turnaround and wait stay 0
+    ran = finished & (finish_time >= 0)
+    turnaround = numpy.where(ran, finish_time - arrival, 0)
+    wait = numpy.where(ran, turnaround - burst, 0)
+    response = numpy.where(finished, start_time - arrival, 0)
+    counts = finished.sum(axis=1).tolist()
+    results = []
+    for count, total_wait, total_turnaround, total_response in zip(
+            counts, wait.sum(axis=1).tolist(), turnaround.sum(axis=1).tolist(), response.sum(axis=1).tolist()):
+        if count:
+            averages = (total_wait / count, total_turnaround / count, total_response / count)
+        else:
+            averages = (0, 0, 0)
+        results.append({'avg_wait_time': round(averages[0], 2), 'avg_turnaround_time': round(averages[1], 2),
+                        'avg_response_time': round(averages[2], 2)})
+    return results
+
+def finished_process(fields, start, finish):
+    """Return a Process with the fields the scalar engine sets on a finished process."""
+    name, arrival, burst = fields
+    done = Process(name, arrival, burst)
+    done.remaining = 0
+    done.start_time = start
+    done.response_time = start - arrival
+    # A zero burst never runs, so its finish time and turnaround are never set
+    if finish >= 0:
+        done.finish_time = finish
+        done.turnaround_time = finish - arrival
+        done.wait_time = done.turnaround_time - burst
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many small workloads through the lockstep batched engine.")
+    parser.add_argument('inputs', nargs='+', help="input files (.in)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="workloads advanced together")
+    parser.add_argument('--check', action='store_true', help="also run the scalar engine and compare the outputs")
+    args = parser.parse_args()
+
+    if numpy is None:
+        print("Warning: numpy is not installed; using the scalar engine")
+    workloads = []
+    names = []
+    for filename in args.inputs:
+        if not filename.endswith('.in'):
+            print(f"Error: Input file '{filename}' must have .in extension")
+            sys.exit(1)
+        try:
+            with open(filename) as f:
+                process_count, run_for, algorithm, quantum, processes = scheduler_gpt.parse_workload(f.read())
+        except (OSError, ValueError) as e:
+            print(f"{filename}: Error: {e}")
+            sys.exit(1)
+        workloads.append((processes, algorithm, run_for, quantum))
+        names.append((filename, process_count))
+
+    started = time.perf_counter()
+    try:
+        results = simulate_batch(workloads, args.batch_size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    print(f"Simulated {len(results)} workloads in {elapsed * 1000:.1f} ms")
+
+    mismatches = 0
+    for (filename, process_count), workload, result in zip(names, workloads, results):
+        result.process_count = process_count
+        result.write_output(os.path.basename(filename)[:-3] + '.out')
+        if args.check:
+            expected = scheduler_gpt.simulate(*workload)
+            expected.process_count = process_count
+            if list(expected.lines()) != list(result.lines()):
+                print(f"{filename}: differs from the scalar engine")
+                mismatches += 1
+    if args.check:
+        print(f"{len(results) - mismatches} of {len(results)} match the scalar engine")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
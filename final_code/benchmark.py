@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Benchmark harness for scheduler-gpt.py.
+
+Runs each stage (the three schedulers, create_gantt_data and write_output)
+over a grid of process counts and run_for values, and saves wall time,
+events per second and peak memory as JSON so two commits can be compared.
+
+Usage:
+    benchmark.py [--processes 10,100,1000] [--runfor 1000,10000] [--stages fcfs,rr] [-o results.json]
+    benchmark.py --compare base.json new.json [--threshold 0.10]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import scheduler_gpt
+
+STAGES = ['fcfs', 'sjf', 'rr', 'gantt', 'write_output']
+
+def generate_processes(count, run_for, seed=0, load=0.9):
+    """Generate a reproducible workload whose total burst is about load * run_for."""
+    rng = random.Random(seed)
+    mean_burst = max(1, int(run_for * load / count))
+    processes = []
+    for i in range(count):
+        arrival = rng.randrange(0, max(1, int(run_for * 0.8)))
+        burst = rng.randint(1, 2 * mean_burst)
+        processes.append(scheduler_gpt.Process(f"P{i + 1}", arrival, burst))
+    return processes
+
+def fresh_copy(processes):
+    """Return untouched copies, since some schedulers update the Process objects they get."""
+    return [scheduler_gpt.Process(p.name, p.arrival, p.burst) for p in processes]
+
+def make_stage(stage, processes, run_for, quantum):
+    """Return a callable that runs one stage and returns the number of events it handled."""
+    if stage == 'fcfs':
+        return lambda: len(scheduler_gpt.fcfs_scheduler(fresh_copy(processes), run_for)[0])
+    if stage == 'sjf':
+        return lambda: len(scheduler_gpt.sjf_scheduler(fresh_copy(processes), run_for)[0])
+    if stage == 'rr':
+        return lambda: len(scheduler_gpt.rr_scheduler(fresh_copy(processes), run_for, quantum)[0])
+
+    # The remaining stages consume the output of a scheduler run
+    output, finished = scheduler_gpt.rr_scheduler(fresh_copy(processes), run_for, quantum)
+    if stage == 'gantt':
+        def run():
+            scheduler_gpt.create_gantt_data(output, run_for)
+            return len(output)
+        return run
+    if stage == 'write_output':
+        def run():
+            scheduler_gpt.write_output(os.devnull, len(processes), 'rr', quantum, output,
+                                       list(finished), run_for, processes)
+            return len(output)
+        return run
+    raise ValueError(f"unknown stage '{stage}'")
+
+def measure(run, repeat):
+    """Return (best wall seconds, events, peak traced bytes) for a stage callable."""
+    best = None
+    events = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        events = run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    # Memory is measured in a separate run because tracemalloc slows execution down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, events, peak
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(stages, process_counts, run_fors, quantum, repeat, seed, max_seconds):
+    """Run every stage over the grid and return the result records."""
+    results = []
+    too_slow = {}  # stage -> (run_for, count) of the first run over max_seconds
+    for run_for in sorted(run_fors):
+        for count in sorted(process_counts):
+            processes = generate_processes(count, run_for, seed)
+            for stage in stages:
+                # Larger workloads than one that already blew the budget are skipped
+                limit = too_slow.get(stage)
+                if limit and run_for >= limit[0] and count >= limit[1]:
+                    print(f"{stage:>12} n={count:<7} runfor={run_for:<9} skipped (over {max_seconds}s budget)")
+                    continue
+                run = make_stage(stage, processes, run_for, quantum)
+                wall, events, peak = measure(run, repeat)
+                record = {
+                    'stage': stage,
+                    'processes': count,
+                    'run_for': run_for,
+                    'wall_s': round(wall, 6),
+                    'events': events,
+                    'events_per_s': round(events / wall, 1) if wall > 0 else None,
+                    'peak_bytes': peak,
+                }
+                results.append(record)
+                if wall > max_seconds:
+                    too_slow[stage] = (run_for, count)
+                print(f"{stage:>12} n={count:<7} runfor={run_for:<9} "
+                      f"{wall * 1000:10.2f} ms {record['events_per_s'] or 0:14.0f} ev/s "
+                      f"{peak / 1024:10.1f} KiB")
+    return results
+
+def compare_results(base_file, new_file, threshold):
+    """Print per-benchmark ratios between two result files; return True if nothing regressed."""
+    with open(base_file) as f:
+        base = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+
+    key = lambda r: (r['stage'], r['processes'], r['run_for'])
+    base_by_key = {key(r): r for r in base['results']}
+
+    ok = True
+    print(f"{'stage':>12} {'n':>7} {'runfor':>9} {'time':>8} {'memory':>8}")
+    for r in new['results']:
+        old = base_by_key.get(key(r))
+        if old is None:
+            continue
+        time_ratio = r['wall_s'] / old['wall_s'] if old['wall_s'] else float('inf')
+        mem_ratio = r['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else float('inf')
+        flag = ''
+        if time_ratio > 1 + threshold or mem_ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            ok = False
+        print(f"{r['stage']:>12} {r['processes']:>7} {r['run_for']:>9} "
+              f"{time_ratio:7.2f}x {mem_ratio:7.2f}x{flag}")
+    return ok
+
+def int_list(text):
+    return [int(x) for x in text.split(',') if x]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler stages.")
+    parser.add_argument('--processes', type=int_list, default=[10, 100, 1000],
+                        help="comma-separated process counts")
+    parser.add_argument('--runfor', type=int_list, default=[1000, 10000],
+                        help="comma-separated run_for values")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"comma-separated stages ({', '.join(STAGES)})")
+    parser.add_argument('--quantum', type=int, default=4, help="quantum used for rr")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument('--seed', type=int, default=0, help="workload seed")
+    parser.add_argument('--max-seconds', type=float, default=5.0,
+                        help="skip larger workloads for a stage once a run takes longer than this")
+    parser.add_argument('-o', '--output', default='bench_output.json', help="result file")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help="compare two result files instead of running")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare_results(args.compare[0], args.compare[1], args.threshold) else 1)
+
+    stages = [s for s in args.stages.split(',') if s]
+    for stage in stages:
+        if stage not in STAGES:
+            print(f"Error: Unknown stage '{stage}'")
+            sys.exit(1)
+
+    results = run_benchmarks(stages, args.processes, args.runfor, args.quantum, args.repeat, args.seed,
+                             args.max_seconds)
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+            'quantum': args.quantum,
+            'seed': args.seed,
+            'max_seconds': args.max_seconds,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Check that the alternative ways of running a workload agree with a full run.
+
+For every .in fixture the workload is simulated once in full with
+scheduler_gpt and then:
+
+  resume     resumed from checkpoints saved and loaded through a file, for
+             the same workload, a longer runfor and an added late arrival,
+             must match a fresh full run of that workload
+  index      the query index written and read back must give the running
+             process and the ready queue of a tick-by-tick simulation at
+             every tick (the queue only for fcfs, sjf and rr)
+  compact    the --compact .out file expanded as --expand does must be
+             byte-identical to the plain .out file
+  batch      batch_sim.simulate_batch() must give the same .out lines and
+             Gantt intervals
+  multicore  multicore.py with one CPU must give the same events with
+             ' on CPU0' appended and the same per-process statistics
+
+Golden .out files are checked by verify-outputs.py instead.
+
+Usage:
+    check-equivalence.py <input .in or directory>... [--checks CHECK,...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import batch_sim
+import multicore
+import scheduler_gpt
+from scheduler_gpt import InputError, Process, Simulation
+
+CHECKS = ['resume', 'index', 'compact', 'batch', 'multicore']
+
+def first_difference(expected, actual):
+    """Describe the first line where two line lists differ, or return None if they are equal."""
+    expected, actual = list(expected), list(actual)
+    for number, (expected_line, actual_line) in enumerate(zip(expected, actual), 1):
+        if expected_line != actual_line:
+            return f"line {number}: expected '{expected_line}', actual '{actual_line}'"
+    if len(expected) != len(actual):
+        number = min(len(expected), len(actual)) + 1
+        return f"line {number}: expected {len(expected)} lines, actual {len(actual)}"
+    return None
+
+def finished_stats(processes):
+    """Return the per-process statistics of finished Process objects, in completion order."""
+    return [(p.name, p.wait_time, p.turnaround_time, p.response_time) for p in processes]
+
+def check_resume(workload, directory):
+    """Resume edited copies of the workload from saved checkpoints and compare them with full runs."""
+    processes, algorithm, run_for, quantum = workload
+    path = os.path.join(directory, 'checkpoints.json.gz')
+    every = max(1, run_for // scheduler_gpt.CHECKPOINTS_PER_RUN)
+    sim = Simulation(processes, run_for, algorithm, quantum)
+    sim.run(checkpoint_every=every)
+    if not scheduler_gpt.save_checkpoints(path, sim):
+        return f"could not write checkpoints to {path}"
+    data = scheduler_gpt.load_checkpoints(path)
+    if data is None:
+        return f"could not read checkpoints from {path}"
+
+    names = {p.name for p in processes}
+    late = 'late'
+    while late in names:
+        late += '_'
+    edits = [
+        ('same workload', processes, run_for),
+        ('longer runfor', processes, run_for + run_for // 2),
+        ('late arrival', processes + [Process(late, run_for // 2, 3)], run_for),
+    ]
+    for label, edited, edited_run_for in edits:
+        resumed = Simulation(edited, edited_run_for, algorithm, quantum)
+        resumed_at = scheduler_gpt.resume_from_checkpoint(resumed, data)
+        if label == 'same workload' and not resumed_at and run_for > every:
+            return f"{label}: no checkpoint was reused"
+        resumed.run()
+        full = Simulation(edited, edited_run_for, algorithm, quantum)
+        full.run()
+        difference = first_difference(full.output, resumed.output)
+        if difference is None and finished_stats(full.finished_processes()) != finished_stats(
+                resumed.finished_processes()):
+            difference = "per-process statistics differ"
+        if difference is None and full.gantt_intervals() != resumed.gantt_intervals():
+            difference = "Gantt intervals differ"
+        if difference:
+            return f"{label}, resumed at time {resumed_at}: {difference}"
+    return None
+
+def check_index(workload, result, directory):
+    """Answer queries from the saved query index and compare them with a tick-by-tick simulation."""
+    processes, algorithm, run_for, quantum = workload
+    filename = os.path.join(directory, 'index' + scheduler_gpt.INDEX_SUFFIX)
+    scheduler_gpt.save_query_index(filename, result.query_index())
+    index = scheduler_gpt.load_query_index(filename)
+    sim = Simulation(processes, run_for, algorithm, quantum)
+    for time in range(run_for):
+        sim.run(until=time + 1)
+        name = None if sim.current is None else sim.processes[sim.current].name
+        running = scheduler_gpt.running_at(index, time)
+        if running is None or running[0] != name:
+            return f"Time {time}: running {running[0] if running else None}, simulation ran {name}"
+        if algorithm == 'sjf':
+            expected = [(name, remaining) for remaining, name, _, _ in sorted(sim.ready_queue)]
+        elif algorithm in ('fcfs', 'rr'):
+            expected = [(sim.processes[i].name, sim.processes[i].remaining) for i in sim.ready_queue]
+        else:
+            continue
+        queue = scheduler_gpt.ready_queue_at(index, time)
+        if queue != expected:
+            return f"Time {time}: ready queue {queue}, simulation had {expected}"
+    if scheduler_gpt.running_at(index, run_for) is not None:
+        return f"Time {run_for}: index reports a process after the run"
+    return None
+
+def check_compact(result, directory):
+    """Expand the compact .out file and compare it byte for byte with the plain one."""
+    plain_filename = os.path.join(directory, 'plain.out')
+    compact_filename = os.path.join(directory, 'compact.out')
+    result.write_output(plain_filename)
+    result.write_output(compact_filename, compact=True)
+    with open(compact_filename, 'r') as f:
+        expanded = ''.join(line + '\n' for line in scheduler_gpt.expand_output(f))
+    with open(plain_filename, 'r') as f:
+        plain = f.read()
+    if expanded == plain:
+        return None
+    return first_difference(plain.splitlines(), expanded.splitlines()) or "files differ in trailing bytes"
+
+def check_batch(workload, result):
+    """Run the workload through batch_sim and compare its .out lines and Gantt intervals."""
+    batch_result = batch_sim.simulate_batch([workload])[0]
+    difference = first_difference(result.lines(), batch_result.lines())
+    if difference is None and result.gantt_intervals() != batch_result.gantt_intervals():
+        difference = "Gantt intervals differ"
+    return difference
+
+def check_multicore(workload, result):
+    """Run the workload on one CPU with multicore.py and compare its events and statistics."""
+    processes, algorithm, run_for, quantum = workload
+    sim = multicore.MultiCoreSimulation(processes, run_for, algorithm, quantum, cpus=1)
+    sim.run()
+    difference = first_difference((line + " on CPU0" for line in result.output), sim.output)
+    if difference is None:
+        difference = first_difference(scheduler_gpt.output_footer(result.finished, run_for, result.processes),
+                                      scheduler_gpt.output_footer(sim.finished, run_for, sim.processes))
+    return difference
+
+def check_file(filename, checks):
+    """Run the checks on one .in file and return (check, message) for each failure."""
+    try:
+        with open(filename, 'r') as f:
+            process_count, run_for, algorithm, quantum, processes = scheduler_gpt.parse_workload(f.read())
+    except (OSError, InputError) as e:
+        return [('input', str(e))]
+    workload = (processes, algorithm, run_for, quantum)
+    result = scheduler_gpt.simulate(*workload)
+    result.process_count = process_count
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        for check in checks:
+            if check == 'resume':
+                message = check_resume(workload, directory)
+            elif check == 'index':
+                message = check_index(workload, result, directory)
+            elif check == 'compact':
+                message = check_compact(result, directory)
+            elif check == 'batch':
+                message = check_batch(workload, result)
+            else:
+                message = check_multicore(workload, result)
+            if message:
+                failures.append((check, message))
+    return failures
+
+def collect_inputs(paths):
+    """Return the .in files given directly or found under the given directories."""
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                inputs.extend(os.path.join(root, filename) for filename in files if filename.endswith('.in'))
+        else:
+            inputs.append(path)
+    return sorted(inputs)
+
+def check_list(text):
+    """Parse --checks: a comma-separated subset of CHECKS."""
+    checks = [check.strip() for check in text.split(',') if check.strip()]
+    for check in checks:
+        if check not in CHECKS:
+            raise argparse.ArgumentTypeError(f"unknown check '{check}' (choose from {', '.join(CHECKS)})")
+    return checks
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that other ways of running each workload agree with a full run.")
+    parser.add_argument('inputs', nargs='+', help="input files (.in) or directories to search for them")
+    parser.add_argument('--checks', type=check_list, default=CHECKS,
+                        help=f"comma-separated checks to run (default: {','.join(CHECKS)})")
+    args = parser.parse_args()
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print(f"No .in files found in {', '.join(args.inputs)}")
+        sys.exit(1)
+    for filename in inputs:
+        if not filename.endswith('.in'):
+            print(f"Error: Input file '{filename}' must have .in extension")
+            sys.exit(1)
+
+    failed = 0
+    for filename in inputs:
+        failures = check_file(filename, args.checks)
+        if failures:
+            failed += 1
+            print(f"✗ DIFFERENCE - {filename}")
+            for check, message in failures:
+                print(f"    {check}: {message}")
+
+    print(f"\nTotal files checked: {len(inputs)} ({', '.join(args.checks)})")
+    print(f"Passed: {len(inputs) - failed}")
+    print(f"Failed: {failed}")
+    sys.exit(0 if failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
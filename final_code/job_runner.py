@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""asyncio front-end that runs simulations on a bounded process pool.
+
+Jobs wait in a FIFO queue of at most max_pending entries (submit() blocks
+while it is full) and at most `workers` of them run at once, so a burst of
+thousands of workloads uses bounded memory and is served in order. A job can
+be cancelled while queued or mid-simulation: workers advance the simulation
+in chunks of CHECK_EVERY ticks and stop with SimulationCancelled once the
+job is marked cancelled.
+
+    async with JobRunner(workers=4) as runner:
+        job = await runner.submit([('A', 0, 5), ('B', 1, 3)], 'rr', 20, quantum=2)
+        result = await job          # a SimulationResult
+        job.cancel()                # from any other task
+
+Usage:
+    job_runner.py <input .in>... [-j JOBS] [--max-pending N] [--timeout SECONDS] [--seed S]
+
+The .out files are written to the current directory.
+"""
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import scheduler_gpt
+
+CHECK_EVERY = 10000
+
+class SimulationCancelled(Exception):
+    """Raised for a job that was cancelled before or during its simulation."""
+
+def run_job(job_id, processes, policy, run_for, quantum, seed, cancelled):
+    """Run one simulation in a worker, checking for cancellation every CHECK_EVERY ticks.
+
+    seed seeds the lottery draws, so a lottery job is reproducible.
+    """
+    if job_id in cancelled:
+        raise SimulationCancelled(job_id)
+    processes = [scheduler_gpt.as_process(p) for p in processes]
+    if policy in scheduler_gpt.TIME_SLICED and quantum is None:
+        raise ValueError(f"Missing quantum parameter when use is '{policy}'")
+    sim = scheduler_gpt.Simulation(processes, run_for, policy, quantum, seed=seed)
+    while sim.time < run_for:
+        sim.run(until=sim.time + CHECK_EVERY)
+        if sim.time < run_for and job_id in cancelled:
+            raise SimulationCancelled(job_id)
+    return scheduler_gpt.SimulationResult(processes, run_for, policy, quantum, sim.output,
+                                          sim.finished_processes(), sim.gantt_intervals())
+
+class Job:
+    """A submitted simulation; await it for its SimulationResult."""
+    def __init__(self, runner, job_id, args):
+        self.runner = runner
+        self.id = job_id
+        self.args = args
+        self.future = asyncio.get_running_loop().create_future()
+        self.submitted = time.perf_counter()
+        self.started = None
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        """Stop the job; awaiting it then raises SimulationCancelled."""
+        if not self.future.done():
+            self.runner.cancelled[self.id] = True
+
+class JobRunner:
+    """Queue simulations and run at most `workers` of them at a time in a process pool."""
+    def __init__(self, workers=None, max_pending=1024):
+        self.workers = workers or os.cpu_count()
+        self.max_pending = max_pending
+        self.ids = itertools.count()
+        self.queue = None
+        self.pool = None
+        self.manager = None
+        self.cancelled = None
+        self.dispatchers = []
+        self.running = {}  # job id -> Job for the jobs in the pool
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Start the worker pool and one dispatcher task per worker."""
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # The cancelled set is shared with the workers through a manager process
+        self.manager = multiprocessing.Manager()
+        self.cancelled = self.manager.dict()
+        self.dispatchers = [asyncio.create_task(self.dispatch()) for _ in range(self.workers)]
+
+    async def submit(self, processes, policy, run_for, quantum=None, seed=0):
+        """Queue a simulation and return its Job, waiting while the queue is full."""
+        job = Job(self, next(self.ids), (list(processes), policy, run_for, quantum, seed))
+        await self.queue.put(job)
+        return job
+
+    async def dispatch(self):
+        """Run queued jobs one after another in the pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.id in self.cancelled:
+                    job.future.set_exception(SimulationCancelled(job.id))
+                    continue
+                job.started = time.perf_counter()
+                self.running[job.id] = job
+                try:
+                    result = await loop.run_in_executor(self.pool, run_job, job.id, *job.args, self.cancelled)
+                except Exception as e:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                else:
+                    if not job.future.done():
+                        job.future.set_result(result)
+            finally:
+                self.running.pop(job.id, None)
+                self.cancelled.pop(job.id, None)
+                self.queue.task_done()
+
+    async def join(self):
+        """Wait until every queued job has finished."""
+        await self.queue.join()
+
+    async def close(self):
+        """Cancel queued and running jobs, stop the dispatchers and shut the pool down."""
+        while not self.queue.empty():
+            job = self.queue.get_nowait()
+            job.future.set_exception(SimulationCancelled(job.id))
+            self.queue.task_done()
+        # The dispatchers would otherwise leave running jobs unresolved, hanging anyone awaiting them
+        running = list(self.running.values())
+        for job in running:
+            if not job.future.done():
+                job.future.set_exception(SimulationCancelled(job.id))
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        # Marked after the dispatchers are gone, since they unmark jobs as they stop, so the
+        # workers give up within CHECK_EVERY ticks instead of the shutdown waiting for them
+        for job in running:
+            self.cancelled[job.id] = True
+        self.pool.shutdown(cancel_futures=True)
+        self.manager.shutdown()
+
+async def run_files(filenames, workers, max_pending, timeout, seed=0):
+    """Run .in files through a JobRunner and write their .out files to the current directory."""
+    async with JobRunner(workers, max_pending) as runner:
+        async def run_file(filename, process_count, job):
+            if timeout:
+                asyncio.get_running_loop().call_later(timeout, job.cancel)
+            try:
+                result = await job
+            except SimulationCancelled:
+                print(f"{filename}: cancelled after {timeout}s")
+                return False
+            except ValueError as e:
+                print(f"{filename}: Error: {e}")
+                return False
+            output_filename = os.path.basename(filename)[:-3] + '.out'
+            result.process_count = process_count
+            result.write_output(output_filename)
+            queued = (job.started or job.submitted) - job.submitted
+            print(f"{filename}: {output_filename} (queued {queued * 1000:.1f} ms, "
+                  f"total {(time.perf_counter() - job.submitted) * 1000:.1f} ms)")
+            return True
+
+        tasks = []
+        for filename in filenames:
+            try:
+                with open(filename) as f:
+                    process_count, run_for, algorithm, quantum, processes = scheduler_gpt.parse_workload(f.read())
+            except (OSError, ValueError) as e:
+                print(f"{filename}: Error: {e}")
+                continue
+            job = await runner.submit(processes, algorithm, run_for, quantum, seed)
+            tasks.append(asyncio.create_task(run_file(filename, process_count, job)))
+        results = await asyncio.gather(*tasks)
+    return len(results) == len(filenames) and all(results)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many workloads through a bounded process pool.")
+    parser.add_argument('inputs', nargs='+', help="input files (.in)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="simulations run at once")
+    parser.add_argument('--max-pending', type=int, default=1024, help="queued jobs before submit waits")
+    parser.add_argument('--timeout', type=float, help="cancel jobs not finished this many seconds after submission")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the lottery draws of every job")
+    args = parser.parse_args()
+
+    for filename in args.inputs:
+        if not filename.endswith('.in'):
+            print(f"Error: Input file '{filename}' must have .in extension")
+            sys.exit(1)
+    ok = asyncio.run(run_files(args.inputs, args.jobs, args.max_pending, args.timeout, args.seed))
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Monte Carlo replications of the schedulers over a workload distribution.
+
+Each replication draws a workload from a JSON spec with its own seed and
+runs every policy on that same workload (common random numbers, so policy
+differences are not drowned out by workload noise). The averages from
+calculate_statistics are collected in batches across a process pool. After
+each batch the mean and confidence interval of every metric is updated, and
+the run stops once each interval's half-width is within --precision of its
+mean, or after --max-replications.
+
+Spec example:
+    {
+      "runfor": 1000,
+      "processes": {"dist": "uniform", "low": 20, "high": 40},
+      "interarrival": {"dist": "exponential", "mean": 20},
+      "burst": {"dist": "exponential", "mean": 15}
+    }
+Distributions: constant (value), uniform (low, high), exponential (mean),
+normal (mean, sd) and choice (values, optional weights). Draws are rounded
+to whole ticks. "arrival" (absolute times) may be given instead of
+"interarrival"; "processes" may also be a plain number.
+
+Usage:
+    montecarlo.py <spec.json> [--policies fcfs,sjf,rr:4] [--precision 0.05] [--confidence 0.95]
+                  [--min-replications 10] [--max-replications 1000] [-j JOBS] [--seed S] [-o results.json]
+"""
+import argparse
+import functools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import scheduler_gpt
+
+METRICS = ['avg_wait_time', 'avg_turnaround_time', 'avg_response_time']
+DISTRIBUTIONS = {'constant', 'uniform', 'exponential', 'normal', 'choice'}
+
+def draw(rng, dist):
+    """Draw a value from a distribution spec (or return a plain number)."""
+    if isinstance(dist, (int, float)):
+        return dist
+    kind = dist['dist']
+    if kind == 'constant':
+        return dist['value']
+    if kind == 'uniform':
+        return rng.uniform(dist['low'], dist['high'])
+    if kind == 'exponential':
+        return rng.expovariate(1 / dist['mean'])
+    if kind == 'normal':
+        return rng.gauss(dist['mean'], dist['sd'])
+    return rng.choices(dist['values'], dist.get('weights'))[0]
+
+def check_spec(spec):
+    """Exit with an error if the spec is missing a field or names an unknown distribution."""
+    missing = [field for field in ('runfor', 'processes', 'burst') if field not in spec]
+    if 'arrival' not in spec and 'interarrival' not in spec:
+        missing.append('arrival or interarrival')
+    if missing:
+        print(f"Error: Missing {', '.join(missing)} in the workload spec")
+        sys.exit(1)
+    for field in ('processes', 'arrival', 'interarrival', 'burst'):
+        dist = spec.get(field)
+        if isinstance(dist, dict) and dist.get('dist') not in DISTRIBUTIONS:
+            print(f"Error: Unknown distribution for {field}: {dist.get('dist')!r}")
+            sys.exit(1)
+
+def generate_workload(spec, seed):
+    """Draw one workload from the spec; returns a list of Processes."""
+    rng = random.Random(seed)
+    count = max(1, round(draw(rng, spec['processes'])))
+    processes = []
+    time = 0
+    for i in range(count):
+        if 'interarrival' in spec:
+            arrival = time
+            time += max(0, round(draw(rng, spec['interarrival'])))
+        else:
+            arrival = max(0, round(draw(rng, spec['arrival'])))
+        burst = max(1, round(draw(rng, spec['burst'])))
+        processes.append(scheduler_gpt.Process(f"P{i + 1}", arrival, burst))
+    return processes
+
+def parse_policy(text):
+    """Parse fcfs, sjf or rr:QUANTUM into (label, algorithm, quantum)."""
+    algorithm, _, quantum = text.partition(':')
+    if algorithm == 'rr':
+        if not quantum.isdigit() or int(quantum) < 1:
+            raise argparse.ArgumentTypeError(f"rr needs a quantum, e.g. rr:4 (got '{text}')")
+        return (text, algorithm, int(quantum))
+    if algorithm not in ('fcfs', 'sjf') or quantum:
+        raise argparse.ArgumentTypeError(f"unknown policy '{text}' (expected fcfs, sjf or rr:QUANTUM)")
+    return (text, algorithm, None)
+
+def policy_list(text):
+    return [parse_policy(item) for item in text.split(',') if item]
+
+def replicate(spec, policies, seed):
+    """Run every policy on the workload drawn with seed; returns {label: statistics}."""
+    processes = generate_workload(spec, seed)
+    run_for = spec['runfor']
+    results = {}
+    for label, algorithm, quantum in policies:
+        if algorithm == 'fcfs':
+            output, finished = scheduler_gpt.fcfs_scheduler(processes, run_for)
+        elif algorithm == 'sjf':
+            output, finished = scheduler_gpt.sjf_scheduler(processes, run_for)
+        else:
+            output, finished = scheduler_gpt.rr_scheduler(processes, run_for, quantum)
+        stats = scheduler_gpt.calculate_statistics(output, finished, run_for, processes)
+        stats['completed'] = len(finished) / len(processes)
+        results[label] = stats
+    return results
+
+def replicate_with_args(args):
+    """replicate() taking (spec, policies, seed) for pool.map."""
+    return replicate(*args)
+
+def t_central_probability(theta, df):
+    """P(|T| <= sqrt(df) * tan(theta)) for Student's t with integer df.
+
+    The finite series of Abramowitz & Stegun 26.7.3 (odd df) and 26.7.4 (even df).
+    """
+    cos2 = math.cos(theta) ** 2
+    total = 0.0
+    if df % 2:
+        term = math.cos(theta)
+        for k in range(1, (df - 1) // 2 + 1):
+            total += term
+            term *= cos2 * 2 * k / (2 * k + 1)
+        return 2 / math.pi * (theta + math.sin(theta) * total)
+    term = 1.0
+    for k in range(1, df // 2 + 1):
+        total += term
+        term *= cos2 * (2 * k - 1) / (2 * k)
+    return math.sin(theta) * total
+
+@functools.lru_cache(maxsize=None)
+def t_quantile(p, df):
+    """Student's t quantile for integer df, exact up to floating-point rounding.
+
+    Solves for theta = atan(t / sqrt(df)) on the exact distribution function
+    with Newton steps from a normal-based start, bisecting whenever a step
+    would leave the bracket.
+    """
+    if p < 0.5:
+        return -t_quantile(1 - p, df)
+    target = 2 * p - 1
+    # d/dtheta of t_central_probability is scale * cos(theta) ** (df - 1)
+    scale = 2 * math.exp(math.lgamma((df + 1) / 2) - math.lgamma(df / 2)) / math.sqrt(math.pi)
+    z = statistics.NormalDist().inv_cdf(p)
+    theta = math.atan((z + (z ** 3 + z) / (4 * df)) / math.sqrt(df))
+    low, high = 0.0, math.pi / 2
+    for _ in range(200):
+        error = t_central_probability(theta, df) - target
+        if error < 0:
+            low = theta
+        else:
+            high = theta
+        step = error / (scale * math.cos(theta) ** (df - 1))
+        theta -= step
+        if not low < theta < high:
+            theta = (low + high) / 2
+        elif abs(step) < 1e-15:
+            break
+        if high - low < 1e-15:
+            break
+    return math.sqrt(df) * math.tan(theta)
+
+def confidence_interval(values, confidence):
+    """Return (mean, half-width) of the two-sided confidence interval for the mean."""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, math.inf
+    return mean, t_quantile((1 + confidence) / 2, len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+
+def summarize(samples, confidence):
+    """Return {label: {metric: {mean, half_width, low, high}}} for the collected samples."""
+    summary = {}
+    for label, by_metric in samples.items():
+        summary[label] = {}
+        for metric, values in by_metric.items():
+            mean, half_width = confidence_interval(values, confidence)
+            summary[label][metric] = {'mean': mean, 'half_width': half_width,
+                                      'low': mean - half_width, 'high': mean + half_width}
+    return summary
+
+def precise_enough(summary, precision):
+    """Whether every metric's half-width is within precision of its mean (a zero mean needs a zero width)."""
+    for by_metric in summary.values():
+        for metric in METRICS:
+            interval = by_metric[metric]
+            if interval['half_width'] > precision * max(abs(interval['mean']), 1e-9):
+                return False
+    return True
+
+def run_replications(spec, policies, args):
+    """Run batches of replications until the intervals are tight enough; return (summary, count)."""
+    samples = {label: {metric: [] for metric in METRICS + ['completed']} for label, _, _ in policies}
+    count = 0
+    batch = max(args.jobs, 1)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        while count < args.max_replications:
+            size = min(batch, args.max_replications - count)
+            seeds = range(args.seed + count, args.seed + count + size)
+            for results in pool.map(replicate_with_args, ((spec, policies, seed) for seed in seeds)):
+                for label, stats in results.items():
+                    for metric, values in samples[label].items():
+                        values.append(stats[metric])
+            count += size
+            summary = summarize(samples, args.confidence)
+            if count >= args.min_replications and precise_enough(summary, args.precision):
+                break
+    return summary, count
+
+def finite_or_none(summary):
+    """Return the summary with infinite half-widths (one replication so far) as None, for JSON."""
+    return {label: {metric: {key: value if math.isfinite(value) else None for key, value in interval.items()}
+                    for metric, interval in by_metric.items()}
+            for label, by_metric in summary.items()}
+
+def print_summary(summary, count, confidence, converged):
+    """Print each policy's metric means with their confidence intervals."""
+    print(f"{count} replications, {confidence:.0%} confidence intervals"
+          f"{'' if converged else ' (precision target not reached)'}")
+    print(f"{'policy':<10}" + ''.join(f"{metric:>26}" for metric in METRICS) + f"{'completed':>12}")
+    for label, by_metric in summary.items():
+        cells = ''.join(f"{by_metric[m]['mean']:>15.2f} ± {by_metric[m]['half_width']:<8.2f}" for m in METRICS)
+        print(f"{label:<10}{cells}{by_metric['completed']['mean']:>11.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo comparison of scheduling policies.")
+    parser.add_argument('spec', help="workload distribution spec (JSON)")
+    parser.add_argument('--policies', type=policy_list, default=policy_list('fcfs,sjf,rr:4'),
+                        help="comma-separated policies: fcfs, sjf, rr:QUANTUM")
+    parser.add_argument('--precision', type=float, default=0.05,
+                        help="stop when every half-width is within this fraction of its mean")
+    parser.add_argument('--confidence', type=float, default=0.95, help="confidence level")
+    parser.add_argument('--min-replications', type=int, default=10, help="replications before stopping early")
+    parser.add_argument('--max-replications', type=int, default=1000, help="upper limit on replications")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first replication")
+    parser.add_argument('-o', '--output', help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    try:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Spec file '{args.spec}' not found")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: Spec file '{args.spec}' is not valid JSON: {e}")
+        sys.exit(1)
+    check_spec(spec)
+    if not 0 < args.confidence < 1:
+        print("Error: --confidence must be between 0 and 1")
+        sys.exit(1)
+    if args.max_replications < 1:
+        print("Error: --max-replications must be at least 1")
+        sys.exit(1)
+
+    summary, count = run_replications(spec, args.policies, args)
+    converged = precise_enough(summary, args.precision)
+    print_summary(summary, count, args.confidence, converged)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'spec': spec, 'replications': count, 'confidence': args.confidence,
+                       'precision': args.precision, 'converged': converged, 'seed': args.seed,
+                       'summary': finite_or_none(summary)}, f, indent=2, allow_nan=False)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Simulate a workload on several CPUs, each with its own run queue.
+
+Every CPU is a scheduler_gpt.Simulation with its own ready queue, and all of
+them are advanced together one tick at a time with Simulation.run(), so
+each CPU schedules exactly as the single-CPU scheduler does. At the start of
+each tick, arriving processes are added to the CPU with the fewest runnable
+processes (the lowest numbered on a tie), then the CPUs are balanced
+(--balance):
+
+  none   processes stay on the CPU they arrived on
+  push   every --balance-every ticks, queued processes are pushed from the
+         busiest CPU to the least busy until their loads differ by at most one
+  pull   a CPU with nothing to run pulls one queued process from the busiest CPU
+  steal  a CPU with nothing to run picks a random other CPU (seeded by --seed)
+         and steals half of its runnable processes
+
+Balancing only moves queued processes, taking them from the end of the queue
+the CPU would serve last. A migrated process pays --migration-cost ticks on
+its new CPU to refill its cache: its remaining burst grows by that much, so
+the CPU is busy and the quantum runs, and the 'selected (burst N)' lines
+include the cost still to pay.
+
+The .out file has the usual header, events and per-process statistics. Each
+event ends with the CPU it happened on, including a per-tick 'Idle on CPUn'
+line for every idle CPU; with --cpus 1 the events are the single-CPU
+scheduler's with ' on CPU0' appended. The file ends with the per-CPU
+utilisation and migrations and the queue imbalance: the runnable count of
+the busiest CPU minus that of the least busy one after each tick. --json also
+writes the runnable counts per CPU every --sample ticks.
+
+Usage:
+    multicore.py <input .in> [--cpus 4] [--balance none|push|pull|steal] [--balance-every 10]
+                 [--migration-cost 0] [--seed S] [-o out.out] [--json stats.json] [--sample N]
+
+The .out file is written to the current directory.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+import scheduler_gpt
+from scheduler_gpt import InputError
+
+BALANCERS = ['none', 'push', 'pull', 'steal']
+# Samples kept for --json when --sample is not given
+DEFAULT_SAMPLES = 1000
+
+class MultiCoreSimulation:
+    """A workload scheduled on per-CPU Simulations with optional load balancing."""
+    def __init__(self, processes, run_for, algorithm, quantum=None, cpus=2, balance='none',
+                 balance_every=10, migration_cost=0, seed=0, sample_every=1):
+        if algorithm in scheduler_gpt.TIME_SLICED and quantum is None:
+            raise ValueError(f"Missing quantum parameter when use is '{algorithm}'")
+        if balance not in BALANCERS:
+            raise ValueError(f"unknown balancing '{balance}'")
+        if cpus < 1 or balance_every < 1 or migration_cost < 0 or sample_every < 1:
+            raise ValueError("cpus, balance_every and sample_every must be positive and migration_cost not negative")
+        # Replaced by each CPU's own Process object when the process arrives there
+        self.processes = [scheduler_gpt.as_process(p) for p in processes]
+        self.run_for = run_for
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.balance = balance
+        self.balance_every = balance_every
+        self.migration_cost = migration_cost
+        self.sample_every = sample_every
+        self.rng = random.Random(seed)
+        # CPU n draws its lottery tickets with seed + n, so one CPU matches the single-CPU scheduler
+        self.cpus = [scheduler_gpt.Simulation([], run_for, algorithm, quantum, seed=seed + number)
+                     for number in range(cpus)]
+
+        # FCFS places simultaneous arrivals by name, the others in input order
+        order = range(len(self.processes))
+        if algorithm == 'fcfs':
+            order = sorted(order, key=lambda k: (self.processes[k].arrival, self.processes[k].name))
+        self.arrivals = {}
+        for k in order:
+            self.arrivals.setdefault(self.processes[k].arrival, []).append(k)
+
+        self.time = 0
+        self.output = []
+        self.finished = []  # Process objects in completion order
+        self.migrations = {}  # process name -> times migrated
+        self.migrations_in = [0] * cpus
+        self.migrations_out = [0] * cpus
+        self.imbalance_total = 0
+        self.imbalance_max = 0
+        self.samples = []  # (time, runnable count per CPU)
+
+    def finished_processes(self):
+        """Return the finished Process objects in completion order."""
+        return list(self.finished)
+
+    def load(self, cpu):
+        """Return the runnable processes on cpu before its next tick: queued, arriving, and running unless done."""
+        running = cpu.current is not None and cpu.processes[cpu.current].remaining > 0
+        return len(cpu.ready_queue) + len(cpu.arrivals.get(cpu.time, ())) + running
+
+    def idle(self, cpu):
+        return self.load(cpu) == 0
+
+    def migrate(self, source, target, count, reason):
+        """Move up to count queued processes from CPU source to CPU target."""
+        source_cpu, target_cpu = self.cpus[source], self.cpus[target]
+        for p in source_cpu.take_ready(count):
+            p.remaining += self.migration_cost
+            target_cpu.adopt(p)
+            self.migrations[p.name] = self.migrations.get(p.name, 0) + 1
+            self.migrations_out[source] += 1
+            self.migrations_in[target] += 1
+            self.output.append(f"Time{self.time:4} : {p.name} migrated from CPU{source} to CPU{target} ({reason})")
+
+    def push(self):
+        """Push queued processes from the busiest CPU to the least busy until their loads differ by at most one."""
+        while True:
+            loads = [self.load(cpu) for cpu in self.cpus]
+            busiest = loads.index(max(loads))
+            idlest = loads.index(min(loads))
+            if loads[busiest] - loads[idlest] < 2 or not self.cpus[busiest].ready_queue:
+                return
+            self.migrate(busiest, idlest, 1, 'push')
+
+    def pull(self):
+        """Let each CPU with nothing to run pull one queued process from the busiest CPU."""
+        for number, cpu in enumerate(self.cpus):
+            if self.idle(cpu):
+                loads = [self.load(other) for other in self.cpus]
+                busiest = loads.index(max(loads))
+                # A lone queued process is about to run where it is
+                if loads[busiest] > 1 and self.cpus[busiest].ready_queue:
+                    self.migrate(busiest, number, 1, 'pull')
+
+    def steal(self):
+        """Let each CPU with nothing to run steal half the runnable processes of a random other CPU."""
+        count = len(self.cpus)
+        if count < 2:
+            return
+        for number, cpu in enumerate(self.cpus):
+            if self.idle(cpu):
+                victim = (number + 1 + self.rng.randrange(count - 1)) % count
+                load = self.load(self.cpus[victim])
+                if load > 1 and self.cpus[victim].ready_queue:
+                    self.migrate(victim, number, load // 2, 'steal')
+
+    def run(self):
+        """Advance every CPU to run_for, one tick at a time."""
+        cpus = self.cpus
+        emit = self.output.append
+        balance = self.balance
+        for time in range(self.time, self.run_for):
+            self.time = time
+            for k in self.arrivals.get(time, ()):
+                cpu = min(cpus, key=self.load)
+                cpu.add_process(self.processes[k])
+                # Keep the CPU's copy, which is the one it updates
+                self.processes[k] = cpu.processes[-1]
+
+            if balance == 'push' and time % self.balance_every == 0:
+                self.push()
+            elif balance == 'pull':
+                self.pull()
+            elif balance == 'steal':
+                self.steal()
+
+            for number, cpu in enumerate(cpus):
+                finished = len(cpu.finished)
+                cpu.run(until=time + 1)
+                suffix = f" on CPU{number}"
+                for line in cpu.output:
+                    emit(line + suffix)
+                # Each CPU's events only pass through its output on their way here
+                cpu.output.clear()
+                self.finished.extend(cpu.processes[i] for i in cpu.finished[finished:])
+
+            loads = [self.load(cpu) for cpu in cpus]
+            imbalance = max(loads) - min(loads)
+            self.imbalance_total += imbalance
+            self.imbalance_max = max(self.imbalance_max, imbalance)
+            if time % self.sample_every == 0:
+                self.samples.append((time, loads))
+        self.time = self.run_for
+
+    def statistics(self):
+        """Return the calculate_statistics averages plus the per-CPU and balancing figures."""
+        stats = scheduler_gpt.calculate_statistics(self.output, self.finished, self.run_for, self.processes)
+        stats['cpus'] = []
+        for number, cpu in enumerate(self.cpus):
+            busy = sum(end - start for name, start, end in cpu.gantt_intervals() if name is not None)
+            stats['cpus'].append({
+                'cpu': number,
+                'utilisation': busy / self.run_for if self.run_for else 0,
+                'busy': busy,
+                'migration_cost': self.migrations_in[number] * self.migration_cost,
+                'migrations_in': self.migrations_in[number],
+                'migrations_out': self.migrations_out[number],
+            })
+        stats['migrations'] = sum(self.migrations.values())
+        stats['avg_imbalance'] = round(self.imbalance_total / self.run_for, 2) if self.run_for else 0
+        stats['max_imbalance'] = self.imbalance_max
+        return stats
+
+    def summary_lines(self, stats=None):
+        """Yield the per-CPU and balancing summary lines."""
+        stats = stats or self.statistics()
+        for cpu in stats['cpus']:
+            yield (f"CPU{cpu['cpu']} utilisation {cpu['utilisation']:6.1%} (busy{cpu['busy']:4}, "
+                   f"migration cost{cpu['migration_cost']:4}) migrations in{cpu['migrations_in']:4} "
+                   f"out{cpu['migrations_out']:4}")
+        yield f"Migrations{stats['migrations']:4}"
+        yield f"Queue imbalance avg {stats['avg_imbalance']:.2f} max{stats['max_imbalance']:4}"
+
+    def lines(self):
+        """Yield the lines of the .out file, without newlines."""
+        header = list(scheduler_gpt.output_header(len(self.processes), self.algorithm, self.quantum))
+        balancing = {'none': "no balancing", 'push': f"push balancing every {self.balance_every} ticks",
+                     'pull': "idle pull balancing", 'steal': "work stealing"}[self.balance]
+        header.insert(1, f"{len(self.cpus):3} CPUs, {balancing}, migration cost {self.migration_cost}")
+        yield from header
+        yield from self.output
+        yield from scheduler_gpt.output_footer(self.finished, self.run_for, self.processes)
+        yield ""
+        yield from self.summary_lines()
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a workload on several CPUs with per-CPU run queues.")
+    parser.add_argument('input', help="input file (.in)")
+    parser.add_argument('--cpus', type=int, default=4, help="number of CPUs")
+    parser.add_argument('--balance', choices=BALANCERS, default='none', help="load balancing")
+    parser.add_argument('--balance-every', type=int, default=10, help="ticks between --balance push rounds")
+    parser.add_argument('--migration-cost', type=int, default=0,
+                        help="extra ticks of work a process takes to its new CPU when it migrates")
+    parser.add_argument('--seed', type=int, default=0, help="seed for work stealing victims and lottery draws")
+    parser.add_argument('-o', '--output', help="output file (default: <input name>.cpus<N>.out)")
+    parser.add_argument('--json', help="also write the statistics and the runnable counts per CPU as JSON")
+    parser.add_argument('--sample', type=int,
+                        help=f"ticks between the --json runnable counts (default: about {DEFAULT_SAMPLES} samples)")
+    args = parser.parse_args()
+
+    if not args.input.endswith('.in'):
+        print("Error: Input file must have .in extension")
+        sys.exit(1)
+    if args.cpus < 1:
+        print("Error: --cpus must be at least 1")
+        sys.exit(1)
+    if args.balance_every < 1 or (args.sample is not None and args.sample < 1):
+        print("Error: --balance-every and --sample must be at least 1")
+        sys.exit(1)
+    if args.migration_cost < 0:
+        print("Error: --migration-cost cannot be negative")
+        sys.exit(1)
+    try:
+        with open(args.input) as f:
+            _, run_for, algorithm, quantum, processes = scheduler_gpt.parse_workload(f.read())
+    except FileNotFoundError:
+        print(f"Error: Input file '{args.input}' not found")
+        sys.exit(1)
+    except InputError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if algorithm not in scheduler_gpt.ALGORITHMS:
+        print(f"Error: Unknown algorithm '{algorithm}'")
+        sys.exit(1)
+
+    sample_every = args.sample or max(1, run_for // DEFAULT_SAMPLES)
+    sim = MultiCoreSimulation(processes, run_for, algorithm, quantum, args.cpus, args.balance,
+                              args.balance_every, args.migration_cost, args.seed, sample_every)
+    sim.run()
+    stats = sim.statistics()
+
+    output_filename = args.output or os.path.basename(args.input)[:-3] + f".cpus{args.cpus}.out"
+    with open(output_filename, 'w') as f:
+        for line in sim.lines():
+            f.write(line + "\n")
+    for line in sim.summary_lines(stats):
+        print(line)
+    print(f"Output written to {output_filename}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'input': args.input, 'algorithm': algorithm, 'quantum': quantum, 'cpus': args.cpus,
+                       'balance': args.balance, 'balance_every': args.balance_every,
+                       'migration_cost': args.migration_cost, 'seed': args.seed, 'statistics': stats,
+                       'process_migrations': sim.migrations, 'sample_every': sample_every,
+                       'samples': [{'time': time, 'runnable': loads, 'imbalance': max(loads) - min(loads)}
+                                   for time, loads in sim.samples]}, f, indent=2)
+        print(f"Statistics written to {args.json}")
+
+if __name__ == "__main__":
+    main()
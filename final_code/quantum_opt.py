@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Search for the Round Robin quantum that works best for a workload.
+
+Every candidate quantum is one rr simulation of the workload, and its
+metrics are memoized, so no quantum is simulated twice. Two searches are
+available:
+
+  grid    coarse to fine (default): probe --probes evenly spaced quanta at
+          once across a process pool, then narrow the range to the
+          neighbours of the best one and repeat until every quantum in
+          the range has been probed
+  golden  the same first round of coarse probes, then golden-section search
+          over the integers between the neighbours of the best one, one
+          probe at a time; it assumes a single minimum within that bracket
+
+The range defaults to 1 up to the longest burst: with a quantum at least
+that long no process is ever preempted, so larger quanta give the same
+schedule. The input's use and quantum lines are optional and ignored.
+Objectives (lower is better):
+
+  avg_response, p99_response, avg_turnaround, avg_wait, switches
+  weighted     sum of --weights, e.g. response=1,p99_response=0.5,switches=0.1
+
+Metrics are over the processes that finish. A quantum that leaves more
+processes unfinished always loses, and ties go to the smaller quantum, so
+the plateau of identical schedules above the longest burst is never preferred.
+
+Usage:
+    quantum_opt.py <input .in> [--objective avg_response] [--weights response=1,switches=0.1]
+                   [--method grid|golden] [--min Q] [--max Q] [--probes 8] [-j JOBS] [-o results.json]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import scheduler_gpt
+from scheduler_gpt import InputError
+
+METRICS = ['avg_response', 'p99_response', 'avg_turnaround', 'avg_wait', 'switches']
+OBJECTIVES = METRICS + ['weighted']
+# Short names accepted in --weights
+WEIGHT_ALIASES = {'response': 'avg_response', 'turnaround': 'avg_turnaround', 'wait': 'avg_wait'}
+GOLDEN = (math.sqrt(5) - 1) / 2
+
+def evaluate(processes, run_for, quantum):
+    """Simulate the workload with quantum and return its metrics."""
+    result = scheduler_gpt.simulate(processes, 'rr', run_for, quantum)
+    finished = result.finished
+    responses = sorted(p.response_time for p in finished)
+    count = len(finished)
+    return {
+        'quantum': quantum,
+        'unfinished': len(result.processes) - count,
+        'avg_response': sum(responses) / count if count else 0,
+        # Nearest-rank percentile
+        'p99_response': responses[max(0, math.ceil(0.99 * count) - 1)] if count else 0,
+        'avg_turnaround': sum(p.turnaround_time for p in finished) / count if count else 0,
+        'avg_wait': sum(p.wait_time for p in finished) / count if count else 0,
+        'switches': sum(1 for line in result.output if line.endswith(')') and ' selected (burst' in line),
+    }
+
+def evaluate_with_args(args):
+    """evaluate() taking (processes, run_for, quantum) for pool.map."""
+    return evaluate(*args)
+
+def parse_weights(text):
+    """Parse METRIC=WEIGHT pairs, e.g. response=1,switches=0.1."""
+    weights = {}
+    for item in text.split(','):
+        metric, sep, weight = item.partition('=')
+        metric = WEIGHT_ALIASES.get(metric, metric)
+        if not sep or metric not in METRICS:
+            raise argparse.ArgumentTypeError(
+                f"invalid weight '{item}' (expected METRIC=WEIGHT with METRIC in {', '.join(METRICS)})")
+        try:
+            weights[metric] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight '{item}'")
+    return weights
+
+def score(metrics, objective, weights=None):
+    """Return the sort key of a probe: fewer unfinished processes, then the objective, then a smaller quantum."""
+    if objective == 'weighted':
+        value = sum(weight * metrics[metric] for metric, weight in weights.items())
+    else:
+        value = metrics[objective]
+    return (metrics['unfinished'], value, metrics['quantum'])
+
+def read_workload(text):
+    """Return (run_for, processes) from .in text; use and quantum lines are not required."""
+    run_for = None
+    processes = []
+    for keyword, value in scheduler_gpt.iter_workload(text.splitlines()):
+        if keyword == 'runfor':
+            run_for = value
+        elif keyword == 'process':
+            processes.append(value)
+    if run_for is None:
+        raise InputError("Missing parameter runfor.")
+    return run_for, processes
+
+class QuantumSearch:
+    """Memoized quantum probes for one workload, run in a process pool."""
+    def __init__(self, processes, run_for, objective, weights=None, pool=None):
+        self.processes = processes
+        self.run_for = run_for
+        self.objective = objective
+        self.weights = weights
+        self.pool = pool
+        self.probes = {}  # quantum -> metrics
+
+    def probe(self, quanta):
+        """Simulate the quanta not probed yet, in parallel when there is a pool."""
+        missing = sorted(set(quanta) - set(self.probes))
+        jobs = [(self.processes, self.run_for, q) for q in missing]
+        if self.pool and len(jobs) > 1:
+            results = self.pool.map(evaluate_with_args, jobs)
+        else:
+            results = map(evaluate_with_args, jobs)
+        for metrics in results:
+            self.probes[metrics['quantum']] = metrics
+
+    def key(self, quantum):
+        self.probe([quantum])
+        return score(self.probes[quantum], self.objective, self.weights)
+
+    def best(self, low=None, high=None):
+        """Return the best probed quantum, optionally within [low, high]."""
+        candidates = [q for q in self.probes
+                      if (low is None or q >= low) and (high is None or q <= high)]
+        return min(candidates, key=self.key)
+
+    def bracket(self, low, high, count):
+        """Probe count evenly spaced quanta in parallel; return the range between the best one's neighbours."""
+        step = (high - low) / (count - 1)
+        self.probe(round(low + i * step) for i in range(count))
+        best = self.best(low, high)
+        reach = math.ceil(step)
+        return max(low, best - reach), min(high, best + reach)
+
+    def grid(self, low, high, count):
+        """Coarse-to-fine search with count parallel probes per round."""
+        # With three probes the neighbours of the middle one span the whole range
+        count = max(count, 4)
+        previous = None
+        while True:
+            if high - low + 1 <= count or (low, high) == previous:
+                self.probe(range(low, high + 1))
+                return self.best(low, high)
+            previous = (low, high)
+            low, high = self.bracket(low, high, count)
+
+    def golden(self, low, high, count):
+        """Golden-section search over the integers around the best of count coarse probes in [low, high].
+
+        The objective is not unimodal in the quantum, so the coarse probes
+        pick the region to refine.
+        """
+        if high - low + 1 <= count:
+            self.probe(range(low, high + 1))
+            return self.best(low, high)
+        a, b = self.bracket(low, high, max(count, 4))
+        c = round(b - GOLDEN * (b - a))
+        d = round(a + GOLDEN * (b - a))
+        while b - a > 2:
+            if c >= d:
+                c, d = (a + b) // 2, (a + b) // 2 + 1
+            if self.key(c) <= self.key(d):
+                b = d
+                d = c
+                c = round(b - GOLDEN * (b - a))
+            else:
+                a = c
+                c = d
+                d = round(a + GOLDEN * (b - a))
+        self.probe(range(a, b + 1))
+        return self.best(a, b)
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the Round Robin quantum that optimizes a metric.")
+    parser.add_argument('input', help="input file (.in); its use and quantum lines are optional and ignored")
+    parser.add_argument('--objective', choices=OBJECTIVES, default='avg_response', help="metric to minimize")
+    parser.add_argument('--weights', type=parse_weights, help="metric weights for --objective weighted")
+    parser.add_argument('--method', choices=['grid', 'golden'], default='grid', help="search method")
+    parser.add_argument('--min', type=int, default=1, help="smallest quantum to try")
+    parser.add_argument('--max', type=int, help="largest quantum to try (default: the longest burst)")
+    parser.add_argument('--probes', type=int, default=8,
+                        help="quanta probed per grid round and in the first golden round (at least 4)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('-o', '--output', help="also write every probe as JSON")
+    args = parser.parse_args()
+
+    if not args.input.endswith('.in'):
+        print("Error: Input file must have .in extension")
+        sys.exit(1)
+    if args.objective == 'weighted' and not args.weights:
+        print("Error: --objective weighted needs --weights")
+        sys.exit(1)
+    try:
+        with open(args.input) as f:
+            run_for, processes = read_workload(f.read())
+    except FileNotFoundError:
+        print(f"Error: Input file '{args.input}' not found")
+        sys.exit(1)
+    except InputError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not processes:
+        print("Error: The workload has no processes")
+        sys.exit(1)
+
+    low = max(1, args.min)
+    high = args.max if args.max is not None else max(max(p.burst for p in processes), low)
+    if high < low:
+        print("Error: --max is below --min")
+        sys.exit(1)
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        search = QuantumSearch(processes, run_for, args.objective, args.weights, pool)
+        if args.method == 'grid':
+            best = search.grid(low, high, args.probes)
+        else:
+            best = search.golden(low, high, args.probes)
+
+    print(f"{'quantum':>8}{'unfinished':>12}" + ''.join(f"{metric:>16}" for metric in METRICS))
+    for quantum in sorted(search.probes):
+        metrics = search.probes[quantum]
+        marker = ' *' if quantum == best else ''
+        print(f"{quantum:>8}{metrics['unfinished']:>12}"
+              + ''.join(f"{metrics[metric]:>16.2f}" for metric in METRICS) + marker)
+    print(f"\nBest quantum for {args.objective}: {best} "
+          f"({len(search.probes)} simulations for quanta {low}..{high})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'input': args.input, 'objective': args.objective, 'weights': args.weights,
+                       'method': args.method, 'range': [low, high], 'best': best,
+                       'probes': [search.probes[q] for q in sorted(search.probes)]}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,121 @@
 
 
 #!/usr/bin/env python3
+import argparse
+import bisect
+import concurrent.futures
+import contextlib
+import csv
+import gzip
+import hashlib
+import heapq
+import http.server
+import json
 import sys
 import os
+import random
+import socketserver
+import tempfile
+import time
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional, only needed for --export parquet
+    pyarrow = None
+
+ALGORITHMS = ('fcfs', 'sjf', 'rr', 'lottery', 'stride')
+# Policies that give the CPU away when the quantum runs out
+TIME_SLICED = ('rr', 'lottery', 'stride')
+# Stride scheduling: a process's pass advances by STRIDE1 // tickets per quantum it runs
+STRIDE1 = 1 << 20
 
 class Process:
-    def __init__(self, name, arrival, burst):
+    def __init__(self, name, arrival, burst, tickets=1):
         self.name = name
         self.arrival = arrival
         self.burst = burst
+        self.tickets = tickets
         self.remaining = burst
         self.start_time = -1
         self.finish_time = -1
         self.wait_time = 0
         self.response_time = -1
         self.turnaround_time = 0
-        
+
+def peak_rss_kb():
+    """Return the peak resident set size of this process in KiB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+class Profiler:
+    """Collect per-phase wall/CPU time, peak RSS growth and scheduler counters for --profile.
+
+    ru_maxrss is a process-wide high-water mark, so each phase records how much
+    it raised the peak; a phase that stays below an earlier peak shows 0.
+    """
+    def __init__(self):
+        self.phases = []
+        self.counters = {'ticks': 0, 'events': 0, 'queue_ops': 0, 'preemptions': 0}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        rss_start = peak_rss_kb()
+        try:
+            yield
+        finally:
+            rss_end = peak_rss_kb()
+            self.phases.append((name, time.perf_counter() - wall_start, time.process_time() - cpu_start,
+                                None if rss_end is None else rss_end - rss_start))
+
+    def report(self):
+        """Print the phase timings and counters."""
+        print("\nProfile summary")
+        print(f"{'phase':<16}{'wall ms':>12}{'cpu ms':>12}{'peak RSS +KiB':>16}")
+        for name, wall, cpu, rss in self.phases:
+            rss_text = '-' if rss is None else f"+{rss}"
+            print(f"{name:<16}{wall * 1000:12.3f}{cpu * 1000:12.3f}{rss_text:>16}")
+        total_wall = sum(phase[1] for phase in self.phases)
+        total_cpu = sum(phase[2] for phase in self.phases)
+        peak = peak_rss_kb()
+        peak_text = '-' if peak is None else f"{peak} peak"
+        print(f"{'total':<16}{total_wall * 1000:12.3f}{total_cpu * 1000:12.3f}{peak_text:>16}")
+        for name, value in self.counters.items():
+            print(f"{name:<16}{value:12}")
+
+class NullProfiler:
+    """Stand-in used when profiling is off; phases and counters cost nothing."""
+    counters = None
+    _phase = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def report(self):
+        pass
+
+def add_counters(counters, ticks, events, queue_ops, preemptions):
+    """Add one scheduler run's counts to a Profiler counters dict."""
+    if counters is not None:
+        counters['ticks'] += ticks
+        counters['events'] += events
+        counters['queue_ops'] += queue_ops
+        counters['preemptions'] += preemptions
+
+class InputError(ValueError):
+    """A workload description that cannot be parsed."""
+
 def parse_input(filename):
     """Parse the input file and return scheduling parameters and processes."""
     try:
@@ -25,13 +125,64 @@ def parse_input(filename):
     except FileNotFoundError:
         print(f"Error: Input file '{filename}' not found")
         sys.exit(1)
-    
+    try:
+        return parse_workload(lines)
+    except InputError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def parse_workload(lines):
+    """Parse workload lines (or one string) in the .in format.
+
+    Returns (process_count, run_for, algorithm, quantum, processes) and
+    raises InputError instead of exiting, so it can be used as a library.
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+
     processes = []
     process_count = None
     run_for = None
     algorithm = None
     quantum = None
+
+    for keyword, value in iter_workload(lines):
+        if keyword == 'processcount':
+            process_count = value
+        elif keyword == 'runfor':
+            run_for = value
+        elif keyword == 'use':
+            algorithm = value
+        elif keyword == 'quantum':
+            quantum = value
+        elif keyword == 'process':
+            processes.append(value)
+
+    # Validate required parameters
+    check_header(process_count, run_for, algorithm, quantum)
     
+    return process_count, run_for, algorithm, quantum, processes
+
+def check_header(process_count, run_for, algorithm, quantum):
+    """Raise InputError if a required workload parameter is missing, or a time-sliced quantum is below 1."""
+    if process_count is None:
+        raise InputError("Missing parameter processcount.")
+    if run_for is None:
+        raise InputError("Missing parameter runfor.")
+    if algorithm is None:
+        raise InputError("Missing parameter use.")
+    if algorithm in TIME_SLICED and quantum is None:
+        raise InputError(f"Missing quantum parameter when use is '{algorithm}'")
+    if algorithm in TIME_SLICED and quantum < 1:
+        raise InputError("Parameter quantum must be at least 1.")
+
+def iter_workload(lines):
+    """Yield (keyword, value) for each line of a workload, stopping at 'end'.
+
+    Keywords are processcount, runfor, use, quantum, process (value is a
+    Process) and time (a stream's promise that nothing arrives earlier).
+    Lines are consumed lazily, so this also works on a live stream.
+    """
     for line in lines:
         # Remove comments and strip whitespace
         if '#' in line:
@@ -43,35 +194,22 @@ def parse_input(filename):
             
         parts = line.split()
         
-        if parts[0] == 'processcount':
+        if parts[0] in ('processcount', 'runfor', 'quantum', 'time'):
             if len(parts) < 2:
-                print("Error: Missing parameter processcount.")
-                sys.exit(1)
-            process_count = int(parts[1])
-            
-        elif parts[0] == 'runfor':
-            if len(parts) < 2:
-                print("Error: Missing parameter runfor.")
-                sys.exit(1)
-            run_for = int(parts[1])
+                raise InputError(f"Missing parameter {parts[0]}.")
+            yield parts[0], int(parts[1])
             
         elif parts[0] == 'use':
             if len(parts) < 2:
-                print("Error: Missing parameter use.")
-                sys.exit(1)
-            algorithm = parts[1]
-            
-        elif parts[0] == 'quantum':
-            if len(parts) < 2:
-                print("Error: Missing parameter quantum.")
-                sys.exit(1)
-            quantum = int(parts[1])
+                raise InputError("Missing parameter use.")
+            yield 'use', parts[1]
             
         elif parts[0] == 'process':
-            # Parse process line: process name NAME arrival TIME burst TIME
+            # Parse process line: process name NAME arrival TIME burst TIME [tickets N]
             name = None
             arrival = None
             burst = None
+            tickets = 1
             
             i = 1
             while i < len(parts):
@@ -84,269 +222,703 @@ def parse_input(filename):
                 elif parts[i] == 'burst' and i + 1 < len(parts):
                     burst = int(parts[i + 1])
                     i += 2
+                elif parts[i] == 'tickets' and i + 1 < len(parts):
+                    tickets = int(parts[i + 1])
+                    i += 2
                 else:
                     i += 1
             
             if name is None or arrival is None or burst is None:
-                print("Error: Missing parameter in process definition.")
-                sys.exit(1)
+                raise InputError("Missing parameter in process definition.")
+            if tickets < 1:
+                raise InputError(f"Process {name} needs at least one ticket.")
                 
-            processes.append(Process(name, arrival, burst))
+            yield 'process', Process(name, arrival, burst, tickets)
             
         elif parts[0] == 'end':
-            break
-    
-    # Validate required parameters
-    if process_count is None:
-        print("Error: Missing parameter processcount.")
-        sys.exit(1)
-    if run_for is None:
-        print("Error: Missing parameter runfor.")
-        sys.exit(1)
-    if algorithm is None:
-        print("Error: Missing parameter use.")
-        sys.exit(1)
-    if algorithm == 'rr' and quantum is None:
-        print("Error: Missing quantum parameter when use is 'rr'")
-        sys.exit(1)
-    
-    return process_count, run_for, algorithm, quantum, processes
-
-def fcfs_scheduler(processes, run_for):
+            return
+
+class TicketTree:
+    """The tickets of the ready processes in a Fenwick tree, for lottery draws in O(log n).
+
+    Each process gets the next slot when it first joins, so a draw only
+    depends on the order the processes arrived in, not on the order of the
+    input lines. Iterating yields the ready process indices in slot order.
+    """
+    def __init__(self, capacity=0):
+        self.slots = {}  # process index -> slot
+        self.members = []  # slot -> process index
+        self.weights = []  # slot -> tickets while ready, else 0
+        self.tree = [0] * (max(capacity, 1) + 1)  # 1-based partial sums of weights
+        self.total = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (i for i, weight in zip(self.members, self.weights) if weight)
+
+    def join(self, i):
+        """Give process i the next slot (if it has none yet) and return its slot."""
+        slot = self.slots.get(i)
+        if slot is None:
+            slot = self.slots[i] = len(self.members)
+            self.members.append(i)
+            self.weights.append(0)
+            if slot >= len(self.tree) - 1:
+                self.grow()
+        return slot
+
+    def grow(self):
+        """Double the capacity, rebuilding the partial sums in linear time."""
+        size = 2 * (len(self.tree) - 1)
+        tree = [0] * (size + 1)
+        for slot, weight in enumerate(self.weights):
+            tree[slot + 1] += weight
+        for j in range(1, size + 1):
+            parent = j + (j & -j)
+            if parent <= size:
+                tree[parent] += tree[j]
+        self.tree = tree
+
+    def update(self, slot, delta):
+        self.weights[slot] += delta
+        self.total += delta
+        tree = self.tree
+        j = slot + 1
+        while j < len(tree):
+            tree[j] += delta
+            j += j & -j
+
+    def push(self, i, tickets):
+        """Make process i ready with tickets tickets."""
+        self.update(self.join(i), tickets)
+        self.count += 1
+
+    def draw(self, value):
+        """Remove and return the ready process holding ticket number value (0 <= value < total)."""
+        tree = self.tree
+        size = len(tree) - 1
+        slot = 0
+        step = 1 << (size.bit_length() - 1)
+        while step:
+            j = slot + step
+            if j <= size and tree[j] <= value:
+                slot = j
+                value -= tree[j]
+            step >>= 1
+        self.update(slot, -self.weights[slot])
+        self.count -= 1
+        return self.members[slot]
+
+    def remove(self, i):
+        """Take the ready process i out of the draw."""
+        slot = self.slots[i]
+        self.update(slot, -self.weights[slot])
+        self.count -= 1
+
+class Simulation:
+    """Tick-driven scheduler engine shared by FCFS, SJF, Round Robin, lottery and stride.
+
+    All of the run's state lives on the instance, so a simulation can be
+    advanced in pieces, snapshotted with checkpoint() and resumed from a
+    snapshot with restore().
+    """
+    def __init__(self, processes, run_for, algorithm, quantum=None, counters=None, seed=0):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm '{algorithm}'")
+        for p in processes:
+            if p.tickets < 1:
+                raise ValueError(f"process {p.name} needs at least one ticket")
+        self.processes = [Process(p.name, p.arrival, p.burst, p.tickets) for p in processes]
+        self.run_for = run_for
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.counters = counters
+        self.seed = seed
+        # Lottery draws come from a seeded generator, so runs are reproducible
+        self.rng = random.Random(seed) if algorithm == 'lottery' else None
+
+        # Arrivals are looked up by time instead of scanning every process each tick.
+        # FCFS announces simultaneous arrivals by name, the others in input order.
+        order = range(len(self.processes))
+        if algorithm == 'fcfs':
+            order = sorted(order, key=lambda i: (self.processes[i].arrival, self.processes[i].name))
+        self.arrivals = {}
+        for i in order:
+            self.arrivals.setdefault(self.processes[i].arrival, []).append(i)
+
+        self.time = 0
+        self.current = None
+        self.quantum_remaining = 0
+        # FIFO queue of process indices; for SJF a heap of (remaining, name, seq, index),
+        # for stride a heap of (pass, seq, index) and for lottery a TicketTree
+        if algorithm in ('sjf', 'stride'):
+            self.ready_queue = []
+        elif algorithm == 'lottery':
+            self.ready_queue = TicketTree(len(self.processes))
+        else:
+            self.ready_queue = deque()
+        self.seq = 0
+        # Stride: each process's pass, and the pass of the latest selection, which arrivals start from
+        self.passes = [0] * len(self.processes) if algorithm == 'stride' else None
+        self.global_pass = 0
+        self.finished = []
+        self.output = []
+        self.checkpoints = []
+        # Run-length (name, start, end) execution intervals, name None for Idle;
+        # the interval still being extended is kept open in self.segment.
+        # Intervals are merged by name, like the Gantt chart shows them.
+        self.intervals = []
+        self.segment = None
+
+    def add_process(self, process):
+        """Add a process that arrives at or after the current time, e.g. from a live feed."""
+        if process.arrival < self.time:
+            raise ValueError(f"process {process.name} arrives at time {process.arrival}, "
+                             f"before the current time {self.time}")
+        if process.tickets < 1:
+            raise ValueError(f"process {process.name} needs at least one ticket")
+        i = len(self.processes)
+        self.processes.append(Process(process.name, process.arrival, process.burst, process.tickets))
+        if self.passes is not None:
+            self.passes.append(0)
+        arrived = self.arrivals.setdefault(process.arrival, [])
+        if self.algorithm == 'fcfs':
+            bisect.insort(arrived, i, key=lambda j: self.processes[j].name)
+        else:
+            arrived.append(i)
+
+    def take_ready(self, count):
+        """Remove up to count ready processes, the ones this queue would serve last, and return them.
+
+        FIFO queues give up their tail, the SJF and stride heaps their largest
+        entries and lottery its latest joined processes; the Process objects
+        are returned in queue order, e.g. for adopt() on another CPU.
+        """
+        queue = self.ready_queue
+        count = min(count, len(queue))
+        if self.algorithm in ('sjf', 'stride'):
+            queue.sort()  # A sorted list is still a valid heap
+            taken = [entry[-1] for entry in queue[len(queue) - count:]]
+            del queue[len(queue) - count:]
+        elif self.algorithm == 'lottery':
+            taken = list(queue)[len(queue) - count:]
+            for i in taken:
+                queue.remove(i)
+        else:
+            taken = [queue.pop() for _ in range(count)]
+            taken.reverse()
+        return [self.processes[i] for i in taken]
+
+    def adopt(self, process):
+        """Make an already arrived process ready at the current time, e.g. one taken from another CPU.
+
+        The Process object itself is kept, so its statistics stay in one
+        place wherever it runs. A stride process starts at the current pass.
+        """
+        i = len(self.processes)
+        self.processes.append(process)
+        if self.passes is not None:
+            self.passes.append(self.global_pass)
+        if self.algorithm == 'sjf':
+            heapq.heappush(self.ready_queue, (process.remaining, process.name, self.seq, i))
+            self.seq += 1
+        elif self.algorithm == 'lottery':
+            self.ready_queue.push(i, process.tickets)
+        elif self.algorithm == 'stride':
+            heapq.heappush(self.ready_queue, (self.global_pass, self.seq, i))
+            self.seq += 1
+        else:
+            self.ready_queue.append(i)
+
+    def finished_processes(self):
+        """Return the finished Process objects in completion order."""
+        return [self.processes[i] for i in self.finished]
+
+    def gantt_intervals(self):
+        """Return the (name, start, end) execution intervals so far, name None for Idle."""
+        if self.segment is None:
+            return list(self.intervals)
+        return self.intervals + [tuple(self.segment)]
+
+    def run(self, until=None, checkpoint_every=None):
+        """Advance the simulation to time `until` (default run_for).
+
+        With checkpoint_every, a checkpoint() is appended to self.checkpoints
+        at the start of every later tick that is a multiple of it.
+        """
+        end = self.run_for if until is None else min(until, self.run_for)
+        procs = self.processes
+        arrivals = self.arrivals
+        emit = self.output.append
+        finished = self.finished
+        ready_queue = self.ready_queue
+        algorithm = self.algorithm
+        sjf = algorithm == 'sjf'
+        lottery = algorithm == 'lottery'
+        stride = algorithm == 'stride'
+        sliced = algorithm in TIME_SLICED
+        quantum = self.quantum
+        rng = self.rng
+        passes = self.passes
+        global_pass = self.global_pass
+        time = self.time
+        current = self.current
+        quantum_remaining = self.quantum_remaining
+        seq = self.seq
+        intervals = self.intervals
+        seg_name, seg_start, seg_end = self.segment or (None, 0, -1)
+        start_time = time
+        start_events = len(self.output)
+        queue_ops = 0
+        preemptions = 0
+
+        while time < end:
+            if checkpoint_every and time % checkpoint_every == 0 and time > start_time:
+                self.time, self.current, self.quantum_remaining, self.seq = time, current, quantum_remaining, seq
+                self.global_pass = global_pass
+                self.segment = None if seg_end < 0 else [seg_name, seg_start, seg_end]
+                self.checkpoints.append(self.checkpoint())
+
+            # Output events in correct order: arrivals first, then finishes
+            arrived = arrivals.get(time)
+            if arrived:
+                for i in arrived:
+                    p = procs[i]
+                    emit(f"Time{time:4} : {p.name} arrived")
+                    if sjf:
+                        heapq.heappush(ready_queue, (p.remaining, p.name, seq, i))
+                        seq += 1
+                    elif lottery:
+                        ready_queue.push(i, p.tickets)
+                    elif stride:
+                        passes[i] = global_pass
+                        heapq.heappush(ready_queue, (global_pass, seq, i))
+                        seq += 1
+                    else:
+                        ready_queue.append(i)
+                    queue_ops += 1
+
+            if current is not None and procs[current].remaining == 0:
+                emit(f"Time{time:4} : {procs[current].name} finished")
+                finished.append(current)
+                current = None
+                quantum_remaining = 0
+
+            # SJF preempts when a new arrival is shorter than the running process
+            if sjf and current is not None and arrived:
+                running = procs[current]
+                for i in arrived:
+                    if procs[i].remaining < running.remaining:
+                        heapq.heappush(ready_queue, (running.remaining, running.name, seq, current))
+                        seq += 1
+                        queue_ops += 1
+                        preemptions += 1
+                        current = None
+                        break
+
+            # Time-sliced policies requeue the running process when its quantum expires
+            if sliced and current is not None and quantum_remaining == 0 and procs[current].remaining > 0:
+                if lottery:
+                    ready_queue.push(current, procs[current].tickets)
+                elif stride:
+                    passes[current] += quantum * max(1, STRIDE1 // procs[current].tickets)
+                    heapq.heappush(ready_queue, (passes[current], seq, current))
+                    seq += 1
+                else:
+                    ready_queue.append(current)
+                queue_ops += 1
+                preemptions += 1
+                current = None
+
+            # Select next process if needed
+            if current is None and ready_queue:
+                if sjf:
+                    current = heapq.heappop(ready_queue)[3]
+                elif lottery:
+                    current = ready_queue.draw(rng.randrange(ready_queue.total))
+                elif stride:
+                    current_pass, _, current = heapq.heappop(ready_queue)
+                    global_pass = max(global_pass, current_pass)
+                else:
+                    current = ready_queue.popleft()
+                queue_ops += 1
+                if sliced:
+                    quantum_remaining = quantum
+                p = procs[current]
+                # Set start time and response time if first time selected
+                if p.start_time == -1:
+                    p.start_time = time
+                    p.response_time = time - p.arrival
+                emit(f"Time{time:4} : {p.name} selected (burst{p.remaining:4})")
+
+            # Execute current process or idle, extending the open interval when possible
+            if current is not None:
+                p = procs[current]
+                if p.remaining > 0:
+                    if seg_end == time and seg_name == p.name:
+                        seg_end += 1
+                    else:
+                        if seg_end >= 0:
+                            intervals.append((seg_name, seg_start, seg_end))
+                        seg_name, seg_start, seg_end = p.name, time, time + 1
+                    p.remaining -= 1
+                    if sliced:
+                        quantum_remaining -= 1
+                    if p.remaining == 0:
+                        # Process will finish at next time tick
+                        p.finish_time = time + 1
+                        p.turnaround_time = p.finish_time - p.arrival
+                        p.wait_time = p.turnaround_time - p.burst
+            else:
+                emit(f"Time{time:4} : Idle")
+                if seg_end == time and seg_name is None:
+                    seg_end += 1
+                else:
+                    if seg_end >= 0:
+                        intervals.append((seg_name, seg_start, seg_end))
+                    seg_name, seg_start, seg_end = None, time, time + 1
+
+            time += 1
+
+        self.time, self.current, self.quantum_remaining, self.seq = time, current, quantum_remaining, seq
+        self.global_pass = global_pass
+        self.segment = None if seg_end < 0 else [seg_name, seg_start, seg_end]
+        add_counters(self.counters, time - start_time, len(self.output) - start_events, queue_ops, preemptions)
+
+    def checkpoint(self):
+        """Return a JSON-serialisable snapshot of the state at the start of self.time."""
+        snapshot = {
+            'time': self.time,
+            'current': self.current,
+            'quantum_remaining': self.quantum_remaining,
+            'ready_queue': [list(entry) for entry in self.ready_queue] if self.algorithm in ('sjf', 'stride')
+                           else list(self.ready_queue),
+            'seq': self.seq,
+            'finished': list(self.finished),
+            'output_len': len(self.output),
+            'intervals_len': len(self.intervals),
+            'segment': self.segment,
+            # Processes that have not arrived yet are still in their initial state
+            'state': [[i, p.remaining, p.start_time, p.finish_time, p.wait_time,
+                       p.response_time, p.turnaround_time]
+                      for i, p in enumerate(self.processes) if p.arrival < self.time],
+        }
+        if self.algorithm == 'stride':
+            snapshot['global_pass'] = self.global_pass
+            snapshot['passes'] = [[i, self.passes[i]] for i, p in enumerate(self.processes) if p.arrival < self.time]
+        elif self.algorithm == 'lottery':
+            version, state, gauss = self.rng.getstate()
+            snapshot['rng'] = [version, list(state), gauss]
+        return snapshot
+
+    def restore(self, snapshot, output, intervals):
+        """Continue from a snapshot, taking the events and intervals before it from output and intervals."""
+        self.time = snapshot['time']
+        self.current = snapshot['current']
+        self.quantum_remaining = snapshot['quantum_remaining']
+        self.seq = snapshot['seq']
+        self.finished = list(snapshot['finished'])
+        self.output = output[:snapshot['output_len']]
+        self.intervals = [tuple(interval) for interval in intervals[:snapshot['intervals_len']]]
+        self.segment = snapshot['segment']
+        if self.algorithm in ('sjf', 'stride'):
+            self.ready_queue = [tuple(entry) for entry in snapshot['ready_queue']]
+        elif self.algorithm == 'lottery':
+            # Slots go to the arrived processes in arrival order, as they did in the run
+            self.ready_queue = TicketTree(len(self.processes))
+            for i in sorted((i for i, p in enumerate(self.processes) if 0 <= p.arrival < self.time),
+                            key=lambda i: self.processes[i].arrival):
+                self.ready_queue.join(i)
+            for i in snapshot['ready_queue']:
+                self.ready_queue.push(i, self.processes[i].tickets)
+            version, state, gauss = snapshot['rng']
+            self.rng.setstate((version, tuple(state), gauss))
+        else:
+            self.ready_queue = deque(snapshot['ready_queue'])
+        if self.algorithm == 'stride':
+            self.global_pass = snapshot['global_pass']
+            for i, value in snapshot['passes']:
+                self.passes[i] = value
+        for i, remaining, start, finish, wait, response, turnaround in snapshot['state']:
+            p = self.processes[i]
+            p.remaining = remaining
+            p.start_time = start
+            p.finish_time = finish
+            p.wait_time = wait
+            p.response_time = response
+            p.turnaround_time = turnaround
+
+def fcfs_scheduler(processes, run_for, counters=None):
     """First-Come First-Served scheduler."""
-    output = []
-    time = 0
-    ready_queue = []
-    current_process = None
-    finished_processes = []
-    
-    # Sort processes by arrival time, then by name
-    processes_copy = sorted(processes, key=lambda p: (p.arrival, p.name))
-    
-    while time < run_for:
-        # Collect all events that happen at this time
-        arrivals = []
-        finish_event = None
-        
-        # Check for arriving processes
-        for p in processes_copy:
-            if p.arrival == time:
-                arrivals.append(p)
-        
-        # Check if current process finishes at this time
-        if current_process and current_process.remaining == 0:
-            finish_event = current_process
-        
-        # Output events in correct order: arrivals first, then finishes
-        for p in arrivals:
-            output.append(f"Time{time:4} : {p.name} arrived")
-            ready_queue.append(p)
-        
-        if finish_event:
-            output.append(f"Time{time:4} : {finish_event.name} finished")
-            finished_processes.append(finish_event)
-            current_process = None
-        
-        # Select next process if needed
-        if current_process is None and ready_queue:
-            current_process = ready_queue.pop(0)
-            current_process.start_time = time
-            current_process.response_time = time - current_process.arrival
-            output.append(f"Time{time:4} : {current_process.name} selected (burst{current_process.burst:4})")
-        
-        # Execute current process or idle
-        if current_process and current_process.remaining > 0:
-            current_process.remaining -= 1
-            if current_process.remaining == 0:
-                # Process will finish at next time tick
-                current_process.finish_time = time + 1
-                current_process.turnaround_time = current_process.finish_time - current_process.arrival
-                current_process.wait_time = current_process.turnaround_time - current_process.burst
-        elif current_process is None:
-            output.append(f"Time{time:4} : Idle")
-        
-        time += 1
-    
-    return output, finished_processes
+    sim = Simulation(processes, run_for, 'fcfs', counters=counters)
+    sim.run()
+    return sim.output, sim.finished_processes()
 
-def sjf_scheduler(processes, run_for):
+def sjf_scheduler(processes, run_for, counters=None):
     """Pre-emptive Shortest Job First scheduler."""
-    output = []
-    time = 0
-    ready_queue = []
-    current_process = None
-    finished_processes = []
-    
-    # Create copies of processes to track
-    processes_copy = [Process(p.name, p.arrival, p.burst) for p in processes]
-    
-    while time < run_for:
-        # Collect all events that happen at this time
-        arrivals = []
-        finish_event = None
-        
-        # Check for arriving processes
-        for p in processes_copy:
-            if p.arrival == time and p.finish_time == -1:  # Not yet finished
-                arrivals.append(p)
-        
-        # Check if current process finishes at this time
-        if current_process and current_process.remaining == 0:
-            finish_event = current_process
-        
-        # Output arrivals first
-        for p in arrivals:
-            output.append(f"Time{time:4} : {p.name} arrived")
-            ready_queue.append(p)
-        
-        # Output finish event
-        if finish_event:
-            output.append(f"Time{time:4} : {finish_event.name} finished")
-            finished_processes.append(finish_event)
-            current_process = None
-        
-        # Check for preemption after arrivals
-        if current_process and arrivals:
-            # Check if any new arrival has shorter remaining time
-            for p in arrivals:
-                if p.remaining < current_process.remaining:
-                    ready_queue.append(current_process)
-                    current_process = None
-                    break
-        
-        # Select shortest job if no current process
-        if current_process is None and ready_queue:
-            # Sort by remaining time, then by name for tie-breaking
-            ready_queue.sort(key=lambda p: (p.remaining, p.name))
-            current_process = ready_queue.pop(0)
-            
-            # Set start time and response time if first time selected
-            if current_process.start_time == -1:
-                current_process.start_time = time
-                current_process.response_time = time - current_process.arrival
-            
-            output.append(f"Time{time:4} : {current_process.name} selected (burst{current_process.remaining:4})")
-        
-        # Execute current process or idle
-        if current_process and current_process.remaining > 0:
-            current_process.remaining -= 1
-            if current_process.remaining == 0:
-                # Process will finish at next time tick
-                current_process.finish_time = time + 1
-                current_process.turnaround_time = current_process.finish_time - current_process.arrival
-                current_process.wait_time = current_process.turnaround_time - current_process.burst
-        elif current_process is None:
-            output.append(f"Time{time:4} : Idle")
-        
-        time += 1
-    
-    return output, finished_processes
+    sim = Simulation(processes, run_for, 'sjf', counters=counters)
+    sim.run()
+    return sim.output, sim.finished_processes()
 
-def rr_scheduler(processes, run_for, quantum):
+def rr_scheduler(processes, run_for, quantum, counters=None):
     """Round Robin scheduler."""
-    output = []
-    time = 0
-    ready_queue = []
-    current_process = None
-    quantum_remaining = 0
-    finished_processes = []
-    
-    # Create copies of processes to track
-    processes_copy = [Process(p.name, p.arrival, p.burst) for p in processes]
-    
-    while time < run_for:
-        # Collect all events that happen at this time
-        arrivals = []
-        finish_event = None
-        
-        # Check for arriving processes
-        for p in processes_copy:
-            if p.arrival == time and p.finish_time == -1:  # Not yet finished
-                arrivals.append(p)
-        
-        # Check if current process finishes at this time
-        if current_process and current_process.remaining == 0:
-            finish_event = current_process
-        
-        # Output arrivals first
-        for p in arrivals:
-            output.append(f"Time{time:4} : {p.name} arrived")
-            ready_queue.append(p)
-        
-        # Output finish event and handle completion
-        if finish_event:
-            output.append(f"Time{time:4} : {finish_event.name} finished")
-            finished_processes.append(finish_event)
-            current_process = None
-            quantum_remaining = 0
-        
-        # Check if quantum expired for current process
-        if current_process and quantum_remaining == 0 and current_process.remaining > 0:
-            ready_queue.append(current_process)
-            current_process = None
-        
-        # Select next process if no current process
-        if current_process is None and ready_queue:
-            current_process = ready_queue.pop(0)
-            quantum_remaining = quantum
-            
-            # Set start time and response time if first time selected
-            if current_process.start_time == -1:
-                current_process.start_time = time
-                current_process.response_time = time - current_process.arrival
-            
-            output.append(f"Time{time:4} : {current_process.name} selected (burst{current_process.remaining:4})")
-        
-        # Execute current process or idle
-        if current_process and current_process.remaining > 0:
-            current_process.remaining -= 1
-            quantum_remaining -= 1
-            if current_process.remaining == 0:
-                # Process will finish at next time tick
-                current_process.finish_time = time + 1
-                current_process.turnaround_time = current_process.finish_time - current_process.arrival
-                current_process.wait_time = current_process.turnaround_time - current_process.burst
-        elif current_process is None:
-            output.append(f"Time{time:4} : Idle")
-        
-        time += 1
-    
-    return output, finished_processes
+    sim = Simulation(processes, run_for, 'rr', quantum, counters=counters)
+    sim.run()
+    return sim.output, sim.finished_processes()
+
+def as_process(p):
+    """Return a fresh Process from a Process, a (name, arrival, burst[, tickets]) tuple or a dict with those keys."""
+    if isinstance(p, Process):
+        return Process(p.name, p.arrival, p.burst, p.tickets)
+    if isinstance(p, dict):
+        return Process(p['name'], p['arrival'], p['burst'], p.get('tickets', 1))
+    return Process(*p)
+
+def simulate(processes, policy, run_for, quantum=None, counters=None, seed=0):
+    """Run a workload in memory and return a SimulationResult.
+
+    processes may be Process objects, (name, arrival, burst[, tickets])
+    tuples or dicts. seed seeds the lottery draws. Nothing is read from or
+    written to disk; see the SimulationResult write_* methods for the file
+    writers. Raises ValueError for an unknown policy or a time-sliced
+    policy without a quantum.
+    """
+    processes = [as_process(p) for p in processes]
+    if policy in TIME_SLICED and quantum is None:
+        raise ValueError(f"Missing quantum parameter when use is '{policy}'")
+    sim = Simulation(processes, run_for, policy, quantum, counters, seed)
+    sim.run()
+    return SimulationResult(processes, run_for, policy, quantum, sim.output, sim.finished_processes(),
+                            sim.gantt_intervals())
+
+class SimulationResult:
+    """The outcome of one simulation, held in memory.
+
+    output holds the 'Time N : ...' event lines, finished the finished
+    Process objects in completion order and processes the whole workload.
+    intervals may be None (e.g. for a cached result); it is then rebuilt
+    from the output when needed.
+    """
+    def __init__(self, processes, run_for, algorithm, quantum, output, finished, intervals=None,
+                 process_count=None):
+        self.processes = processes
+        self.run_for = run_for
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.output = output
+        self.finished = finished
+        self.intervals = intervals
+        self.process_count = len(processes) if process_count is None else process_count
+
+    def events(self):
+        """Return the events as dicts with time, type, process and description."""
+        return parse_timeline_events(self.output)
+
+    def gantt_intervals(self):
+        """Return the (name, start, end) execution intervals, name None for Idle."""
+        if self.intervals is None:
+            self.intervals = intervals_from_output(self.output, self.run_for)
+        return self.intervals
+
+    def metrics(self):
+        """Return per-process statistics in input order plus the averages over finished processes."""
+        by_name = {}
+        for p in self.finished:
+            by_name.setdefault(p.name, p)
+        metrics = calculate_statistics(self.output, self.finished, self.run_for, self.processes)
+        metrics['processes'] = []
+        for p in self.processes:
+            done = by_name.get(p.name)
+            metrics['processes'].append({
+                'name': p.name,
+                'arrival': p.arrival,
+                'burst': p.burst,
+                'finished': done is not None,
+                'wait': done.wait_time if done else None,
+                'turnaround': done.turnaround_time if done else None,
+                'response': done.response_time if done else None,
+            })
+        return metrics
+
+    def lines(self, compact=False):
+        """Yield the lines of the .out file, without newlines."""
+        return output_lines(self.process_count, self.algorithm, self.quantum, self.output, self.finished,
+                            self.run_for, self.processes, compact)
+
+    def write_output(self, filename, compact=False):
+        """Write the .out file, in the compact format if asked."""
+        write_output(filename, self.process_count, self.algorithm, self.quantum, self.output, self.finished,
+                     self.run_for, self.processes, compact)
+
+    def write_html(self, filename, window=None, data_filename=None):
+        """Write the HTML report next to filename (an .out name) and return its file name."""
+        return generate_html_report(filename, self.process_count, self.algorithm, self.quantum, self.output,
+                                    self.finished, self.run_for, self.processes, window, data_filename,
+                                    self.intervals)
+
+    def save_report_data(self, filename):
+        """Save the data for rendering the HTML report later with --report-from."""
+        save_report_data(filename, self.process_count, self.algorithm, self.quantum, self.run_for,
+                         self.processes, self.output, self.finished)
+
+    def query_index(self):
+        """Return the point-in-time query index for this run (see build_query_index)."""
+        return build_query_index(self.output, self.gantt_intervals(), self.algorithm, self.run_for, self.processes)
+
+    def export(self, base_filename, formats):
+        """Write the events and metrics in each of formats; return the files written."""
+        written = []
+        if 'ndjson' in formats:
+            written.append(base_filename + '.events.ndjson')
+            write_events_ndjson(written[-1], self.output)
+        if 'csv' in formats:
+            written.append(base_filename + '.metrics.csv')
+            write_metrics_csv(written[-1], self.metrics())
+        if 'parquet' in formats:
+            if pyarrow is None:
+                raise RuntimeError("Parquet export needs pyarrow")
+            written += [base_filename + '.events.parquet', base_filename + '.metrics.parquet']
+            write_parquet(written[-2], written[-1], self.output, self.metrics())
+        return written
+
+def output_lines(process_count, algorithm, quantum, output, finished_processes, run_for, all_processes,
+                 compact=False):
+    """Yield the lines of the .out file, without newlines; compact folds runs as in compact_events()."""
+    yield from output_header(process_count, algorithm, quantum)
+
+    # Timeline events
+    if compact:
+        yield from compact_events(output, quantum if algorithm in TIME_SLICED else None)
+    else:
+        yield from output
 
-def write_output(filename, process_count, algorithm, quantum, output, finished_processes, run_for, all_processes):
-    """Write the output to file."""
-    with open(filename, 'w') as f:
-        # Header
-        f.write(f"{process_count:3} processes\n")
+    yield from output_footer(finished_processes, run_for, all_processes)
 
-        # Algorithm name
-        if algorithm == 'fcfs':
-            f.write("Using First-Come First-Served\n")
-        elif algorithm == 'sjf':
-            f.write("Using preemptive Shortest Job First\n")
-        elif algorithm == 'rr':
-            f.write("Using Round-Robin\n")
-            f.write(f"Quantum {quantum:3}\n")
-            f.write("\n")  # Add blank line after Quantum for RR
-
-        # Timeline events
-        for line in output:
-            f.write(line + "\n")
+def output_header(process_count, algorithm, quantum):
+    """Yield the .out lines before the timeline."""
+    # Header
+    yield f"{process_count:3} processes"
 
-        # Finish time
-        f.write(f"Finished at time{run_for:4}\n\n")
+    # Algorithm name
+    if algorithm == 'fcfs':
+        yield "Using First-Come First-Served"
+    elif algorithm == 'sjf':
+        yield "Using preemptive Shortest Job First"
+    elif algorithm == 'rr':
+        yield "Using Round-Robin"
+    elif algorithm == 'lottery':
+        yield "Using Lottery"
+    elif algorithm == 'stride':
+        yield "Using Stride"
+    if algorithm in TIME_SLICED:
+        yield f"Quantum {quantum:3}"
+        yield ""  # Add blank line after Quantum for RR
+
+def output_footer(finished_processes, run_for, all_processes):
+    """Yield the .out lines after the timeline."""
+    # Finish time
+    yield f"Finished at time{run_for:4}"
+    yield ""
+
+    # Process statistics
+    # Sort by name for consistent output
+    finished_processes = sorted(finished_processes, key=lambda p: p.name)
+    for p in finished_processes:
+        yield f"{p.name} wait{p.wait_time:4} turnaround{p.turnaround_time:4} response{p.response_time:4}"
+
+    # Check for unfinished processes
+    finished_names = {p.name for p in finished_processes}
+    for p in all_processes:
+        if p.name not in finished_names:
+            yield f"{p.name} did not finish"
+
+def compact_events(output, quantum=None):
+    """Yield the event lines with repetitive runs folded into one '<first line> xN' record.
+
+    Folded are N consecutive Idle ticks and, with a quantum, N Round Robin
+    re-selections of the same process one quantum apart with nothing in
+    between. expand_events() restores the original lines exactly.
+    """
+    first = None  # First line of the run being folded
+    count = 0
+    expected = None  # The line that would continue the run
+    step = None  # For a selection run, (name, time, burst) of the expected line
+    next_time = 0  # For an Idle run, the time of the expected line
 
-        # Process statistics
-        # Sort by name for consistent output
-        finished_processes.sort(key=lambda p: p.name)
-        for p in finished_processes:
-            f.write(f"{p.name} wait{p.wait_time:4} turnaround{p.turnaround_time:4} response{p.response_time:4}\n")
+    for line in output:
+        if first is not None:
+            if line == expected:
+                count += 1
+                if step is None:
+                    next_time += 1
+                    expected = f"Time{next_time:4} : Idle"
+                else:
+                    step = (step[0], step[1] + quantum, step[2] - quantum)
+                    expected = f"Time{step[1]:4} : {step[0]} selected (burst{step[2]:4})"
+                continue
+            yield first if count == 1 else f"{first} x{count}"
+            first = None
+
+        event = line[line.index(' : ') + 3:]
+        if event == 'Idle':
+            first, count, step = line, 1, None
+            next_time = event_time(line) + 1
+            expected = f"Time{next_time:4} : Idle"
+        elif quantum and event.endswith(')') and ' selected (burst' in event:
+            cut = event.rindex(' selected (burst')
+            step = (event[:cut], event_time(line) + quantum, int(event[cut + 16:-1]) - quantum)
+            first, count = line, 1
+            expected = f"Time{step[1]:4} : {step[0]} selected (burst{step[2]:4})"
+        else:
+            yield line
+    if first is not None:
+        yield first if count == 1 else f"{first} x{count}"
 
-        # Check for unfinished processes
-        finished_names = {p.name for p in finished_processes}
-        for p in all_processes:
-            if p.name not in finished_names:
-                f.write(f"{p.name} did not finish\n")
+def expand_events(lines, quantum=None):
+    """Yield lines with every 'xN' record from compact_events() expanded back to N event lines."""
+    for line in lines:
+        first, sep, count = line.rpartition(' x')
+        if not (sep and count.isdigit() and line.startswith('Time')):
+            yield line
+            continue
+        time = event_time(first)
+        event = first[first.index(' : ') + 3:]
+        if event == 'Idle':
+            for k in range(int(count)):
+                yield f"Time{time + k:4} : Idle"
+        else:
+            cut = event.rindex(' selected (burst')
+            name = event[:cut]
+            burst = int(event[cut + 16:-1])
+            for k in range(int(count)):
+                yield f"Time{time + k * quantum:4} : {name} selected (burst{burst - k * quantum:4})"
+
+def expand_output(lines):
+    """Yield the lines of a compact .out file in the canonical format, taking the quantum from its header."""
+    quantum = None
+    header = True
+    for line in lines:
+        line = line.rstrip('\n')
+        if header:
+            if line.startswith('Quantum'):
+                quantum = int(line[7:])
+            elif line.startswith('Time'):
+                header = False
+            if header:
+                yield line
+                continue
+        yield from expand_events((line,), quantum)
+
+def write_output(filename, process_count, algorithm, quantum, output, finished_processes, run_for, all_processes,
+                 compact=False):
+    """Write the output to file."""
+    with open(filename, 'w') as f:
+        for line in output_lines(process_count, algorithm, quantum, output, finished_processes, run_for,
+                                 all_processes, compact):
+            f.write(line + "\n")
 
 def calculate_statistics(output, finished_processes, run_for, all_processes):
     """Calculate scheduling statistics for HTML report."""
@@ -369,7 +941,10 @@ def calculate_statistics(output, finished_processes, run_for, all_processes):
 
 def parse_timeline_events(output):
     """Parse timeline output to extract events for HTML visualization."""
-    events = []
+    return list(iter_timeline_events(output))
+
+def iter_timeline_events(output):
+    """Yield parse_timeline_events() records one at a time."""
     for line in output:
         if line.startswith('Time'):
             parts = line.split(':', 1)
@@ -393,106 +968,148 @@ def parse_timeline_events(output):
                 event_type = 'other'
                 process_name = ''
 
-            events.append({
+            yield {
                 'time': time,
                 'type': event_type,
                 'process': process_name,
                 'description': event
-            })
-
-    return events
+            }
+
+def intervals_from_output(output, run_for):
+    """Rebuild the run-length (name, start, end) execution intervals from timeline output.
+
+    A selected process runs until the next selection or Idle line, but never
+    longer than the burst it was selected with. Idle intervals have name None.
+    This is a single pass and gives the same intervals as Simulation.gantt_intervals().
+    """
+    intervals = []
+    running = None
+
+    def close(name, start, end):
+        if end <= start:
+            return
+        if intervals and intervals[-1][0] == name and intervals[-1][2] == start:
+            intervals[-1] = (name, intervals[-1][1], end)
+        else:
+            intervals.append((name, start, end))
 
-def create_gantt_data(output, run_for):
-    """Create Gantt chart data structure from timeline output."""
+    for line in output:
+        time = event_time(line)
+        event = line[line.index(' : ') + 3:]
+        if event == 'Idle':
+            if running:
+                close(running[0], running[1], min(running[2], time))
+                running = None
+            close(None, time, time + 1)
+        elif event.endswith(')') and ' selected (burst' in event:
+            if running:
+                close(running[0], running[1], min(running[2], time))
+            cut = event.rindex(' selected (burst')
+            burst = int(event[cut + 16:-1])
+            running = (event[:cut], time, min(time + burst, run_for))
+    if running:
+        close(*running)
+    return intervals
+
+def create_gantt_data(output, run_for, intervals=None):
+    """Create Gantt chart data structure from timeline output.
+
+    Returns {name: [period, ...]} with Idle periods under 'IDLE'. Pass the
+    intervals collected by the simulation to skip re-deriving them.
+    """
+    if intervals is None:
+        intervals = intervals_from_output(output, run_for)
     gantt_data = {}
-    current_process = None
-    current_start = None
-    execution_periods = []
-
-    for i in range(run_for):
-        # Find what happened at this time
-        executing_process = None
-        for line in output:
-            if line.startswith(f'Time{i:4}'):
-                if 'selected' in line:
-                    executing_process = line.split()[2]
-                elif 'Idle' in line:
-                    executing_process = 'IDLE'
-                break
-
-        # If no explicit event, continue with current process
-        if executing_process is None:
-            executing_process = current_process
-
-        # Handle process changes
-        if executing_process != current_process:
-            # End previous period
-            if current_process is not None and current_start is not None:
-                execution_periods.append({
-                    'process': current_process,
-                    'start': current_start,
-                    'end': i,
-                    'duration': i - current_start
-                })
-
-            # Start new period
-            current_process = executing_process
-            current_start = i
-
-    # End final period
-    if current_process is not None and current_start is not None:
-        execution_periods.append({
-            'process': current_process,
-            'start': current_start,
-            'end': run_for,
-            'duration': run_for - current_start
+    for name, start, end in intervals:
+        process = 'IDLE' if name is None else name
+        gantt_data.setdefault(process, []).append({
+            'process': process,
+            'start': start,
+            'end': end,
+            'duration': end - start
         })
-
-    # Group by process for Gantt chart
-    for period in execution_periods:
-        process = period['process']
-        if process not in gantt_data:
-            gantt_data[process] = []
-        gantt_data[process].append(period)
-
     return gantt_data
 
-def generate_html_report(filename, process_count, algorithm, quantum, output, finished_processes, run_for, all_processes):
-    """Generate an HTML report with interactive visualizations."""
+def event_time(line):
+    """Return the time stamp of a 'Time N : ...' output line."""
+    return int(line[4:line.index(' :')])
+
+def window_output(output, window):
+    """Return the output lines with start <= time < end for a (start, end) window."""
+    start, end = window
+    lo = 0 if start is None else bisect.bisect_left(output, start, key=event_time)
+    hi = len(output) if end is None else bisect.bisect_left(output, end, key=event_time)
+    return output[lo:hi]
+
+# Algorithm names for display
+ALGORITHM_NAMES = {
+    'fcfs': 'First-Come First-Served (FCFS)',
+    'sjf': 'Shortest Job First (SJF) - Preemptive',
+    'rr': 'Round Robin (RR)',
+    'lottery': 'Lottery Scheduling',
+    'stride': 'Stride Scheduling',
+}
+
+def generate_html_report(filename, process_count, algorithm, quantum, output, finished_processes, run_for, all_processes,
+                         window=None, data_filename=None, intervals=None):
+    """Generate an HTML report with interactive visualizations.
+
+    With a (start, end) window only the events in that time range are
+    included; data_filename names the file holding the full run. intervals
+    are the simulation's Gantt intervals, rebuilt from output if not given.
+    """
     # Calculate statistics
     stats = calculate_statistics(output, finished_processes, run_for, all_processes)
-    events = parse_timeline_events(output)
+    timeline = output if window is None else window_output(output, window)
+    if intervals is None:
+        intervals = intervals_from_output(output, run_for)
+    span = (0, run_for)
+    if window is not None:
+        span = (window[0] or 0, run_for if window[1] is None else min(window[1], run_for))
 
-    # Algorithm name for display
-    algorithm_names = {
-        'fcfs': 'First-Come First-Served (FCFS)',
-        'sjf': 'Shortest Job First (SJF) - Preemptive',
-        'rr': 'Round Robin (RR)'
-    }
-    algorithm_display = algorithm_names.get(algorithm, algorithm.upper())
+    algorithm_display = ALGORITHM_NAMES.get(algorithm, algorithm.upper())
 
-    html_template = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Process Scheduler Report - {algorithm_display}</title>
-    <style>
-        * {{
+    # The page is streamed to the file chunk by chunk rather than built as one string
+    html_filename = filename.replace('.out', '.html')
+    with open(html_filename, 'w') as f:
+        html = ChunkedWriter(f)
+        write_html_report(html, process_count, algorithm, algorithm_display, quantum, stats, output, timeline,
+                          finished_processes, run_for, all_processes, window, data_filename, intervals, span)
+        html.flush()
+
+    return html_filename
+
+class ChunkedWriter:
+    """Collect text chunks and hand them to a file in large batches."""
+    def __init__(self, f, batch_size=4096):
+        self.f = f
+        self.batch_size = batch_size
+        self.chunks = []
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+        if len(self.chunks) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.f.writelines(self.chunks)
+        self.chunks.clear()
+
+REPORT_STYLE = """    <style>
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: rgba(255, 255, 255, 0.95);
@@ -500,38 +1117,38 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
             box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
             overflow: hidden;
             backdrop-filter: blur(10px);
-        }}
+        }
 
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
 
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.3);
-        }}
+        }
 
-        .header p {{
+        .header p {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
+        }
 
-        .content {{
+        .content {
             padding: 30px;
-        }}
+        }
 
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
+        }
 
-        .stat-card {{
+        .stat-card {
             background: linear-gradient(145deg, #ffffff, #f0f0f0);
             border-radius: 15px;
             padding: 25px;
@@ -539,41 +1156,41 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
             box-shadow: 0 8px 16px rgba(0, 0, 0, 0.1);
             transition: transform 0.3s ease, box-shadow 0.3s ease;
             border: 1px solid rgba(0, 0, 0, 0.05);
-        }}
+        }
 
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 12px 24px rgba(0, 0, 0, 0.15);
-        }}
+        }
 
-        .stat-icon {{
+        .stat-icon {
             font-size: 2em;
             margin-bottom: 10px;
-        }}
+        }
 
-        .stat-value {{
+        .stat-value {
             font-size: 2.2em;
             font-weight: bold;
             color: #667eea;
             margin-bottom: 5px;
-        }}
+        }
 
-        .stat-label {{
+        .stat-label {
             color: #666;
             font-size: 1em;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
+        }
 
-        .section {{
+        .section {
             margin-bottom: 40px;
             background: white;
             border-radius: 15px;
             padding: 30px;
             box-shadow: 0 5px 15px rgba(0, 0, 0, 0.08);
-        }}
+        }
 
-        .section-title {{
+        .section-title {
             font-size: 1.8em;
             margin-bottom: 20px;
             color: #333;
@@ -582,10 +1199,10 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
+        }
 
 
-        .process-table {{
+        .process-table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 20px;
@@ -593,94 +1210,152 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
             border-radius: 10px;
             overflow: hidden;
             box-shadow: 0 5px 15px rgba(0, 0, 0, 0.08);
-        }}
+        }
 
-        .process-table th {{
+        .process-table th {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 15px;
             text-align: left;
             font-weight: 600;
-        }}
+        }
 
-        .process-table td {{
+        .process-table td {
             padding: 12px 15px;
             border-bottom: 1px solid #eee;
             transition: background-color 0.2s ease;
-        }}
+        }
 
-        .process-table tr:hover td {{
+        .process-table tr:hover td {
             background-color: #f8f9ff;
-        }}
+        }
 
-        .process-table tr:nth-child(even) {{
+        .process-table tr:nth-child(even) {
             background-color: #f9f9f9;
-        }}
+        }
 
-        .timeline {{
-            max-height: 400px;
+        .timeline {
+            height: 400px;
             overflow-y: auto;
+            position: relative;
             border: 1px solid #ddd;
             border-radius: 10px;
             background: #fafafa;
-        }}
+        }
 
-        .timeline-event {{
-            padding: 12px 20px;
+        .timeline-rows {
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+        }
+
+        .timeline-filter {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            margin-bottom: 15px;
+            color: #666;
+        }
+
+        .timeline-filter input {
+            width: 110px;
+            padding: 6px 8px;
+            border: 1px solid #ddd;
+            border-radius: 6px;
+        }
+
+        .timeline-event {
+            height: 46px;
+            padding: 0 20px;
             border-bottom: 1px solid #eee;
             display: flex;
             align-items: center;
             gap: 15px;
+            white-space: nowrap;
+            overflow: hidden;
             transition: background-color 0.2s ease;
-        }}
+        }
 
-        .timeline-event:hover {{
+        .timeline-event:hover {
             background-color: #f0f0f0;
-        }}
+        }
 
-        .timeline-time {{
+        .timeline-time {
             font-weight: bold;
             color: #667eea;
             min-width: 80px;
-        }}
+        }
 
-        .timeline-badge {{
+        .timeline-badge {
             padding: 4px 8px;
             border-radius: 12px;
             font-size: 0.8em;
             font-weight: bold;
             min-width: 80px;
             text-align: center;
-        }}
+        }
 
-        .badge-arrival {{ background: #d4edda; color: #155724; }}
-        .badge-selection {{ background: #cce7ff; color: #004085; }}
-        .badge-completion {{ background: #fff3cd; color: #856404; }}
-        .badge-idle {{ background: #f8f9fa; color: #6c757d; }}
+        .badge-arrival { background: #d4edda; color: #155724; }
+        .badge-selection { background: #cce7ff; color: #004085; }
+        .badge-completion { background: #fff3cd; color: #856404; }
+        .badge-idle { background: #f8f9fa; color: #6c757d; }
+        .badge-other { background: #eee; color: #333; }
 
-        .footer {{
+        .gantt-canvas {
+            display: block;
+            width: 100%;
+            cursor: grab;
+        }
+
+        .gantt-help, .gantt-status {
+            color: #666;
+            margin-bottom: 10px;
+            min-height: 1.2em;
+        }
+
+        .timeline-note {
+            margin-bottom: 15px;
+            color: #666;
+        }
+
+        .footer {
             text-align: center;
             padding: 20px;
             color: #666;
             border-top: 1px solid #eee;
             margin-top: 40px;
-        }}
+        }
 
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(20px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
 
-        .section {{
+        .section {
             animation: fadeIn 0.6s ease forwards;
-        }}
+        }
     </style>
-</head>
+"""
+
+def write_html_report(html, process_count, algorithm, algorithm_display, quantum, stats, output, timeline,
+                      finished_processes, run_for, all_processes, window, data_filename, intervals, span):
+    """Write the report page to html, a ChunkedWriter."""
+    html.write(f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Process Scheduler Report - {algorithm_display}</title>
+""")
+    html.write(REPORT_STYLE)
+    html.write(f"""</head>
 <body>
     <div class="container">
         <div class="header">
             <h1>📊 Process Scheduler Report</h1>
-            <p>{algorithm_display}{' - Quantum: ' + str(quantum) if algorithm == 'rr' else ''}</p>
+            <p>{algorithm_display}{' - Quantum: ' + str(quantum) if algorithm in TIME_SLICED else ''}</p>
             <p>{process_count} processes • Runtime: {run_for} time units</p>
         </div>
 
@@ -717,15 +1392,17 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
                             <th>Status</th>
                         </tr>
                     </thead>
-                    <tbody>"""
+                    <tbody>""")
 
-    # Add process rows
-    finished_names = {p.name for p in finished_processes}
+    # Add process rows; the first finished process with a name wins, as in write_output
+    finished_by_name = {}
+    for fp in finished_processes:
+        finished_by_name.setdefault(fp.name, fp)
     all_processes_sorted = sorted(all_processes, key=lambda p: p.name)
 
     for p in all_processes_sorted:
-        if p.name in finished_names:
-            finished_p = next(fp for fp in finished_processes if fp.name == p.name)
+        finished_p = finished_by_name.get(p.name)
+        if finished_p is not None:
             status = "✅ Completed"
             wait_time = finished_p.wait_time
             turnaround_time = finished_p.turnaround_time
@@ -736,7 +1413,7 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
             turnaround_time = "-"
             response_time = "-"
 
-        html_template += f"""
+        html.write(f"""
                         <tr>
                             <td><strong>{p.name}</strong></td>
                             <td>{p.arrival}</td>
@@ -745,35 +1422,43 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
                             <td>{turnaround_time}</td>
                             <td>{response_time}</td>
                             <td>{status}</td>
-                        </tr>"""
+                        </tr>""")
 
-    html_template += f"""
+    html.write(f"""
                     </tbody>
                 </table>
             </div>
 
             <div class="section">
-                <h2 class="section-title">🕒 Timeline Events</h2>
-                <div class="timeline">"""
-
-    # Add timeline events
-    for event in events:
-        badge_class = f"badge-{event['type']}"
-        badge_text = {
-            'arrival': 'ARRIVAL',
-            'selection': 'SELECTED',
-            'completion': 'FINISHED',
-            'idle': 'IDLE'
-        }.get(event['type'], 'EVENT')
-
-        html_template += f"""
-                    <div class="timeline-event">
-                        <div class="timeline-time">T{event['time']}</div>
-                        <div class="timeline-badge {badge_class}">{badge_text}</div>
-                        <div>{event['description']}</div>
-                    </div>"""
-
-    html_template += f"""
+                <h2 class="section-title">📈 Gantt Chart</h2>
+                <p class="gantt-help">Scroll to zoom, drag to pan, double-click to reset.</p>
+                <canvas class="gantt-canvas" data-source="gantt-data"></canvas>
+                <p class="gantt-status"></p>
+                <script type="application/json" id="gantt-data">""")
+    write_gantt_columns(html, intervals, span)
+    html.write("""</script>
+            </div>
+
+            <div class="section">
+                <h2 class="section-title">🕒 Timeline Events</h2>""")
+
+    if window is not None:
+        start, end = window
+        html.write(f"""
+                <p class="timeline-note">Showing {len(timeline)} of {len(output)} events
+                    from T{0 if start is None else start} to T{run_for if end is None else end}.
+                    {f'Full run data: {data_filename}' if data_filename else ''}</p>""")
+
+    # Events are embedded as columns and only the visible rows are drawn by the script
+    html.write("""
+                <div class="timeline-filter">
+                    <label>From T <input type="number" id="timeline-from" min="0"></label>
+                    <label>to T <input type="number" id="timeline-to" min="0"></label>
+                    <span id="timeline-count"></span>
+                </div>
+                <div class="timeline" id="timeline">
+                    <div id="timeline-spacer"></div>
+                    <div class="timeline-rows" id="timeline-rows"></div>
                 </div>
             </div>
         </div>
@@ -783,23 +1468,1224 @@ def generate_html_report(filename, process_count, algorithm, quantum, output, fi
         </div>
     </div>
 
+    <script type="application/json" id="timeline-data">""")
+    write_timeline_columns(html, timeline)
+    html.write("""</script>
+    <script>""")
+    html.write(TIMELINE_SCRIPT)
+    html.write(GANTT_SCRIPT)
+    html.write("""</script>
+
 </body>
-</html>"""
+</html>""")
+
+COMPARE_SUFFIX = '.compare.html'
+COMPARE_METRICS = [('avg_wait_time', 'Avg Wait'), ('avg_turnaround_time', 'Avg Turnaround'),
+                   ('avg_response_time', 'Avg Response')]
+
+def generate_comparison_report(filename, results):
+    """Write one HTML page comparing several runs of the same workload.
+
+    results is a list of (label, SimulationResult). The page has a metrics
+    table with a row per policy, the per-process statistics side by side
+    and a Gantt chart per policy, stacked on the same time span.
+    """
+    first = results[0][1]
+    rows = []
+    for label, result in results:
+        stats = calculate_statistics(result.output, result.finished, result.run_for, result.processes)
+        dispatches = sum(1 for line in result.output if line.endswith(')') and ' selected (burst' in line)
+        rows.append((label, result, stats, dispatches))
+    # The lowest value of each metric is highlighted
+    best = {key: min((stats[key] for _, result, stats, _ in rows if result.finished), default=None)
+            for key, _ in COMPARE_METRICS}
 
-    # Write HTML file
-    html_filename = filename.replace('.out', '.html')
-    with open(html_filename, 'w') as f:
-        f.write(html_template)
+    with open(filename, 'w') as f:
+        html = ChunkedWriter(f)
+        html.write("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Process Scheduler Comparison</title>
+""")
+        html.write(REPORT_STYLE)
+        html.write(f"""</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📊 Process Scheduler Comparison</h1>
+            <p>{' • '.join(label for label, _, _, _ in rows)}</p>
+            <p>{first.process_count} processes • Runtime: {first.run_for} time units</p>
+        </div>
 
-    return html_filename
+        <div class="content">
+            <div class="section">
+                <h2 class="section-title">🏁 Metrics</h2>
+                <table class="process-table">
+                    <thead>
+                        <tr>
+                            <th>Policy</th>""")
+        for _, heading in COMPARE_METRICS:
+            html.write(f"""
+                            <th>{heading}</th>""")
+        html.write("""
+                            <th>Completed</th>
+                            <th>Dispatches</th>
+                        </tr>
+                    </thead>
+                    <tbody>""")
+        for label, result, stats, dispatches in rows:
+            cells = []
+            for key, _ in COMPARE_METRICS:
+                value = stats[key]
+                cells.append(f"<strong>{value}</strong>" if result.finished and value == best[key] else str(value))
+            html.write(f"""
+                        <tr>
+                            <td><strong>{label}</strong></td>
+                            <td>{'</td><td>'.join(cells)}</td>
+                            <td>{len(result.finished)} / {len(result.processes)}</td>
+                            <td>{dispatches}</td>
+                        </tr>""")
 
-def main():
-    # Check command line arguments
-    if len(sys.argv) != 2:
-        print("Usage: scheduler-gpt.py <input file>")
+        html.write(f"""
+                    </tbody>
+                </table>
+            </div>
+
+            <div class="section">
+                <h2 class="section-title">📋 Process Statistics</h2>
+                <table class="process-table">
+                    <thead>
+                        <tr>
+                            <th rowspan="2">Process</th>
+                            <th rowspan="2">Arrival Time</th>
+                            <th rowspan="2">Burst Time</th>""")
+        for label, _, _, _ in rows:
+            html.write(f"""
+                            <th colspan="3">{label}</th>""")
+        html.write("""
+                        </tr>
+                        <tr>""")
+        for _ in rows:
+            html.write("""
+                            <th>Wait</th>
+                            <th>Turnaround</th>
+                            <th>Response</th>""")
+        html.write("""
+                        </tr>
+                    </thead>
+                    <tbody>""")
+
+        # As in the single report, the first finished process with a name wins
+        finished_by_name = []
+        for _, result, _, _ in rows:
+            by_name = {}
+            for fp in result.finished:
+                by_name.setdefault(fp.name, fp)
+            finished_by_name.append(by_name)
+        for p in sorted(first.processes, key=lambda p: p.name):
+            cells = []
+            for by_name in finished_by_name:
+                done = by_name.get(p.name)
+                if done is None:
+                    cells += ['-', '-', '-']
+                else:
+                    cells += [done.wait_time, done.turnaround_time, done.response_time]
+            html.write(f"""
+                        <tr>
+                            <td><strong>{p.name}</strong></td>
+                            <td>{p.arrival}</td>
+                            <td>{p.burst}</td>
+                            <td>{'</td><td>'.join(map(str, cells))}</td>
+                        </tr>""")
+
+        html.write("""
+                    </tbody>
+                </table>
+            </div>
+
+            <div class="section">
+                <h2 class="section-title">📈 Gantt Charts</h2>
+                <p class="gantt-help">Scroll to zoom, drag to pan, double-click to reset.</p>""")
+        for number, (label, result, _, _) in enumerate(rows):
+            html.write(f"""
+                <h3>{label}</h3>
+                <canvas class="gantt-canvas" data-source="gantt-data-{number}"></canvas>
+                <p class="gantt-status"></p>
+                <script type="application/json" id="gantt-data-{number}">""")
+            write_gantt_columns(html, result.gantt_intervals(), (0, result.run_for))
+            html.write("</script>")
+        html.write("""
+            </div>
+        </div>
+
+        <div class="footer">
+            <p>Generated by Process Scheduler Simulator</p>
+        </div>
+    </div>
+
+    <script>""")
+        html.write(GANTT_SCRIPT)
+        html.write("""</script>
+
+</body>
+</html>""")
+        html.flush()
+
+EVENT_KINDS = ['arrival', 'selection', 'completion', 'idle', 'other']
+
+def script_json(value):
+    """Serialise value for embedding in a <script> element."""
+    # Escape '<' so no string can close the surrounding <script> element
+    return json.dumps(value, separators=(',', ':')).replace('<', '\\u003c')
+
+def write_timeline_columns(html, timeline):
+    """Write the timeline events as a compact columnar JSON object.
+
+    t holds the times, k an index into EVENT_KINDS, p an index into names
+    (-1 for Idle) and b the burst shown by selections; events of other kinds
+    keep their text in other, keyed by row.
+    """
+    kind_codes = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+    names = {}
+    times = []
+    kinds = []
+    procs = []
+    bursts = []
+    other = {}
+    for row, event in enumerate(iter_timeline_events(timeline)):
+        kind = kind_codes[event['type']]
+        times.append(event['time'])
+        kinds.append(kind)
+        if kind == 3:
+            procs.append(-1)
+        else:
+            procs.append(names.setdefault(event['process'], len(names)))
+        description = event['description']
+        if kind == 1:
+            bursts.append(int(description[description.rindex('burst') + 5:-1]))
+        else:
+            bursts.append(0)
+            if kind == 4:
+                other[row] = description
+
+    html.write(f'{{"names":{script_json(list(names))},"other":{script_json(other)}')
+    for key, column in (('t', times), ('k', kinds), ('p', procs), ('b', bursts)):
+        html.write(f',"{key}":[')
+        html.write(','.join(map(str, column)))
+        html.write(']')
+    html.write('}')
+
+MAX_GANTT_INTERVALS = 200000
+
+def merge_intervals(starts, ends, resolution):
+    """Merge one lane's sorted intervals that are less than resolution ticks apart."""
+    merged_starts = []
+    merged_ends = []
+    for start, end in zip(starts, ends):
+        if merged_ends and start - merged_ends[-1] < resolution:
+            merged_ends[-1] = max(merged_ends[-1], end)
+        else:
+            merged_starts.append(start)
+            merged_ends.append(end)
+    return merged_starts, merged_ends
+
+def write_gantt_columns(html, intervals, span):
+    """Write the Gantt intervals inside span as per-lane columnar JSON.
+
+    Lanes are processes by name, then Idle. Lane i's intervals are
+    s[o[i]:o[i+1]] and e[o[i]:o[i+1]]. Runs with more than
+    MAX_GANTT_INTERVALS intervals have nearby intervals merged first.
+    """
+    span_start, span_end = span
+    lanes = {}
+    total = 0
+    for name, start, end in intervals:
+        if end <= span_start or start >= span_end:
+            continue
+        starts, ends = lanes.setdefault(name, ([], []))
+        starts.append(max(start, span_start))
+        ends.append(min(end, span_end))
+        total += 1
+
+    names = sorted(name for name in lanes if name is not None)
+    order = names + ([None] if None in lanes else [])
+    if total > MAX_GANTT_INTERVALS:
+        resolution = max(1, (span_end - span_start) * 4 // MAX_GANTT_INTERVALS)
+        for name in order:
+            lanes[name] = merge_intervals(*lanes[name], resolution)
+
+    offsets = [0]
+    for name in order:
+        offsets.append(offsets[-1] + len(lanes[name][0]))
+    labels = names + (['Idle'] if None in lanes else [])
+    html.write(f'{{"lanes":{script_json(labels)},"idle":{len(names) if None in lanes else -1},'
+               f'"start":{span_start},"end":{span_end},"o":[{",".join(map(str, offsets))}]')
+    for key, column in (('s', 0), ('e', 1)):
+        html.write(f',"{key}":[')
+        html.write(','.join(','.join(map(str, lanes[name][column])) for name in order if lanes[name][column]))
+        html.write(']')
+    html.write('}')
+
+GANTT_SCRIPT = """
+document.querySelectorAll('canvas.gantt-canvas').forEach(function (canvas) {
+    var data = JSON.parse(document.getElementById(canvas.dataset.source).textContent);
+    var status = canvas.nextElementSibling;
+    var LABEL_WIDTH = 90, AXIS_HEIGHT = 24;
+    var laneCount = data.lanes.length;
+    var laneHeight = Math.max(3, Math.min(24, Math.floor(360 / Math.max(1, laneCount))));
+    var height = laneCount * laneHeight + AXIS_HEIGHT;
+    var full = [data.start, Math.max(data.end, data.start + 1)];
+    var view = full.slice();
+    var ctx = canvas.getContext('2d');
+    var width = 0;
+
+    function color(lane) {
+        if (lane === data.idle) return '#d0d0d0';
+        return 'hsl(' + (lane * 137.508) % 360 + ', 65%, 55%)';
+    }
+
+    // First interval in a lane that ends after time
+    function firstEndingAfter(lo, hi, time) {
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (data.e[mid] <= time) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    function draw() {
+        var ratio = window.devicePixelRatio || 1;
+        width = canvas.clientWidth;
+        canvas.width = width * ratio;
+        canvas.height = height * ratio;
+        canvas.style.height = height + 'px';
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, width, height);
+        var plot = Math.max(1, width - LABEL_WIDTH);
+        var scale = plot / (view[1] - view[0]);
+
+        ctx.font = Math.min(12, laneHeight) + 'px sans-serif';
+        ctx.textBaseline = 'middle';
+        for (var lane = 0; lane < laneCount; lane++) {
+            var y = lane * laneHeight;
+            if (laneHeight >= 8) {
+                ctx.fillStyle = '#333';
+                ctx.fillText(data.lanes[lane], 4, y + laneHeight / 2, LABEL_WIDTH - 8);
+            }
+            ctx.fillStyle = color(lane);
+            // Intervals closer than a pixel are merged into one rectangle
+            var runStart = -1, runEnd = -1;
+            var end = data.o[lane + 1];
+            for (var i = firstEndingAfter(data.o[lane], end, view[0]); i < end && data.s[i] < view[1]; i++) {
+                var x0 = (Math.max(data.s[i], view[0]) - view[0]) * scale;
+                var x1 = (Math.min(data.e[i], view[1]) - view[0]) * scale;
+                if (runEnd >= 0 && x0 <= runEnd + 1) {
+                    runEnd = Math.max(runEnd, x1);
+                } else {
+                    if (runEnd >= 0) ctx.fillRect(LABEL_WIDTH + runStart, y + 1, Math.max(1, runEnd - runStart), laneHeight - 2);
+                    runStart = x0;
+                    runEnd = x1;
+                }
+            }
+            if (runEnd >= 0) ctx.fillRect(LABEL_WIDTH + runStart, y + 1, Math.max(1, runEnd - runStart), laneHeight - 2);
+        }
+
+        // Time axis
+        var axisY = laneCount * laneHeight;
+        ctx.fillStyle = '#666';
+        ctx.font = '11px sans-serif';
+        ctx.fillRect(LABEL_WIDTH, axisY, plot, 1);
+        var step = Math.pow(10, Math.floor(Math.log10((view[1] - view[0]) / 5)));
+        if ((view[1] - view[0]) / step > 10) step *= 2;
+        if ((view[1] - view[0]) / step > 10) step *= 2.5;
+        step = Math.max(1, step);
+        for (var t = Math.ceil(view[0] / step) * step; t <= view[1]; t += step) {
+            var x = LABEL_WIDTH + (t - view[0]) * scale;
+            ctx.fillRect(x, axisY, 1, 4);
+            ctx.fillText(String(Math.round(t)), x + 2, axisY + 14);
+        }
+    }
+
+    function timeAt(clientX) {
+        var x = clientX - canvas.getBoundingClientRect().left - LABEL_WIDTH;
+        return view[0] + x * (view[1] - view[0]) / Math.max(1, width - LABEL_WIDTH);
+    }
+
+    function clampView() {
+        var span = Math.min(full[1] - full[0], Math.max(10, view[1] - view[0]));
+        var start = Math.min(Math.max(view[0], full[0]), full[1] - span);
+        view = [start, start + span];
+    }
+
+    canvas.addEventListener('wheel', function (event) {
+        event.preventDefault();
+        var anchor = timeAt(event.clientX);
+        var factor = event.deltaY < 0 ? 0.8 : 1.25;
+        view = [anchor - (anchor - view[0]) * factor, anchor + (view[1] - anchor) * factor];
+        clampView();
+        draw();
+    }, {passive: false});
+
+    var dragX = null;
+    canvas.addEventListener('mousedown', function (event) { dragX = event.clientX; });
+    window.addEventListener('mouseup', function () { dragX = null; });
+    canvas.addEventListener('mousemove', function (event) {
+        if (dragX !== null) {
+            var shift = (dragX - event.clientX) * (view[1] - view[0]) / Math.max(1, width - LABEL_WIDTH);
+            dragX = event.clientX;
+            view = [view[0] + shift, view[1] + shift];
+            clampView();
+            draw();
+        }
+        var lane = Math.floor((event.clientY - canvas.getBoundingClientRect().top) / laneHeight);
+        if (status && lane >= 0 && lane < laneCount) {
+            status.textContent = data.lanes[lane] + ' @ T' + Math.floor(timeAt(event.clientX));
+        }
+    });
+    canvas.addEventListener('dblclick', function () {
+        view = full.slice();
+        draw();
+    });
+    window.addEventListener('resize', draw);
+    draw();
+});
+"""
+
+TIMELINE_SCRIPT = """
+(function () {
+    var data = JSON.parse(document.getElementById('timeline-data').textContent);
+    var ROW_HEIGHT = 46;
+    var BADGES = [['badge-arrival', 'ARRIVAL'], ['badge-selection', 'SELECTED'],
+                  ['badge-completion', 'FINISHED'], ['badge-idle', 'IDLE'], ['badge-other', 'EVENT']];
+    var view = document.getElementById('timeline');
+    var spacer = document.getElementById('timeline-spacer');
+    var rows = document.getElementById('timeline-rows');
+    var fromInput = document.getElementById('timeline-from');
+    var toInput = document.getElementById('timeline-to');
+    var count = document.getElementById('timeline-count');
+    var total = data.t.length;
+    var lo = 0, hi = total, pending = false;
+
+    function describe(i) {
+        var name = data.names[data.p[i]];
+        switch (data.k[i]) {
+            case 0: return name + ' arrived';
+            case 1: return name + ' selected (burst' + String(data.b[i]).padStart(4) + ')';
+            case 2: return name + ' finished';
+            case 3: return 'Idle';
+            default: return data.other[i] || '';
+        }
+    }
+
+    function cell(className, text) {
+        var div = document.createElement('div');
+        if (className) div.className = className;
+        div.textContent = text;
+        return div;
+    }
+
+    function render() {
+        pending = false;
+        var first = Math.floor(view.scrollTop / ROW_HEIGHT);
+        var last = Math.min(hi - lo, first + Math.ceil(view.clientHeight / ROW_HEIGHT) + 1);
+        var fragment = document.createDocumentFragment();
+        for (var row = first; row < last; row++) {
+            var i = lo + row;
+            var badge = BADGES[data.k[i]];
+            var event = cell('timeline-event', '');
+            event.appendChild(cell('timeline-time', 'T' + data.t[i]));
+            event.appendChild(cell('timeline-badge ' + badge[0], badge[1]));
+            event.appendChild(cell('', describe(i)));
+            fragment.appendChild(event);
+        }
+        rows.style.transform = 'translateY(' + first * ROW_HEIGHT + 'px)';
+        rows.replaceChildren(fragment);
+    }
+
+    // Index of the first event at or after time (events are in time order)
+    function lowerBound(time) {
+        var a = 0, b = total;
+        while (a < b) {
+            var mid = (a + b) >> 1;
+            if (data.t[mid] < time) a = mid + 1; else b = mid;
+        }
+        return a;
+    }
+
+    function applyFilter() {
+        lo = fromInput.value === '' ? 0 : lowerBound(Number(fromInput.value));
+        hi = toInput.value === '' ? total : Math.max(lo, lowerBound(Number(toInput.value) + 1));
+        spacer.style.height = (hi - lo) * ROW_HEIGHT + 'px';
+        count.textContent = (hi - lo) + ' of ' + total + ' events';
+        view.scrollTop = 0;
+        render();
+    }
+
+    view.addEventListener('scroll', function () {
+        if (!pending) {
+            pending = true;
+            requestAnimationFrame(render);
+        }
+    });
+    fromInput.addEventListener('input', applyFilter);
+    toInput.addEventListener('input', applyFilter);
+    applyFilter();
+})();
+"""
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_MB = 256
+
+def workload_key(processes, algorithm, quantum, run_for, seed=0):
+    """Return a content hash identifying a simulation's inputs."""
+    if algorithm not in TIME_SLICED:
+        quantum = None  # Only the time-sliced policies look at the quantum
+    key = [CACHE_VERSION, algorithm, quantum, run_for, workload_processes(processes, algorithm)]
+    if algorithm == 'lottery':
+        key.append(seed)
+    payload = json.dumps(key, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def workload_processes(processes, algorithm):
+    """Return the processes as [name, arrival, burst] lists, plus tickets for the policies that use them."""
+    if algorithm in ('lottery', 'stride'):
+        return [[p.name, p.arrival, p.burst, p.tickets] for p in processes]
+    return [[p.name, p.arrival, p.burst] for p in processes]
+
+def result_to_dict(output, finished_processes):
+    """Convert a scheduler result to plain JSON-serialisable data."""
+    return {
+        'output': output,
+        'finished': [[p.name, p.arrival, p.burst, p.start_time, p.finish_time,
+                      p.wait_time, p.response_time, p.turnaround_time, p.tickets]
+                     for p in finished_processes],
+    }
+
+def result_from_dict(data):
+    """Rebuild (output, finished_processes) from result_to_dict data."""
+    finished = []
+    # Data saved before tickets were recorded has no ninth field
+    for name, arrival, burst, start, finish, wait, response, turnaround, *tickets in data['finished']:
+        p = Process(name, arrival, burst, tickets[0] if tickets else 1)
+        p.remaining = 0
+        p.start_time = start
+        p.finish_time = finish
+        p.wait_time = wait
+        p.response_time = response
+        p.turnaround_time = turnaround
+        finished.append(p)
+    return data['output'], finished
+
+class ResultCache:
+    """On-disk cache of simulation results with size-bounded LRU eviction.
+
+    Entries are gzipped JSON files named after the workload hash. A hit
+    touches the file, so the modification time doubles as the LRU order.
+    """
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json.gz')
+
+    def get(self, key):
+        """Return (output, finished_processes) for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt') as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, EOFError, ValueError):
+            return None
+        return result_from_dict(data)
+
+    def put(self, key, output, finished_processes):
+        """Store a result and evict the least recently used entries if over budget."""
+        data = result_to_dict(output, finished_processes)
+        data['stats'] = calculate_statistics(output, finished_processes, None, None)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete the oldest entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.json.gz'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue  # Removed by a concurrent run
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= size
+
+CHECKPOINT_VERSION = 2
+CHECKPOINTS_PER_RUN = 32
+
+def checkpoint_path(directory, input_filename, algorithm, quantum, seed=0):
+    """Return the checkpoint file for runs of one input file with one policy (and lottery seed)."""
+    lineage = [os.path.abspath(input_filename), algorithm, quantum]
+    if algorithm == 'lottery':
+        lineage.append(seed)
+    lineage = json.dumps(lineage)
+    return os.path.join(directory, hashlib.sha256(lineage.encode()).hexdigest() + '.ckpt.json.gz')
+
+def first_changed_arrival(old_processes, new_processes):
+    """Return the earliest arrival time whose processes differ between two workloads.
+
+    Processes are compared in input order per arrival time, since that order
+    decides how simultaneous arrivals are queued. Returns None if they match.
+    """
+    def by_time(processes):
+        groups = {}
+        for p in processes:
+            groups.setdefault(p[1], []).append(tuple(p))
+        return groups
+    old_groups = by_time(old_processes)
+    new_groups = by_time(new_processes)
+    changed = [t for t in old_groups.keys() | new_groups.keys()
+               if old_groups.get(t) != new_groups.get(t)]
+    return min(changed) if changed else None
+
+def arrived_index_map(old_processes, new_processes, before):
+    """Map old process indices to new ones for processes arriving before a time."""
+    old_by_key = {}
+    for i, p in enumerate(old_processes):
+        if p[1] < before:
+            old_by_key.setdefault(tuple(p), []).append(i)
+    index_map = {}
+    for i, p in enumerate(new_processes):
+        if p[1] < before:
+            index_map[old_by_key[tuple(p)].pop(0)] = i
+    return index_map
+
+def remap_checkpoint(snapshot, index_map):
+    """Rewrite the process indices in a snapshot through index_map."""
+    remapped = dict(snapshot)
+    if snapshot['current'] is not None:
+        remapped['current'] = index_map[snapshot['current']]
+    remapped['finished'] = [index_map[i] for i in snapshot['finished']]
+    # SJF and stride heap entries end with the process index
+    if snapshot['ready_queue'] and isinstance(snapshot['ready_queue'][0], list):
+        remapped['ready_queue'] = [entry[:-1] + [index_map[entry[-1]]] for entry in snapshot['ready_queue']]
+    else:
+        remapped['ready_queue'] = [index_map[i] for i in snapshot['ready_queue']]
+    remapped['state'] = [[index_map[entry[0]]] + entry[1:] for entry in snapshot['state']]
+    if 'passes' in snapshot:
+        remapped['passes'] = [[index_map[i], value] for i, value in snapshot['passes']]
+    return remapped
+
+def load_checkpoints(path):
+    """Return the saved checkpoint data at path, or None if unusable."""
+    try:
+        with gzip.open(path, 'rt') as f:
+            data = json.load(f)
+    except (OSError, EOFError, ValueError):
+        return None
+    return data if data.get('version') == CHECKPOINT_VERSION else None
+
+def resume_from_checkpoint(sim, data):
+    """Restore sim from the latest saved checkpoint still valid for its workload.
+
+    A checkpoint taken at the start of tick t only depends on processes that
+    arrived before t, so any checkpoint at or before the first changed arrival
+    can be reused. Returns the resumed time (0 if nothing was reusable).
+    """
+    old = data['processes']
+    new = workload_processes(sim.processes, sim.algorithm)
+    limit = first_changed_arrival(old, new)
+    usable = [c for c in data['checkpoints']
+              if c['time'] <= sim.run_for and (limit is None or c['time'] <= limit)]
+    if not usable:
+        return 0
+    index_map = arrived_index_map(old, new, usable[-1]['time'])
+    sim.checkpoints = [remap_checkpoint(c, index_map) for c in usable]
+    sim.restore(sim.checkpoints[-1], data['output'], data['intervals'])
+    return sim.time
+
+def save_checkpoints(path, sim):
+    """Write the simulation's checkpoints and events for a later resume; return whether they were written."""
+    data = {
+        'version': CHECKPOINT_VERSION,
+        'algorithm': sim.algorithm,
+        'quantum': sim.quantum,
+        'processes': workload_processes(sim.processes, sim.algorithm),
+        'output': sim.output,
+        'intervals': sim.intervals,
+        'checkpoints': sim.checkpoints,
+    }
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        return False
+    return True
+
+REPORT_DATA_SUFFIX = '.report.json.gz'
+
+def save_report_data(filename, process_count, algorithm, quantum, run_for, all_processes, output, finished_processes):
+    """Save everything generate_html_report needs, so the report can be rendered later."""
+    data = {
+        'process_count': process_count,
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'run_for': run_for,
+        'processes': [[p.name, p.arrival, p.burst] for p in all_processes],
+    }
+    data.update(result_to_dict(output, finished_processes))
+    with gzip.open(filename, 'wt') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+def render_saved_report(data_filename, window):
+    """Generate the HTML report from a file written by save_report_data."""
+    try:
+        with gzip.open(data_filename, 'rt') as f:
+            data = json.load(f)
+    except (OSError, EOFError, ValueError):
+        print(f"Error: Cannot read report data '{data_filename}'")
         sys.exit(1)
+    output, finished = result_from_dict(data)
+    processes = [Process(*p) for p in data['processes']]
+    base_filename = os.path.basename(data_filename)
+    if base_filename.endswith(REPORT_DATA_SUFFIX):
+        base_filename = base_filename[:-len(REPORT_DATA_SUFFIX)]
+    return generate_html_report(base_filename + '.out', data['process_count'], data['algorithm'], data['quantum'],
+                                output, finished, data['run_for'], processes, window, data_filename)
+
+EXPORT_FORMATS = ['ndjson', 'csv', 'parquet']
+METRIC_FIELDS = ['name', 'arrival', 'burst', 'finished', 'wait', 'turnaround', 'response']
+
+def export_formats(text):
+    """Parse a comma-separated list of --export formats."""
+    formats = [f for f in text.split(',') if f]
+    for fmt in formats:
+        if fmt not in EXPORT_FORMATS:
+            raise argparse.ArgumentTypeError(f"unknown export format '{fmt}' (expected {', '.join(EXPORT_FORMATS)})")
+    return formats
+
+def write_events_ndjson(filename, output):
+    """Write one JSON object per event (time, type, process, description)."""
+    with open(filename, 'w') as f:
+        out = ChunkedWriter(f)
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        for event in iter_timeline_events(output):
+            out.write(dumps(event) + '\n')
+        out.flush()
+
+def write_metrics_csv(filename, metrics):
+    """Write the per-process metrics as CSV, one row per process in input order."""
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, METRIC_FIELDS)
+        writer.writeheader()
+        writer.writerows(metrics['processes'])
+
+def write_parquet(events_filename, metrics_filename, output, metrics):
+    """Write the events and per-process metrics as Parquet tables (needs pyarrow)."""
+    times, types, names, descriptions = [], [], [], []
+    for event in iter_timeline_events(output):
+        times.append(event['time'])
+        types.append(event['type'])
+        names.append(event['process'])
+        descriptions.append(event['description'])
+    events = pyarrow.table({
+        'time': pyarrow.array(times, pyarrow.int64()),
+        'type': pyarrow.array(types, pyarrow.string()).dictionary_encode(),
+        'process': pyarrow.array(names, pyarrow.string()).dictionary_encode(),
+        'description': pyarrow.array(descriptions, pyarrow.string()),
+    })
+    pyarrow.parquet.write_table(events, events_filename)
+    rows = metrics['processes']
+    pyarrow.parquet.write_table(pyarrow.table({field: [row[field] for row in rows] for field in METRIC_FIELDS}),
+                                metrics_filename)
+
+INDEX_SUFFIX = '.index.json.gz'
+INDEX_VERSION = 1
+SNAPSHOT_EVERY = 1024
+
+def build_query_index(output, intervals, algorithm, run_for, all_processes):
+    """Build the point-in-time query index for a finished run.
+
+    The index holds the dispatch intervals, a log of ready queue pushes and
+    pops and periodic snapshots of the queue. Everything is derived from
+    the event lines: a process selected while another has not finished
+    means the other was put back in the queue (preempted, or its quantum
+    ran out), with its burst minus the ticks it ran since being selected.
+    A snapshot is taken once at least max(SNAPSHOT_EVERY, queue length)
+    operations have been logged since the last one, so the snapshots never
+    outgrow the log.
+    """
+    sjf = algorithm == 'sjf'
+    names = []
+    name_ids = {}
+
+    def name_id(name):
+        if name not in name_ids:
+            name_ids[name] = len(names)
+            names.append(name)
+        return name_ids[name]
+
+    op_time, op_kind, op_process, op_key = [], [], [], []
+    snapshots = [{'op': 0, 'queue': []}]
+    # Arrival lines do not show the burst, so it is looked up by (name, arrival)
+    bursts = {}
+    for p in all_processes:
+        bursts.setdefault((p.name, p.arrival), deque()).append(p.burst)
+
+    # SJF: heap of (remaining, name, seq, id); otherwise a deque of (id, remaining)
+    queue = [] if sjf else deque()
+    seq = 0
+    running = None  # (id, selected at, burst when selected)
+
+    def push(time, i, remaining):
+        nonlocal seq
+        op_time.append(time)
+        op_kind.append(0)
+        op_process.append(i)
+        op_key.append(remaining)
+        if sjf:
+            heapq.heappush(queue, (remaining, names[i], seq, i))
+            seq += 1
+        else:
+            queue.append((i, remaining))
 
-    input_filename = sys.argv[1]
+    for line in output:
+        time = event_time(line)
+        event = line[line.index(' : ') + 3:]
+        if event.endswith(' arrived'):
+            name = event[:-8]
+            push(time, name_id(name), bursts[(name, time)].popleft())
+        elif event.endswith(' finished'):
+            running = None
+        elif event.endswith(')') and ' selected (burst' in event:
+            cut = event.rindex(' selected (burst')
+            i = name_id(event[:cut])
+            burst = int(event[cut + 16:-1])
+            if running is not None:
+                push(time, running[0], running[2] - (time - running[1]))
+            op_time.append(time)
+            op_kind.append(1)
+            op_process.append(i)
+            op_key.append(burst)
+            if sjf:
+                queue.remove(min(entry for entry in queue if entry[3] == i))
+                heapq.heapify(queue)
+            elif queue and queue[0][0] == i:
+                queue.popleft()
+            else:
+                queue.remove(next(entry for entry in queue if entry[0] == i))
+            running = (i, time, burst)
+        if len(op_time) - snapshots[-1]['op'] >= max(SNAPSHOT_EVERY, len(queue)):
+            ordered = sorted(queue) if sjf else queue
+            snapshots.append({'op': len(op_time),
+                              'queue': [[entry[3], entry[0]] if sjf else list(entry) for entry in ordered]})
+
+    starts, ends, lanes = [], [], []
+    for name, start, end in intervals:
+        starts.append(start)
+        ends.append(end)
+        lanes.append(-1 if name is None else name_id(name))
+    return {
+        'version': INDEX_VERSION,
+        'algorithm': algorithm,
+        'run_for': run_for,
+        'names': names,
+        'intervals': {'start': starts, 'end': ends, 'process': lanes},
+        'ops': {'time': op_time, 'kind': op_kind, 'process': op_process, 'key': op_key},
+        'snapshots': snapshots,
+    }
+
+def save_query_index(filename, index):
+    """Write a query index as gzipped JSON."""
+    with gzip.open(filename, 'wt') as f:
+        json.dump(index, f, separators=(',', ':'))
+
+def load_query_index(filename):
+    """Read a query index written by save_query_index, or exit with an error."""
+    try:
+        with gzip.open(filename, 'rt') as f:
+            index = json.load(f)
+    except (OSError, EOFError, ValueError):
+        print(f"Error: Cannot read query index '{filename}'")
+        sys.exit(1)
+    if index.get('version') != INDEX_VERSION:
+        print(f"Error: Query index '{filename}' was written by another version")
+        sys.exit(1)
+    return index
+
+def running_at(index, time):
+    """Return (name, start, end) of the interval covering time, name None for Idle; None outside the run."""
+    intervals = index['intervals']
+    k = bisect.bisect_right(intervals['start'], time) - 1
+    if k < 0 or time >= intervals['end'][k]:
+        return None
+    lane = intervals['process'][k]
+    return (None if lane < 0 else index['names'][lane], intervals['start'][k], intervals['end'][k])
+
+def ready_queue_at(index, time):
+    """Return the ready queue after the scheduling decisions at time, as (name, remaining) in service order.
+
+    Lottery and stride runs pick from the queue by tickets, so their
+    queue is listed in the order the processes joined it.
+    """
+    ops = index['ops']
+    sjf = index['algorithm'] == 'sjf'
+    count = bisect.bisect_right(ops['time'], time)
+    snapshot_ops = [snapshot['op'] for snapshot in index['snapshots']]
+    snapshot = index['snapshots'][bisect.bisect_right(snapshot_ops, count) - 1]
+
+    queue = [tuple(entry) for entry in snapshot['queue']]
+    for k in range(snapshot['op'], count):
+        i = ops['process'][k]
+        if ops['kind'][k] == 0:
+            queue.append((i, ops['key'][k]))
+        elif sjf:
+            queue.remove(min((entry for entry in queue if entry[0] == i), key=lambda entry: entry[1]))
+        else:
+            queue.remove(next(entry for entry in queue if entry[0] == i))
+    if sjf:
+        # Shortest first, then by name; the stable sort keeps push order for ties like the heap does
+        queue.sort(key=lambda entry: (entry[1], index['names'][entry[0]]))
+    return [(index['names'][i], remaining) for i, remaining in queue]
+
+def print_query(index, time):
+    """Print what was running and waiting at time."""
+    current = running_at(index, time)
+    if current is None:
+        print(f"Time{time:4} : outside the run (0 to {index['run_for']})")
+        return
+    name, start, end = current
+    print(f"Time{time:4} : {name or 'Idle'} ({start} to {end})")
+    queue = ready_queue_at(index, time)
+    waiting = ' '.join(f"{name}({remaining})" for name, remaining in queue)
+    print(f"  ready queue: {waiting or 'empty'}")
+
+def compare_policies(text):
+    """Parse a comma-separated --compare list of policies, e.g. fcfs,sjf,rr:4,lottery.
+
+    Returns (label, algorithm, quantum) tuples; a time-sliced policy
+    without :QUANTUM takes the quantum from the input file.
+    """
+    policies = []
+    for item in text.split(','):
+        algorithm, sep, quantum = item.partition(':')
+        if algorithm in TIME_SLICED and sep:
+            if not quantum.isdigit() or int(quantum) < 1:
+                raise argparse.ArgumentTypeError(f"invalid quantum in '{item}'")
+            policies.append((item, algorithm, int(quantum)))
+        elif algorithm in ALGORITHMS and not sep:
+            policies.append((item, algorithm, None))
+        else:
+            raise argparse.ArgumentTypeError(
+                f"unknown policy '{item}' (expected {', '.join(ALGORITHMS)}, with :QUANTUM for the time-sliced ones)")
+    return policies
+
+def time_window(text):
+    """Parse a START:END time window; either end may be left out."""
+    start, sep, end = text.partition(':')
+    try:
+        if not sep:
+            raise ValueError
+        return (int(start) if start else None, int(end) if end else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time window '{text}' (expected START:END)")
+
+def run_stream(lines, out, delay=0, seed=0):
+    """Simulate a workload read line by line, writing the .out lines to out as time advances.
+
+    The header lines must come before the first process. Time is advanced
+    to `delay` ticks before the latest arrival read (or to N on a 'time N'
+    line), so processes may arrive out of order by up to `delay` ticks.
+    Only events and processes are kept, never the whole input.
+    """
+    process_count = run_for = algorithm = quantum = None
+    sim = None
+
+    def flush(until=None):
+        sim.run(until)
+        out.write(''.join(line + '\n' for line in sim.output))
+        out.flush()
+        sim.output.clear()
+        sim.intervals.clear()
+
+    def start():
+        check_header(process_count, run_for, algorithm, quantum)
+        if algorithm not in ALGORITHMS:
+            raise InputError(f"Unknown algorithm '{algorithm}'")
+        out.write(''.join(line + '\n' for line in output_header(process_count, algorithm, quantum)))
+        return Simulation([], run_for, algorithm, quantum, seed=seed)
+
+    for keyword, value in iter_workload(lines):
+        if keyword in ('process', 'time'):
+            if sim is None:
+                sim = start()
+            if keyword == 'process':
+                try:
+                    sim.add_process(value)
+                except ValueError as e:
+                    raise InputError(str(e))
+                flush(value.arrival - delay)
+            else:
+                flush(value)
+        elif sim is not None:
+            raise InputError(f"Parameter {keyword} after the first process.")
+        elif keyword == 'processcount':
+            process_count = value
+        elif keyword == 'runfor':
+            run_for = value
+        elif keyword == 'use':
+            algorithm = value
+        elif keyword == 'quantum':
+            quantum = value
+
+    if sim is None:
+        sim = start()
+    flush()
+    out.write(''.join(line + '\n' for line in output_footer(sim.finished_processes(), run_for, sim.processes)))
+    out.flush()
+
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+def workload_from_json(data):
+    """Parse a JSON workload with the .in keywords; processes are [name, arrival, burst[, tickets]] or dicts."""
+    if not isinstance(data, dict):
+        raise InputError("Workload must be a JSON object.")
+    for field in ('runfor', 'use', 'processes'):
+        if field not in data:
+            raise InputError(f"Missing parameter {field}.")
+    try:
+        processes = [as_process(p) for p in data['processes']]
+    except (KeyError, TypeError, ValueError):
+        raise InputError("Missing parameter in process definition.")
+    process_count = data.get('processcount', len(processes))
+    algorithm = data['use']
+    quantum = data.get('quantum')
+    check_json_int('runfor', data['runfor'])
+    check_json_int('processcount', process_count)
+    if not isinstance(algorithm, str):
+        raise InputError("Parameter use must be a string.")
+    if algorithm in TIME_SLICED:
+        if quantum is None:
+            raise InputError(f"Missing quantum parameter when use is '{algorithm}'")
+        check_json_int('quantum', quantum, 1)
+    for p in processes:
+        if not isinstance(p.name, str):
+            raise InputError("Process names must be strings.")
+        check_json_int(f"arrival of process {p.name}", p.arrival)
+        check_json_int(f"burst of process {p.name}", p.burst)
+        check_json_int(f"tickets of process {p.name}", p.tickets, 1)
+    return process_count, data['runfor'], algorithm, quantum, processes
+
+def check_json_int(field, value, minimum=0):
+    """Raise InputError unless a JSON workload value is an integer of at least minimum (if given)."""
+    # bool is an int subclass, but true/false are not valid counts
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise InputError(f"Parameter {field} must be an integer.")
+    if minimum is not None and value < minimum:
+        raise InputError(f"Parameter {field} must be at least {minimum}.")
+
+def simulate_request(body, content_type):
+    """Run one workload sent to the server and return the .out content and statistics.
+
+    body is .in text, or JSON when content_type is application/json (which
+    may also give a lottery "seed"). Runs in a worker process; raises
+    ValueError for a bad workload.
+    """
+    text = body.decode('utf-8')
+    seed = 0
+    if content_type == 'application/json':
+        try:
+            data = json.loads(text)
+        except ValueError:
+            raise InputError("Workload is not valid JSON.")
+        process_count, run_for, algorithm, quantum, processes = workload_from_json(data)
+        seed = data.get('seed', 0)
+        check_json_int('seed', seed, None)
+    else:
+        process_count, run_for, algorithm, quantum, processes = parse_workload(text)
+    if algorithm not in ALGORITHMS:
+        raise InputError(f"Unknown algorithm '{algorithm}'")
+    result = simulate(processes, algorithm, run_for, quantum, seed=seed)
+    result.process_count = process_count
+    return {
+        'output': ''.join(line + '\n' for line in result.lines()),
+        'metrics': result.metrics(),
+    }
+
+class SimulationRequestHandler(http.server.BaseHTTPRequestHandler):
+    """POST a workload to /simulate; GET / reports that the server is up."""
+    def do_GET(self):
+        if self.path != '/':
+            self.send_json(404, {'error': 'not found'})
+            return
+        self.send_json(200, {'status': 'ok', 'workers': self.server.workers})
+
+    def do_POST(self):
+        if self.path != '/simulate':
+            self.send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.send_json(411, {'error': 'Content-Length required'})
+            return
+        if length > MAX_REQUEST_BYTES:
+            self.send_json(413, {'error': f'workload larger than {MAX_REQUEST_BYTES} bytes'})
+            return
+        body = self.rfile.read(length)
+        content_type = self.headers.get_content_type()
+        try:
+            result = self.server.pool.submit(simulate_request, body, content_type).result()
+        except (ValueError, UnicodeDecodeError) as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            # Anything else is a server bug; answer instead of dropping the connection
+            self.send_json(500, {'error': f'internal error: {type(e).__name__}: {e}'})
+            return
+        self.send_json(200, result)
+
+    def send_json(self, status, data):
+        payload = json.dumps(data, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def serve_address(text):
+    """Parse a --serve address: PORT, HOST:PORT or unix:PATH."""
+    if text.startswith('unix:'):
+        return text[5:]
+    host, _, port = text.rpartition(':')
+    try:
+        return (host or '127.0.0.1', int(port))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid address '{text}' (expected PORT, HOST:PORT or unix:PATH)")
+
+def serve(address, workers=None, verbose=False):
+    """Answer simulation requests until interrupted, keeping a warm pool of worker processes."""
+    if isinstance(address, str) and not hasattr(socketserver, 'ThreadingUnixStreamServer'):  # Not on Windows
+        print("Error: Unix sockets are not supported on this platform")
+        sys.exit(1)
+    workers = workers or os.cpu_count()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start every worker now so the first requests do not pay for it. This happens before
+        # binding, so no worker inherits the listening socket and keeps it open after we exit
+        list(pool.map(abs, range(workers)))
+        try:
+            if isinstance(address, str):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(address)
+                server = socketserver.ThreadingUnixStreamServer(address, SimulationRequestHandler)
+                server.daemon_threads = True
+                where = f"unix:{address}"
+            else:
+                server = http.server.ThreadingHTTPServer(address, SimulationRequestHandler)
+                where = f"http://{address[0]}:{server.server_address[1]}"
+        except OSError as e:
+            location = address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+            print(f"Error: Cannot listen on {location}: {e.strerror or e}")
+            sys.exit(1)
+        server.workers = workers
+        server.verbose = verbose
+        server.pool = pool
+        with server:
+            print(f"Serving simulations on {where} with {workers} workers")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                if isinstance(address, str):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(address)
+
+def parse_args(argv):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(prog='scheduler-gpt.py', usage='%(prog)s [options] <input file>')
+    parser.add_argument('input', nargs='?', help="input file (.in)")
+    parser.add_argument('--profile', action='store_true',
+                        help="print per-phase timings, peak RSS growth and scheduler counters")
+    parser.add_argument('--profile-out', metavar='FILE',
+                        help="also run under cProfile and dump pstats data to FILE")
+    parser.add_argument('--cache-dir', metavar='DIR', default=os.environ.get('SCHEDULER_CACHE_DIR'),
+                        help="reuse results cached in DIR (default: $SCHEDULER_CACHE_DIR)")
+    parser.add_argument('--cache-size', metavar='MB', type=int, default=DEFAULT_CACHE_MB,
+                        help=f"cache size limit in MiB (default {DEFAULT_CACHE_MB})")
+    parser.add_argument('--no-cache', action='store_true', help="ignore the result cache")
+    parser.add_argument('--checkpoint-dir', metavar='DIR',
+                        help="save checkpoints in DIR and resume edited workloads from them")
+    parser.add_argument('--checkpoint-every', metavar='TICKS', type=int,
+                        help=f"ticks between checkpoints (default runfor/{CHECKPOINTS_PER_RUN})")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the lottery draws (default 0)")
+    parser.add_argument('--html', choices=['always', 'never', 'lazy'], default='always',
+                        help="write the HTML report now, never, or save its data for --report-from")
+    parser.add_argument('--html-window', metavar='START:END', type=time_window,
+                        help="only put events in this time range in the HTML report")
+    parser.add_argument('--export', metavar='FORMATS', type=export_formats, default=[],
+                        help=f"also write events and metrics as {', '.join(EXPORT_FORMATS)} (comma-separated)")
+    parser.add_argument('--index', action='store_true',
+                        help=f"also write a {INDEX_SUFFIX} sidecar for --query")
+    parser.add_argument('--query', metavar='FILE',
+                        help=f"answer --at questions from a saved {INDEX_SUFFIX} file without re-running")
+    parser.add_argument('--at', metavar='TIME', type=int, action='append',
+                        help="with --query: show what was running and ready at TIME (repeatable)")
+    parser.add_argument('--compact', action='store_true',
+                        help="fold runs of Idle ticks and Round Robin re-selections into 'xN' records")
+    parser.add_argument('--expand', metavar='FILE',
+                        help="print a --compact .out file in the canonical format")
+    parser.add_argument('--compare', metavar='POLICIES', type=compare_policies,
+                        help="run the workload under each policy (e.g. fcfs,sjf,rr:4) and write one comparison report")
+    parser.add_argument('--report-from', metavar='FILE',
+                        help=f"render the HTML report from a saved {REPORT_DATA_SUFFIX} file")
+    parser.add_argument('--stream', action='store_true',
+                        help="read the workload from stdin as it arrives and write the output to stdout")
+    parser.add_argument('--stream-delay', metavar='TICKS', type=int, default=0,
+                        help="keep --stream this many ticks behind the latest arrival to allow reordering")
+    parser.add_argument('--serve', metavar='ADDRESS', type=serve_address,
+                        help="run as a server on PORT, HOST:PORT or unix:PATH; POST workloads to /simulate")
+    parser.add_argument('--workers', type=int, help="worker processes for --serve (default: CPU count)")
+    parser.add_argument('--verbose', action='store_true', help="log every request in --serve mode")
+    return parser.parse_args(argv)
+
+def run(args, profiler):
+    """Run one simulation as described by the parsed command line."""
+    input_filename = args.input
     
     # Check if input file has .in extension
     if not input_filename.endswith('.in'):
@@ -812,27 +2698,247 @@ def main():
     output_filename = base_filename[:-3] + '.out'
     
     # Parse input
-    process_count, run_for, algorithm, quantum, processes = parse_input(input_filename)
+    with profiler.phase('parse_input'):
+        process_count, run_for, algorithm, quantum, processes = parse_input(input_filename)
     
-    # Run appropriate scheduler
-    if algorithm == 'fcfs':
-        output, finished = fcfs_scheduler(processes, run_for)
-    elif algorithm == 'sjf':
-        output, finished = sjf_scheduler(processes, run_for)
-    elif algorithm == 'rr':
-        output, finished = rr_scheduler(processes, run_for, quantum)
-    else:
+    if algorithm not in ALGORITHMS:
         print(f"Error: Unknown algorithm '{algorithm}'")
         sys.exit(1)
+    if 'parquet' in args.export and pyarrow is None:
+        print("Error: --export parquet needs pyarrow (pip install pyarrow)")
+        sys.exit(1)
+
+    checkpoint_file = None
+    checkpoint_data = None
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+        checkpoint_file = checkpoint_path(args.checkpoint_dir, input_filename, algorithm, quantum, args.seed)
+        checkpoint_data = load_checkpoints(checkpoint_file)
+
+    # Reuse a cached result for an identical workload if there is one
+    cache = None
+    cached = None
+    if args.cache_dir and not args.no_cache:
+        cache = ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        key = workload_key(processes, algorithm, quantum, run_for, args.seed)
+        with profiler.phase('cache_lookup'):
+            cached = cache.get(key)
+        # A hit skips the run, so it is only taken when the checkpoints already hold this
+        # workload; otherwise later edits of the input would have nothing to resume from
+        if cached is not None and checkpoint_file and (
+                checkpoint_data is None
+                or checkpoint_data['processes'] != workload_processes(processes, algorithm)):
+            cached = None
+
+    # Run appropriate scheduler
+    if cached is None:
+        sim = Simulation(processes, run_for, algorithm, quantum, profiler.counters, args.seed)
+        checkpoint_every = None
+        if checkpoint_file:
+            checkpoint_every = args.checkpoint_every or max(1, run_for // CHECKPOINTS_PER_RUN)
+            if checkpoint_data is not None:
+                with profiler.phase('resume'):
+                    resumed = resume_from_checkpoint(sim, checkpoint_data)
+                if resumed:
+                    print(f"Resumed from checkpoint at time {resumed}")
+        with profiler.phase('schedule'):
+            sim.run(checkpoint_every=checkpoint_every)
+        result = SimulationResult(processes, run_for, algorithm, quantum, sim.output, sim.finished_processes(),
+                                  sim.gantt_intervals(), process_count)
+        if checkpoint_file:
+            with profiler.phase('checkpoint_store'):
+                if not save_checkpoints(checkpoint_file, sim):
+                    print(f"Warning: could not write checkpoints to {checkpoint_file}")
+        if cache is not None:
+            with profiler.phase('cache_store'):
+                cache.put(key, result.output, result.finished)
+    else:
+        output, finished = cached
+        result = SimulationResult(processes, run_for, algorithm, quantum, output, finished,
+                                  process_count=process_count)
     
     # Write output
-    write_output(output_filename, process_count, algorithm, quantum, output, finished, run_for, processes)
+    with profiler.phase('write_output'):
+        result.write_output(output_filename, args.compact)
 
     print(f"Output written to {output_filename}")
 
-    # Always generate HTML report
-    html_filename = generate_html_report(output_filename, process_count, algorithm, quantum, output, finished, run_for, processes)
-    print(f"HTML report written to {html_filename}")
+    if args.export:
+        with profiler.phase('export'):
+            exported = result.export(output_filename[:-4], args.export)
+        for export_filename in exported:
+            print(f"Export written to {export_filename}")
+
+    if args.index:
+        index_filename = output_filename[:-4] + INDEX_SUFFIX
+        with profiler.phase('query_index'):
+            save_query_index(index_filename, result.query_index())
+        print(f"Query index written to {index_filename}")
+
+    # Keep the full run on disk when the report is deferred or cut to a window
+    data_filename = None
+    if args.html == 'lazy' or (args.html == 'always' and args.html_window):
+        data_filename = output_filename[:-4] + REPORT_DATA_SUFFIX
+        with profiler.phase('report_data'):
+            result.save_report_data(data_filename)
+        print(f"Report data written to {data_filename}")
+
+    if args.html == 'always':
+        with profiler.phase('html_report'):
+            html_filename = result.write_html(output_filename, args.html_window, data_filename)
+        print(f"HTML report written to {html_filename}")
+
+def simulate_with_counters(processes, policy, run_for, quantum=None, seed=0):
+    """Run simulate() in a worker process and return the result with the scheduler counters it collected."""
+    counters = {'ticks': 0, 'events': 0, 'queue_ops': 0, 'preemptions': 0}
+    return simulate(processes, policy, run_for, quantum, counters, seed), counters
+
+def run_compare(args, profiler):
+    """Run the input workload under every --compare policy in parallel and compare them."""
+    input_filename = args.input
+    if not input_filename.endswith('.in'):
+        print("Error: Input file must have .in extension")
+        sys.exit(1)
+    if args.checkpoint_dir or args.html == 'lazy' or args.html_window:
+        print("Error: --compare cannot be combined with --checkpoint-dir, --html lazy or --html-window")
+        sys.exit(1)
+    if 'parquet' in args.export and pyarrow is None:
+        print("Error: --export parquet needs pyarrow (pip install pyarrow)")
+        sys.exit(1)
+    base_filename = os.path.basename(input_filename)[:-3]
+
+    # The workload is parsed once and shipped to a worker per policy
+    with profiler.phase('parse_input'):
+        process_count, run_for, _, file_quantum, processes = parse_input(input_filename)
+    policies = []
+    for label, algorithm, quantum in args.compare:
+        if algorithm in TIME_SLICED and quantum is None:
+            if file_quantum is None:
+                print(f"Error: Missing quantum for '{algorithm}'; use {algorithm}:QUANTUM "
+                      f"or set quantum in the input file")
+                sys.exit(1)
+            label, quantum = f"{algorithm}:{file_quantum}", file_quantum
+        # Each label names an output file, so a repeated one would overwrite an earlier run
+        if any(label == other for other, _, _ in policies):
+            print(f"Error: --compare lists {label} more than once")
+            sys.exit(1)
+        policies.append((label, algorithm, quantum))
+
+    results = {}
+    cache = None
+    if args.cache_dir and not args.no_cache:
+        cache = ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        with profiler.phase('cache_lookup'):
+            for label, algorithm, quantum in policies:
+                cached = cache.get(workload_key(processes, algorithm, quantum, run_for, args.seed))
+                if cached is not None:
+                    results[label] = SimulationResult(processes, run_for, algorithm, quantum, *cached)
+
+    missing = [policy for policy in policies if policy[0] not in results]
+    if missing:
+        workers = min(len(missing), os.cpu_count() or 1)
+        with profiler.phase('schedule'), concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(simulate_with_counters, processes, algorithm, run_for, quantum, args.seed)
+                       for _, algorithm, quantum in missing]
+            for (label, _, _), future in zip(missing, futures):
+                results[label], counters = future.result()
+                if profiler.counters is not None:
+                    for name, value in counters.items():
+                        profiler.counters[name] += value
+        if cache is not None:
+            with profiler.phase('cache_store'):
+                for label, algorithm, quantum in missing:
+                    result = results[label]
+                    cache.put(workload_key(processes, algorithm, quantum, run_for, args.seed),
+                              result.output, result.finished)
+    results = [(label, results[label]) for label, _, _ in policies]
+
+    for label, result in results:
+        result.process_count = process_count
+        output_filename = f"{base_filename}-{label.replace(':', '-q')}.out"
+        with profiler.phase('write_output'):
+            result.write_output(output_filename, args.compact)
+        stats = calculate_statistics(result.output, result.finished, run_for, processes)
+        print(f"{label:<10} wait {stats['avg_wait_time']:>8}  turnaround {stats['avg_turnaround_time']:>8}  "
+              f"response {stats['avg_response_time']:>8}  -> {output_filename}")
+        if args.export:
+            with profiler.phase('export'):
+                exported = result.export(output_filename[:-4], args.export)
+            for export_filename in exported:
+                print(f"Export written to {export_filename}")
+        if args.index:
+            index_filename = output_filename[:-4] + INDEX_SUFFIX
+            with profiler.phase('query_index'):
+                save_query_index(index_filename, result.query_index())
+            print(f"Query index written to {index_filename}")
+
+    if args.html != 'never':
+        html_filename = base_filename + COMPARE_SUFFIX
+        with profiler.phase('html_report'):
+            generate_comparison_report(html_filename, results)
+        print(f"Comparison report written to {html_filename}")
+
+def main():
+    args = parse_args(sys.argv[1:])
+
+    if args.report_from:
+        html_filename = render_saved_report(args.report_from, args.html_window)
+        print(f"HTML report written to {html_filename}")
+        return
+
+    if args.expand:
+        try:
+            with open(args.expand, 'r') as f:
+                out = ChunkedWriter(sys.stdout)
+                for line in expand_output(f):
+                    out.write(line + '\n')
+                out.flush()
+        except FileNotFoundError:
+            print(f"Error: File '{args.expand}' not found")
+            sys.exit(1)
+        return
+
+    if args.query:
+        if not args.at:
+            print("Error: --query needs at least one --at TIME")
+            sys.exit(1)
+        index = load_query_index(args.query)
+        for time in args.at:
+            print_query(index, time)
+        return
+
+    if args.serve:
+        serve(args.serve, args.workers, args.verbose)
+        return
+
+    if args.stream:
+        try:
+            run_stream(sys.stdin, sys.stdout, args.stream_delay, args.seed)
+        except InputError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    # Check command line arguments
+    if args.input is None:
+        print("Usage: scheduler-gpt.py <input file>")
+        sys.exit(1)
+
+    command = run_compare if args.compare else run
+    profiler = Profiler() if args.profile or args.profile_out else NullProfiler()
+    if not args.profile_out:
+        command(args, profiler)
+        profiler.report()
+        return
+
+    import cProfile
+    import pstats
+    cprofiler = cProfile.Profile()
+    cprofiler.runcall(command, args, profiler)
+    cprofiler.dump_stats(args.profile_out)
+    profiler.report()
+    print(f"\ncProfile data written to {args.profile_out}")
+    pstats.Stats(cprofiler).sort_stats('cumulative').print_stats(15)
 
 if __name__ == "__main__":
     main()
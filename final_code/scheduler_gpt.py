@@ -0,0 +1,19 @@
+"""Importable name for scheduler-gpt.py, whose file name is not a valid module name.
+
+    from scheduler_gpt import simulate
+    result = simulate([('A', 0, 5), ('B', 1, 3)], 'rr', 20, quantum=2)
+    result.events(), result.metrics()
+
+Importing this module loads scheduler-gpt.py and registers it under the
+name scheduler_gpt, so its functions and classes pickle by reference
+(e.g. for process pools).
+"""
+import importlib.util
+import os
+import sys
+
+_spec = importlib.util.spec_from_file_location(
+    __name__, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scheduler-gpt.py'))
+_module = importlib.util.module_from_spec(_spec)
+sys.modules[__name__] = _module
+_spec.loader.exec_module(_module)
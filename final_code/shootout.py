@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Cross-implementation performance shoot-out.
+
+Runs every scheduler under initial_code/ and final_code/scheduler-gpt.py on
+generated workloads of growing size. For each run it records wall time,
+CPU time, peak memory and whether the .out file agrees with the final
+version. Results are printed as a table and saved as JSON.
+
+Each run happens in a scratch directory holding a copy of the input,
+because the implementations write their .out files in different places
+(next to the input, the working directory, or Output_Files/).
+
+Usage:
+    shootout.py [--processes 10,100,500] [--runfor 1000,10000] [--policies fcfs,sjf,rr] [-o shootout.json]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from itertools import zip_longest
+
+from benchmark import generate_processes, git_commit, int_list
+
+FINAL_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(FINAL_DIR)
+REFERENCE = 'final'
+IMPLEMENTATIONS = {
+    REFERENCE: (os.path.join(FINAL_DIR, 'scheduler-gpt.py'), ['--html', 'never']),
+    'Andres': (os.path.join(REPO_DIR, 'initial_code', 'Andres', 'scheduler-gpt.py'), []),
+    'Anthony': (os.path.join(REPO_DIR, 'initial_code', 'Anthony', 'scheduler.py'), []),
+    'Ethan': (os.path.join(REPO_DIR, 'initial_code', 'Ethan', 'scheduler-gpt.py'), []),
+    'Joshua': (os.path.join(REPO_DIR, 'initial_code', 'Joshua', 'scheduler-gpt.py'), []),
+    'aitan': (os.path.join(REPO_DIR, 'initial_code', 'aitan', 'scheduler-gpt.py'), []),
+}
+# Runs a script as __main__ and writes its VmHWM (KiB) to argv[1] on exit. The
+# child's rusage peak would also count the memory it inherited from this harness
+# at fork, while VmHWM starts again at exec.
+LAUNCHER = '''
+import atexit, os, runpy, sys
+def report():
+    with open('/proc/self/status') as f:
+        peak = next((line.split()[1] for line in f if line.startswith('VmHWM:')), '')
+    with open(peak_file, 'w') as f:
+        f.write(peak)
+peak_file, script = sys.argv[1:3]
+sys.argv = sys.argv[2:]
+sys.path[0] = os.path.dirname(script)
+if os.path.exists('/proc/self/status'):
+    atexit.register(report)
+runpy.run_path(script, run_name='__main__')
+'''
+
+def load_verifier():
+    """Import verify-outputs.py for its streaming comparator."""
+    spec = importlib.util.spec_from_file_location('verify_outputs', os.path.join(FINAL_DIR, 'verify-outputs.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def write_workload(path, processes, run_for, policy, quantum):
+    """Write a workload in the .in grammar."""
+    with open(path, 'w') as f:
+        f.write(f"processcount {len(processes)}\n")
+        f.write(f"runfor {run_for}\n")
+        f.write(f"use {policy}\n")
+        if policy == 'rr':
+            f.write(f"quantum {quantum}\n")
+        for p in processes:
+            f.write(f"process name {p.name} arrival {p.arrival} burst {p.burst}\n")
+        f.write("end\n")
+
+def find_output(directory, base_name):
+    """Return the path of base_name.out written anywhere under directory, or None."""
+    for root, _, files in os.walk(directory):
+        if base_name + '.out' in files:
+            return os.path.join(root, base_name + '.out')
+    return None
+
+def run_implementation(script, extra_args, input_file, timeout):
+    """Run one implementation in a scratch directory.
+
+    Returns (scratch dir, wall seconds, cpu seconds, peak RSS KiB, timed out).
+    CPU time comes from the child's own rusage where os.wait4 exists. Peak
+    memory is the VmHWM the child reports through LAUNCHER where /proc exists
+    (None if it was killed first), otherwise its rusage peak.
+    """
+    scratch = tempfile.mkdtemp(prefix='shootout-')
+    local_input = os.path.join(scratch, os.path.basename(input_file))
+    shutil.copy(input_file, local_input)
+    peak_file = os.path.join(scratch, 'peak-rss')
+
+    start = time.perf_counter()
+    command = [sys.executable, '-c', LAUNCHER, peak_file, script] + extra_args + [local_input]
+    proc = subprocess.Popen(command, cwd=scratch, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            cpu = usage.ru_utime + usage.ru_stime
+            peak = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+        else:
+            proc.wait()
+            cpu = peak = None
+    finally:
+        timed_out = not timer.is_alive() and proc.returncode != 0
+        timer.cancel()
+    wall = time.perf_counter() - start
+    if os.path.exists('/proc/self/status'):
+        # A child killed before it could report has no peak
+        try:
+            with open(peak_file) as f:
+                peak = int(f.read())
+        except (OSError, ValueError):
+            peak = None
+    return scratch, wall, cpu, peak, timed_out
+
+def event_lines(path):
+    """Yield the 'Time N : ...' lines of a .out file."""
+    with open(path, 'r') as f:
+        for line in f:
+            if line.startswith('Time'):
+                yield line.rstrip('\n')
+
+def compare_to_reference(verifier, output_file, reference_file):
+    """Return 'match', 'missing', or where the output first diverges from the reference.
+
+    Files that differ only outside the event lines (header padding, statistics
+    format) are reported as 'events match' so schedule agreement stays visible.
+    """
+    if output_file is None:
+        return 'missing'
+    if reference_file is None:
+        return 'no reference'
+    difference = verifier.compare_files(output_file, reference_file, context=0)
+    if difference is None:
+        return 'match'
+    if all(a == b for a, b in zip_longest(event_lines(output_file), event_lines(reference_file))):
+        return 'events match'
+    time_text = '' if difference['time'] is None else f" (time {difference['time']})"
+    return f"differs at line {difference['line']}{time_text}"
+
+def run_shootout(names, process_counts, run_fors, policies, quantum, seed, timeout):
+    """Run every implementation on every workload and return the result records."""
+    verifier = load_verifier()
+    results = []
+    timed_out = {}  # implementation -> (run_for, count) of its first timeout
+    workdir = tempfile.mkdtemp(prefix='shootout-inputs-')
+    try:
+        for run_for in sorted(run_fors):
+            for count in sorted(process_counts):
+                processes = generate_processes(count, run_for, seed)
+                for policy in policies:
+                    base_name = f"w{count}-{run_for}-{policy}"
+                    input_file = os.path.join(workdir, base_name + '.in')
+                    write_workload(input_file, processes, run_for, policy, quantum)
+
+                    # The reference runs first so the others can be compared with it
+                    reference_file = None
+                    scratches = []
+                    for name in [REFERENCE] + [n for n in names if n != REFERENCE]:
+                        limit = timed_out.get(name)
+                        if limit and run_for >= limit[0] and count >= limit[1]:
+                            print(f"{name:>8} {base_name:<22} skipped (timed out on a smaller workload)")
+                            continue
+                        script, extra_args = IMPLEMENTATIONS[name]
+                        scratch, wall, cpu, peak, was_killed = run_implementation(script, extra_args, input_file, timeout)
+                        scratches.append(scratch)
+                        output_file = find_output(scratch, base_name)
+                        if name == REFERENCE:
+                            reference_file = output_file
+                            agreement = 'reference'
+                        elif was_killed:
+                            agreement = 'timeout'
+                        else:
+                            agreement = compare_to_reference(verifier, output_file, reference_file)
+                        if was_killed:
+                            timed_out[name] = (run_for, count)
+                        if name == REFERENCE or name in names:
+                            results.append({
+                                'implementation': name,
+                                'policy': policy,
+                                'processes': count,
+                                'run_for': run_for,
+                                'wall_s': round(wall, 4),
+                                'cpu_s': None if cpu is None else round(cpu, 4),
+                                'peak_rss_kb': peak,
+                                'agreement': agreement,
+                            })
+                            print(f"{name:>8} {base_name:<22} {wall * 1000:10.1f} ms "
+                                  f"{peak if peak is not None else '-':>9} KiB  {agreement}")
+                    for scratch in scratches:
+                        shutil.rmtree(scratch, ignore_errors=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def print_summary(results):
+    """Print total time, full agreement and event agreement per implementation."""
+    print(f"\n{'implementation':<16}{'runs':>6}{'total s':>10}{'agree':>8}{'events':>9}")
+    for name in IMPLEMENTATIONS:
+        runs = [r for r in results if r['implementation'] == name]
+        if not runs:
+            continue
+        total = sum(r['wall_s'] for r in runs)
+        agree = sum(1 for r in runs if r['agreement'] in ('match', 'reference'))
+        events = sum(1 for r in runs if r['agreement'] in ('match', 'reference', 'events match'))
+        print(f"{name:<16}{len(runs):>6}{total:>10.2f}{agree:>5}/{len(runs)}{events:>7}/{len(runs)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the scheduler implementations at scale.")
+    parser.add_argument('--implementations', default=','.join(IMPLEMENTATIONS),
+                        help=f"comma-separated implementations ({', '.join(IMPLEMENTATIONS)})")
+    parser.add_argument('--processes', type=int_list, default=[10, 100, 500],
+                        help="comma-separated process counts")
+    parser.add_argument('--runfor', type=int_list, default=[1000, 10000],
+                        help="comma-separated run_for values")
+    parser.add_argument('--policies', default='fcfs,sjf,rr', help="comma-separated policies")
+    parser.add_argument('--quantum', type=int, default=4, help="quantum used for rr")
+    parser.add_argument('--seed', type=int, default=0, help="workload seed")
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help="seconds before a run is killed; larger workloads are then skipped")
+    parser.add_argument('-o', '--output', default='shootout.json', help="result file")
+    args = parser.parse_args()
+
+    names = [n for n in args.implementations.split(',') if n]
+    for name in names:
+        if name not in IMPLEMENTATIONS:
+            print(f"Error: Unknown implementation '{name}'")
+            sys.exit(1)
+    policies = [p for p in args.policies.split(',') if p]
+
+    results = run_shootout(names, args.processes, args.runfor, policies, args.quantum, args.seed, args.timeout)
+    print_summary(results)
+    with open(args.output, 'w') as f:
+        json.dump({'meta': {'commit': git_commit(), 'quantum': args.quantum, 'seed': args.seed},
+                   'results': results}, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
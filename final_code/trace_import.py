@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Import real scheduler traces and CSV job logs as simulator workloads.
+
+Traces are read in one streaming pass straight into Process objects, with
+no intermediate .in text. Supported formats:
+
+  csv       one job per row; --columns maps name, arrival and burst (or end)
+            to column names, or to 0-based indices with --no-header
+  timehist  `perf sched timehist` output; each line is one run slice
+  ftrace    sched_switch / sched_wakeup events from ftrace or `perf sched script`
+
+Times are converted to ticks as round((t - origin) * scale). For csv the
+origin defaults to 0 and the scale to 1, so times are ticks already. For the
+perf and ftrace formats the origin defaults to the earliest time stamp and
+the scale to 1000 ticks per second. A task arrives when it is
+first seen and its burst is its total time on a CPU. Files ending in .gz
+are decompressed on the fly.
+
+Usage:
+    trace_import.py <trace> --use fcfs|sjf|rr|lottery|stride [--format csv|timehist|ftrace] [--columns name=job,arrival=submit,burst=runtime]
+                    [--scale TICKS_PER_UNIT] [--origin T|earliest] [--quantum Q] [--seed S] [--runfor N]
+                    [-o out.out] [--html]
+"""
+import argparse
+import csv
+import gzip
+import os
+import re
+import sys
+
+import scheduler_gpt
+from scheduler_gpt import InputError, Process
+
+FORMATS = ['csv', 'timehist', 'ftrace']
+DEFAULT_SCALES = {'csv': 1.0, 'timehist': 1000.0, 'ftrace': 1000.0}
+DEFAULT_ORIGINS = {'csv': 0.0, 'timehist': 'earliest', 'ftrace': 'earliest'}
+CSV_FIELDS = ('name', 'arrival', 'burst', 'end')
+
+TIMEHIST_LINE = re.compile(r'^\s*(\d+\.\d+)\s+\[\d+\]\s+(.+?)\s+(\d+\.\d+)\s+(\d+\.\d+)\s+(\d+\.\d+)\s*$')
+FTRACE_TIME = re.compile(r'\[(\d+)\][^:]*?\s(\d+\.\d+):')
+FTRACE_FIELD = re.compile(r'(\w+)=(\S*)')
+# Older perf versions print 'comm:pid [prio]' instead of key=value fields
+PERF_NEXT_TASK = re.compile(r'==>\s+(.*):(\d+)\s+\[')
+PERF_WAKEUP_TASK = re.compile(r'sched_wakeup\w*:\s+(.*?):(\d+)\s+\[')
+
+def open_trace(filename):
+    """Open a trace for streaming text reads, decompressing .gz files."""
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'rt', newline='')
+    return open(filename, 'r', newline='')
+
+def parse_columns(text):
+    """Parse a name=COL,arrival=COL,burst=COL mapping."""
+    columns = {}
+    for item in text.split(','):
+        field, sep, column = item.partition('=')
+        if not sep or field not in CSV_FIELDS:
+            raise argparse.ArgumentTypeError(
+                f"invalid column mapping '{item}' (expected FIELD=COLUMN with FIELD in {', '.join(CSV_FIELDS)})")
+        columns[field] = column
+    return columns
+
+def rebase(processes, scale, origin=None):
+    """Convert the raw arrival time stamps of processes to ticks in place.
+
+    Without an origin the earliest time stamp becomes tick 0.
+    """
+    if origin is None:
+        origin = min((p.arrival for p in processes), default=0.0)
+    for p in processes:
+        p.arrival = round((p.arrival - origin) * scale)
+        if p.arrival < 0:
+            raise InputError(f"Process {p.name} arrives before the origin {origin}")
+    return processes
+
+def duration(value, scale):
+    """Convert a duration to ticks; every process runs for at least one tick."""
+    return max(1, round(value * scale))
+
+def read_csv(f, columns=None, scale=1.0, origin=0.0, header=True):
+    """Return a Process per CSV row.
+
+    columns maps name/arrival/burst (or end, giving burst = end - arrival) to
+    column names, or to 0-based indices when header is False, where they
+    default to name, arrival and burst in columns 0, 1 and 2 (name only if
+    column 0 is not mapped to another field). Without a name column,
+    processes are named P1, P2, ...
+    """
+    columns = dict(columns or {})
+    columns.setdefault('arrival', 'arrival' if header else '1')
+    if 'end' not in columns:
+        columns.setdefault('burst', 'burst' if header else '2')
+    if header:
+        columns.setdefault('name', 'name')
+    elif '0' not in columns.values():
+        columns.setdefault('name', '0')
+    rows = csv.reader(f)
+
+    names = next(rows, []) if header else []
+    index = {}
+    for field, column in columns.items():
+        if not header:
+            index[field] = int(column)
+        elif column in names:
+            index[field] = names.index(column)
+        elif field != 'name':
+            raise InputError(f"CSV column '{column}' not found")
+
+    name_at = index.get('name')
+    arrival_at = index['arrival']
+    burst_at = index.get('burst')
+    end_at = index.get('end')
+    processes = []
+    for number, row in enumerate(rows, 1):
+        if not row:
+            continue
+        try:
+            start = float(row[arrival_at])
+            if burst_at is not None:
+                length = float(row[burst_at])
+            else:
+                length = float(row[end_at]) - start
+            name = row[name_at] if name_at is not None else f"P{number}"
+        except (IndexError, ValueError):
+            raise InputError(f"Bad CSV row {number + header}: {','.join(row)}")
+        if length < 0:
+            problem = "a negative burst" if burst_at is not None else "an end before its start"
+            raise InputError(f"Bad CSV row {number + header} ({problem}): {','.join(row)}")
+        burst = duration(length, scale)
+        # The arrival stays a raw time stamp until rebase()
+        processes.append(Process(name, start, burst))
+    return rebase(processes, scale, origin)
+
+def read_timehist(f, scale=1000.0, origin=None):
+    """Return the tasks in `perf sched timehist` output as Processes.
+
+    Each line is a run slice ending at its time stamp, with the wait time,
+    scheduling delay and run time in milliseconds. A task arrives at the
+    start of the wait before its first slice.
+    """
+    tasks = {}
+    for line in f:
+        match = TIMEHIST_LINE.match(line)
+        if not match:
+            continue  # Headers, separators and summary lines
+        end, task, wait, delay, run = match.groups()
+        if task.startswith('<idle>'):
+            continue
+        run_s = float(run) / 1000
+        task_entry = tasks.get(task)
+        if task_entry is None:
+            start = float(end) - run_s - (float(wait) + float(delay)) / 1000
+            tasks[task] = [start, run_s]
+        else:
+            task_entry[1] += run_s
+    return tasks_to_processes(tasks, scale, origin)
+
+def read_ftrace(f, scale=1000.0, origin=None):
+    """Return the tasks in ftrace or `perf sched script` scheduler events as Processes.
+
+    A task arrives at its first sched_wakeup/sched_wakeup_new or the first
+    time it is switched in. Its burst is the total time between being
+    switched in and switched out on each CPU.
+    """
+    tasks = {}
+    running = {}  # cpu -> (task, switched in at)
+    for line in f:
+        if 'sched_switch:' in line:
+            event = 'switch'
+        elif 'sched_wakeup' in line:
+            event = 'wakeup'
+        else:
+            continue
+        match = FTRACE_TIME.search(line)
+        if not match:
+            continue
+        cpu, stamp = match.group(1), float(match.group(2))
+        payload = line[line.index('sched_'):]
+        fields = dict(FTRACE_FIELD.findall(payload))
+        if event == 'wakeup':
+            if 'pid' in fields:
+                comm, pid = fields.get('comm', ''), fields['pid']
+            else:
+                task_match = PERF_WAKEUP_TASK.search(payload)
+                if not task_match:
+                    continue
+                comm, pid = task_match.groups()
+            if pid != '0':
+                tasks.setdefault(f"{comm}-{pid}", [stamp, 0.0])
+            continue
+
+        previous = running.pop(cpu, None)
+        if previous is not None:
+            tasks[previous[0]][1] += stamp - previous[1]
+        if 'next_pid' in fields:
+            comm, pid = fields.get('next_comm', ''), fields['next_pid']
+        else:
+            task_match = PERF_NEXT_TASK.search(payload)
+            if not task_match:
+                continue
+            comm, pid = task_match.groups()
+        if pid != '0':  # pid 0 is the idle task
+            task = f"{comm}-{pid}"
+            tasks.setdefault(task, [stamp, 0.0])
+            running[cpu] = (task, stamp)
+    return tasks_to_processes(tasks, scale, origin)
+
+def tasks_to_processes(tasks, scale, origin):
+    """Convert {task: [first seen, seconds on CPU]} to Processes in order of first appearance."""
+    processes = [Process(task, start, duration(cpu, scale)) for task, (start, cpu) in tasks.items()]
+    return rebase(processes, scale, origin)
+
+def import_trace(filename, fmt, columns=None, scale=None, origin=None, header=True):
+    """Read a trace file in one pass and return its Processes.
+
+    origin is a time stamp or 'earliest'; scale and origin default by format.
+    """
+    if scale is None:
+        scale = DEFAULT_SCALES[fmt]
+    if origin is None:
+        origin = DEFAULT_ORIGINS[fmt]
+    if origin == 'earliest':
+        origin = None
+    with open_trace(filename) as f:
+        if fmt == 'csv':
+            return read_csv(f, columns, scale, origin, header)
+        if fmt == 'timehist':
+            return read_timehist(f, scale, origin)
+        return read_ftrace(f, scale, origin)
+
+def parse_origin(text):
+    """Parse --origin: a time stamp or 'earliest'."""
+    if text == 'earliest':
+        return text
+    try:
+        return float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid origin '{text}' (expected a time stamp or 'earliest')")
+
+def guess_format(filename):
+    """Pick a format from the file name."""
+    name = filename[:-3] if filename.endswith('.gz') else filename
+    return 'csv' if name.endswith('.csv') else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a workload imported from a trace or CSV job log.")
+    parser.add_argument('trace', help="trace file (.gz is decompressed)")
+    parser.add_argument('--format', choices=FORMATS, help="trace format (default: csv for .csv files)")
+    parser.add_argument('--columns', type=parse_columns, help="CSV column mapping, e.g. name=job,arrival=submit,burst=runtime")
+    parser.add_argument('--no-header', action='store_true', help="the CSV has no header row; map columns by index")
+    parser.add_argument('--scale', type=float, help="ticks per trace time unit (default 1 for csv, 1000 otherwise)")
+    parser.add_argument('--origin', type=parse_origin,
+                        help="trace time of tick 0, or 'earliest' (default: 0 for csv, earliest otherwise)")
+    parser.add_argument('--use', required=True, choices=scheduler_gpt.ALGORITHMS, help="scheduling policy")
+    parser.add_argument('--quantum', type=int, help="quantum for rr, lottery and stride")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the lottery draws")
+    parser.add_argument('--runfor', type=int, help="ticks to simulate (default: until every process could finish)")
+    parser.add_argument('-o', '--output', help="output file (default: <trace name>.out)")
+    parser.add_argument('--html', action='store_true', help="also write the HTML report")
+    args = parser.parse_args()
+
+    fmt = args.format or guess_format(args.trace)
+    if fmt is None:
+        print("Error: Cannot tell the trace format from the file name; pass --format")
+        sys.exit(1)
+    if args.use in scheduler_gpt.TIME_SLICED and args.quantum is None:
+        print(f"Error: Missing quantum parameter when use is '{args.use}'")
+        sys.exit(1)
+
+    try:
+        processes = import_trace(args.trace, fmt, args.columns, args.scale, args.origin, not args.no_header)
+    except FileNotFoundError:
+        print(f"Error: Trace file '{args.trace}' not found")
+        sys.exit(1)
+    except InputError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Imported {len(processes)} processes from {args.trace}")
+
+    run_for = args.runfor
+    if run_for is None:
+        run_for = max((p.arrival for p in processes), default=0) + sum(p.burst for p in processes) + 1
+    result = scheduler_gpt.simulate(processes, args.use, run_for, args.quantum, seed=args.seed)
+
+    output_filename = args.output
+    if output_filename is None:
+        base_filename = os.path.basename(args.trace)
+        if base_filename.endswith('.gz'):
+            base_filename = base_filename[:-3]
+        output_filename = os.path.splitext(base_filename)[0] + '.out'
+    result.write_output(output_filename)
+    print(f"Output written to {output_filename}")
+    if args.html:
+        print(f"HTML report written to {result.write_html(output_filename)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Verify scheduler .out files against golden outputs.
+
+Files are compared by size and content hash first, so matching files are
+never diffed. Only files whose hashes differ are streamed in lockstep to
+find the first divergent line and its time stamp. The report shows
+surrounding context and the per-process statistics that differ. Memory
+use does not grow with file size. The work is spread over a process pool.
+
+Usage:
+    verify-outputs.py <actual dir> <expected dir> [-j JOBS] [-C LINES]
+    verify-outputs.py --file <actual .out> <expected .out> [-C LINES]
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+BLOCK_SIZE = 1 << 20
+# Longer lines are compared in full but shortened in the report
+MAX_LINE = 1 << 16
+STAT_LINE = re.compile(r'^(\S+) (?:wait\s*-?\d+ turnaround\s*-?\d+ response\s*-?\d+|did not finish)$')
+
+def file_digest(path):
+    """Return the SHA-256 digest of a file, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.digest()
+
+def line_time(line):
+    """Return N for a 'Time N : ...' line, otherwise None."""
+    if line.startswith('Time') and ' : ' in line:
+        try:
+            return int(line[4:line.index(' : ')])
+        except ValueError:
+            return None
+    return None
+
+def read_line(f):
+    """Read one line without its newline; None at end of file."""
+    line = f.readline()
+    return line.rstrip('\n') if line else None
+
+def clip(line):
+    """Shorten a line to MAX_LINE characters for the report."""
+    if line is None or len(line) <= MAX_LINE:
+        return line
+    return line[:MAX_LINE] + f"... ({len(line) - MAX_LINE} more characters)"
+
+def collect_stat(line, stats, in_summary):
+    """Record a per-process statistics line; return whether the summary section has started."""
+    if line is None:
+        return in_summary
+    if line.startswith('Finished at time'):
+        return True
+    if in_summary:
+        match = STAT_LINE.match(line)
+        if match:
+            stats.setdefault(match.group(1), line)
+    return in_summary
+
+def compare_files(actual_file, expected_file, context=3):
+    """Stream two .out files in lockstep and describe the first difference.
+
+    Returns None if every line matches. Otherwise returns a dict with the
+    line number and time stamp of the first mismatch, up to `context` lines
+    before and after it from each file, and the per-process statistics
+    lines that differ. Only the context window and one statistics line per
+    process are kept in memory.
+    """
+    with open(actual_file, 'r') as actual, open(expected_file, 'r') as expected:
+        before = deque(maxlen=context)
+        shared_stats = {}
+        in_summary = False
+        number = 0
+        last_time = None
+        while True:
+            number += 1
+            expected_line = read_line(expected)
+            actual_line = read_line(actual)
+            if expected_line != actual_line:
+                break
+            if expected_line is None:
+                return None
+            time = line_time(expected_line)
+            if time is not None:
+                last_time = time
+            in_summary = collect_stat(expected_line, shared_stats, in_summary)
+            before.append(clip(expected_line))
+
+        # From the first difference on, each file is tracked separately
+        expected_stats = shared_stats
+        actual_stats = dict(shared_stats)
+        expected_summary = actual_summary = in_summary
+        difference = {
+            'line': number,
+            'time': line_time(expected_line or '') if expected_line is not None else line_time(actual_line or ''),
+            'last_time': last_time,
+            'before': list(before),
+            'expected': [clip(expected_line)] if expected_line is not None else [],
+            'actual': [clip(actual_line)] if actual_line is not None else [],
+        }
+        expected_summary = collect_stat(expected_line, expected_stats, expected_summary)
+        actual_summary = collect_stat(actual_line, actual_stats, actual_summary)
+
+        # Keep reading to the end for the statistics, keeping only a little context
+        while expected_line is not None or actual_line is not None:
+            if expected_line is not None:
+                expected_line = read_line(expected)
+                expected_summary = collect_stat(expected_line, expected_stats, expected_summary)
+                if expected_line is not None and len(difference['expected']) <= context:
+                    difference['expected'].append(clip(expected_line))
+            if actual_line is not None:
+                actual_line = read_line(actual)
+                actual_summary = collect_stat(actual_line, actual_stats, actual_summary)
+                if actual_line is not None and len(difference['actual']) <= context:
+                    difference['actual'].append(clip(actual_line))
+
+    difference['stats'] = [(name, expected_stats.get(name), actual_stats.get(name))
+                           for name in sorted(expected_stats.keys() | actual_stats.keys())
+                           if expected_stats.get(name) != actual_stats.get(name)]
+    return difference
+
+def verify_pair(pair, context=3):
+    """Compare one actual/expected pair and return a result dict."""
+    name, actual_file, expected_file = pair
+    result = {'name': name, 'match': False}
+    try:
+        same_size = os.path.getsize(actual_file) == os.path.getsize(expected_file)
+    except OSError as e:
+        result['error'] = f"{e.strerror}: {e.filename}"
+        return result
+
+    # Identical files are settled by their hashes and never diffed
+    if same_size and file_digest(actual_file) == file_digest(expected_file):
+        result['match'] = True
+        return result
+
+    difference = compare_files(actual_file, expected_file, context)
+    if difference is None:
+        # Same lines but different bytes, e.g. a missing final newline
+        result['line'] = None
+        return result
+    result.update(difference)
+    return result
+
+def verify_pair_with_context(args):
+    """verify_pair() taking (pair, context) for pool.map."""
+    return verify_pair(*args)
+
+def collect_pairs(actual_dir, expected_dir):
+    """Return (relative name, actual path, expected path) for every .out under actual_dir."""
+    pairs = []
+    for root, _, files in os.walk(actual_dir):
+        for filename in files:
+            if filename.endswith('.out'):
+                actual_file = os.path.join(root, filename)
+                name = os.path.relpath(actual_file, actual_dir)
+                pairs.append((name, actual_file, os.path.join(expected_dir, name)))
+    pairs.sort()
+    return pairs
+
+def print_result(result):
+    """Print a failed comparison."""
+    print(f"✗ DIFFERENCE - {result['name']}")
+    if 'error' in result:
+        print(f"    {result['error']}")
+    elif result['line'] is None:
+        print("    files differ only in line endings or trailing bytes")
+    else:
+        if result['time'] is not None:
+            where = f" (Time {result['time']})"
+        elif result['last_time'] is not None:
+            where = f" (after Time {result['last_time']})"
+        else:
+            where = ''
+        print(f"    first difference at line {result['line']}{where}")
+        for line in result['before']:
+            print(f"      {line}")
+        for label, lines in (('expected', result['expected']), ('actual', result['actual'])):
+            print(f"    {label}:")
+            for i, line in enumerate(lines or ['<end of file>']):
+                print(f"    {'>' if i == 0 else ' '} {line}")
+        if result['stats']:
+            print("    per-process statistics that differ:")
+            for process, expected_stat, actual_stat in result['stats']:
+                print(f"      {process}: expected '{expected_stat or '-'}', actual '{actual_stat or '-'}'")
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify .out files against golden outputs.")
+    parser.add_argument('actual', help="directory (or with --file, a file) with the generated output")
+    parser.add_argument('expected', help="directory (or with --file, a file) with the golden output")
+    parser.add_argument('--file', action='store_true', help="compare two single files")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('-C', '--context', type=int, default=3, help="context lines around a difference")
+    args = parser.parse_args()
+
+    if args.file:
+        result = verify_pair((args.actual, args.actual, args.expected), args.context)
+        if result['match']:
+            print(f"✓ MATCH - {args.actual}")
+        else:
+            print_result(result)
+        sys.exit(0 if result['match'] else 1)
+
+    pairs = collect_pairs(args.actual, args.expected)
+    if not pairs:
+        print(f"No .out files found in {args.actual}")
+        sys.exit(1)
+
+    chunksize = max(1, len(pairs) // (4 * max(1, args.jobs)))
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        work = ((pair, args.context) for pair in pairs)
+        for result in pool.map(verify_pair_with_context, work, chunksize=chunksize):
+            if not result['match']:
+                failed += 1
+                print_result(result)
+
+    print(f"\nTotal files compared: {len(pairs)}")
+    print(f"Passed: {len(pairs) - failed}")
+    print(f"Failed: {failed}")
+    sys.exit(0 if failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()